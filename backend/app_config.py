@@ -33,4 +33,14 @@ def get_port():
 
 def get_current_config():
     """Get configuration for current app"""
-    return APP_CONFIGS.get(APP_NAME, APP_CONFIGS["taskify"])
\ No newline at end of file
+    return APP_CONFIGS.get(APP_NAME, APP_CONFIGS["taskify"])
+
+def get_app_data_path():
+    """Per-user data directory for the current app (created on demand)"""
+    if os.name == 'nt':
+        app_data_dir = os.getenv('LOCALAPPDATA')
+        if app_data_dir is None:
+            app_data_dir = os.path.join(os.path.expanduser('~'), 'AppData', 'Local')
+    else:
+        app_data_dir = os.getenv('XDG_DATA_HOME', os.path.join(os.path.expanduser('~'), '.local', 'share'))
+    return os.path.join(app_data_dir, APP_NAME.lower().replace(" ", "-"))
\ No newline at end of file
@@ -0,0 +1,130 @@
+import os
+import time
+import sqlite3
+import logging
+from typing import Iterable, Optional
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_LEASE_TTL = 600  # Seconds a worker may hold an application before others can take it
+DONE_HOLD_SECONDS = 1800  # Keep finished applications claimed while the Vahan table catches up
+
+
+class ApplicationLeaseStore:
+    """
+    Local SQLite lease table that makes sure concurrent workers never pick the
+    same application from the pending table.
+
+    Every application number read from the table is recorded; a worker claims
+    one with an expiring lease, and releases it when it is done (or failed, so
+    another worker may retry it).
+    """
+
+    def __init__(self, app_data_path: str, lease_ttl: int = DEFAULT_LEASE_TTL):
+        self.app_data_path = app_data_path
+        self.db_file = os.path.join(app_data_path, "application_leases.db")
+        self.lease_ttl = lease_ttl
+        self._initialized = False
+
+    def _connect(self) -> sqlite3.Connection:
+        if not self._initialized:
+            os.makedirs(self.app_data_path, exist_ok=True)
+        conn = sqlite3.connect(self.db_file, timeout=10, isolation_level=None)
+        if not self._initialized:
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute(
+                """
+                CREATE TABLE IF NOT EXISTS application_leases (
+                    application_no TEXT PRIMARY KEY,
+                    status TEXT NOT NULL DEFAULT 'pending',
+                    worker_id INTEGER,
+                    leased_until REAL NOT NULL DEFAULT 0,
+                    first_seen REAL NOT NULL,
+                    updated_at REAL NOT NULL
+                )
+                """
+            )
+            self._initialized = True
+        return conn
+
+    def claim_first(self, application_nos: Iterable[str], worker_id: int) -> Optional[str]:
+        """
+        Record every application number and atomically claim the first one that
+        is not held by another worker. Returns the claimed number, or None.
+        """
+        candidates = [a for a in application_nos if a]
+        if not candidates:
+            return None
+
+        now = time.time()
+        conn = self._connect()
+        try:
+            conn.execute("BEGIN IMMEDIATE")
+            conn.executemany(
+                "INSERT OR IGNORE INTO application_leases (application_no, first_seen, updated_at) VALUES (?, ?, ?)",
+                [(a, now, now) for a in candidates]
+            )
+            for application_no in candidates:
+                row = conn.execute(
+                    "SELECT status, worker_id, leased_until FROM application_leases WHERE application_no = ?",
+                    (application_no,)
+                ).fetchone()
+                status, holder, leased_until = row
+                held_by_other = leased_until > now and not (status == "leased" and holder == worker_id)
+                if held_by_other:
+                    continue
+                conn.execute(
+                    "UPDATE application_leases SET status = 'leased', worker_id = ?, leased_until = ?, updated_at = ? "
+                    "WHERE application_no = ?",
+                    (worker_id, now + self.lease_ttl, now, application_no)
+                )
+                conn.execute("COMMIT")
+                return application_no
+            conn.execute("COMMIT")
+            return None
+        except Exception as e:
+            if conn.in_transaction:
+                conn.execute("ROLLBACK")
+            logger.error(f"Error claiming application lease: {e}")
+            return None
+        finally:
+            conn.close()
+
+    def release(self, application_no: str, worker_id: int, done: bool) -> bool:
+        """
+        Release a lease. Finished applications stay claimed for DONE_HOLD_SECONDS
+        so a stale table row is not processed twice; failed ones are freed.
+        """
+        now = time.time()
+        leased_until = now + DONE_HOLD_SECONDS if done else 0
+        status = "done" if done else "pending"
+        try:
+            conn = self._connect()
+            try:
+                conn.execute(
+                    "UPDATE application_leases SET status = ?, leased_until = ?, updated_at = ? "
+                    "WHERE application_no = ? AND worker_id = ?",
+                    (status, leased_until, now, application_no, worker_id)
+                )
+            finally:
+                conn.close()
+            return True
+        except Exception as e:
+            logger.error(f"Error releasing application lease: {e}")
+            return False
+
+    def purge(self, older_than: float = 7 * 24 * 3600) -> int:
+        """Drop lease records that have not been touched for a week"""
+        try:
+            conn = self._connect()
+            try:
+                cursor = conn.execute(
+                    "DELETE FROM application_leases WHERE updated_at < ? AND leased_until < ?",
+                    (time.time() - older_than, time.time())
+                )
+                return cursor.rowcount
+            finally:
+                conn.close()
+        except Exception as e:
+            logger.error(f"Error purging application leases: {e}")
+            return 0
@@ -0,0 +1,256 @@
+"""
+Background jobs for the automation loop.
+
+/run-automation used to run the whole queue inside the request handler,
+blocking the event loop for hours. A job now runs run_automation() on its own
+thread and keeps a progress snapshot (processed, errors, current step,
+items/min) that /jobs/{job_id} returns while the work is in progress.
+Every progress event is also kept in a bounded log that /jobs/{job_id}/events
+streams to the dashboard as Server-Sent Events.
+
+Jobs also carry cooperative controls checked by the automation loop at step
+boundaries: pause, resume, drain (finish the current item, then stop) and
+cancel (stop before the next step, even mid-item).
+"""
+
+import json
+import time
+import uuid
+import logging
+import threading
+from collections import deque
+
+logger = logging.getLogger(__name__)
+
+MAX_FINISHED_JOBS = 20  # Finished jobs kept for /jobs
+MAX_JOB_EVENTS = 2000  # Events kept per job for clients that (re)connect late
+
+# Control states requested by the operator
+CONTROL_RUN = "run"
+CONTROL_PAUSE = "pause"
+CONTROL_DRAIN = "drain"
+CONTROL_CANCEL = "cancel"
+
+# Result statuses of a run stopped by the operator; the job finishes with these instead of completed/failed
+STOPPED_STATUSES = ("cancelled", "drained")
+
+
+class AutomationJob:
+    """Progress of one automation run; emit() is called from the worker threads"""
+
+    def __init__(self):
+        self.job_id = uuid.uuid4().hex[:12]
+        self.status = "queued"
+        self.created_at = time.time()
+        self.started_at = None
+        self.finished_at = None
+        self.processed = 0
+        self.errors = 0
+        self.current_step = {}  # worker_id -> name of the step it is running
+        self.last_error = None
+        self.result = None
+        self._lock = threading.Lock()
+        self._events = deque(maxlen=MAX_JOB_EVENTS)
+        self._event_id = 0
+        self._new_event = threading.Condition(self._lock)
+        self.control = CONTROL_RUN
+        self._resumed = threading.Event()  # Cleared while paused
+        self._resumed.set()
+        self._stopping = threading.Event()  # Set once a drain or cancel is requested
+        self._finished = threading.Event()
+
+    def emit(self, event, data):
+        """Record a progress event from the automation loop"""
+        with self._lock:
+            worker_id = data.get("worker_id", 0)
+            if event == "step_started":
+                self.current_step[worker_id] = data.get("step")
+            elif event == "item_approved":
+                self.processed += 1
+            elif event == "item_failed":
+                self.errors += 1
+                self.last_error = {"status": data.get("status"), "message": data.get("message")}
+            self._append_event(event, data)
+
+    def _append_event(self, event, data):
+        # Caller holds self._lock
+        self._event_id += 1
+        payload = dict(data, processed_total=self.processed, errors_total=self.errors,
+                       items_per_minute=self.items_per_minute(), time=time.time())
+        self._events.append((self._event_id, event, payload))
+        self._new_event.notify_all()
+
+    def finish(self, status, result):
+        with self._lock:
+            self.result = result
+            self.status = status
+            self.finished_at = time.time()
+            self._append_event("job_finished", {"status": status, "result": result})
+        self._finished.set()
+
+    # Controls (called from the API) ------------------------------------------
+
+    def _set_control(self, control, event):
+        with self._lock:
+            if not self.is_active():
+                return False
+            if self.control == CONTROL_CANCEL or (self.control == CONTROL_DRAIN and control != CONTROL_CANCEL):
+                return False  # Stopping is final; only escalating a drain to a cancel is allowed
+            self.control = control
+            self._append_event(event, {"control": control})
+        if control == CONTROL_PAUSE:
+            self._resumed.clear()
+        else:
+            self._resumed.set()  # Resume, and wake paused workers so they can drain or cancel
+        if control in (CONTROL_DRAIN, CONTROL_CANCEL):
+            self._stopping.set()
+        return True
+
+    def pause(self):
+        return self._set_control(CONTROL_PAUSE, "paused")
+
+    def resume(self):
+        if self.control != CONTROL_PAUSE:
+            return False
+        return self._set_control(CONTROL_RUN, "resumed")
+
+    def drain(self):
+        return self._set_control(CONTROL_DRAIN, "draining")
+
+    def cancel(self):
+        return self._set_control(CONTROL_CANCEL, "cancelling")
+
+    # Checks (called from the automation loop) --------------------------------
+
+    def checkpoint(self):
+        """
+        Called before every step. Blocks while the job is paused and returns
+        False when the job was cancelled and the step must not run.
+        """
+        self._resumed.wait()
+        return self.control != CONTROL_CANCEL
+
+    def stop_requested(self):
+        """True once a drain or cancel was requested; checked between items"""
+        return self._stopping.is_set()
+
+    def sleep(self, seconds):
+        """time.sleep that returns early when the job is asked to stop"""
+        self._stopping.wait(seconds)
+
+    def wait_finished(self, timeout=None):
+        return self._finished.wait(timeout)
+
+    def wait_for_events(self, after_id, timeout=15):
+        """
+        Events with an id greater than after_id, waiting up to `timeout`
+        seconds for new ones. Returns (events, finished).
+        """
+        with self._lock:
+            if self._event_id <= after_id and self.is_active():
+                self._new_event.wait(timeout)
+            events = [e for e in self._events if e[0] > after_id]
+            return events, not self.is_active()
+
+    def items_per_minute(self):
+        if not self.started_at:
+            return 0.0
+        elapsed = (self.finished_at or time.time()) - self.started_at
+        return round(self.processed * 60 / elapsed, 2) if elapsed > 0 else 0.0
+
+    def is_active(self):
+        return self.status in ("queued", "running")
+
+    def snapshot(self):
+        with self._lock:
+            return {
+                "job_id": self.job_id,
+                "status": self.status,
+                "control": self.control,
+                "created_at": self.created_at,
+                "started_at": self.started_at,
+                "finished_at": self.finished_at,
+                "processed": self.processed,
+                "errors": self.errors,
+                "current_step": {str(k): v for k, v in self.current_step.items()},
+                "items_per_minute": self.items_per_minute(),
+                "last_error": self.last_error,
+                "result": self.result,
+            }
+
+
+class JobManager:
+    """Runs at most one automation job at a time and keeps recent ones for lookup"""
+
+    def __init__(self):
+        self._jobs = {}
+        self._lock = threading.Lock()
+
+    def start(self, runner):
+        """
+        Start runner(job) on a background thread. Returns (job, created);
+        when a job is already active it is returned with created=False.
+        """
+        with self._lock:
+            active = self._active_job()
+            if active:
+                return active, False
+            job = AutomationJob()
+            self._jobs[job.job_id] = job
+            self._trim()
+
+        thread = threading.Thread(
+            target=self._run, args=(job, runner), name=f"automation-job-{job.job_id}", daemon=True
+        )
+        thread.start()
+        return job, True
+
+    def _run(self, job, runner):
+        job.status = "running"
+        job.started_at = time.time()
+        logger.info(f"[JOBS] Automation job {job.job_id} started")
+        try:
+            result = runner(job)
+            if result.get("status") in STOPPED_STATUSES:
+                job.finish(result["status"], result)
+            else:
+                job.finish("completed" if result.get("success") else "failed", result)
+        except Exception as e:
+            logger.error(f"[JOBS] Automation job {job.job_id} crashed: {e}", exc_info=True)
+            job.finish("failed", {"success": False, "message": f"Error running automation: {str(e)}", "status": "error"})
+        finally:
+            logger.info(f"[JOBS] Automation job {job.job_id} finished with status {job.status}")
+
+    def _active_job(self):
+        for job in self._jobs.values():
+            if job.is_active():
+                return job
+        return None
+
+    def _trim(self):
+        finished = sorted(
+            (job for job in self._jobs.values() if not job.is_active()), key=lambda job: job.created_at
+        )
+        for job in finished[:-MAX_FINISHED_JOBS] if len(finished) > MAX_FINISHED_JOBS else []:
+            del self._jobs[job.job_id]
+
+    def get(self, job_id):
+        with self._lock:
+            return self._jobs.get(job_id)
+
+    def active(self):
+        with self._lock:
+            return self._active_job()
+
+    def list(self):
+        with self._lock:
+            jobs = sorted(self._jobs.values(), key=lambda job: job.created_at, reverse=True)
+        return [job.snapshot() for job in jobs]
+
+
+def format_sse(event_id, event, data):
+    """One Server-Sent Events message"""
+    return f"id: {event_id}\nevent: {event}\ndata: {json.dumps(data, default=str)}\n\n"
+
+
+job_manager = JobManager()
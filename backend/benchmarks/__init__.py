@@ -0,0 +1,10 @@
+"""
+Offline benchmarks for the Vahan automation.
+
+mock_vahan serves a local imitation of the Vahan pages the NEW-RC-APPROVAL
+workflow walks through; throughput drives run_automation against it and
+reports items/min and per-step timings.
+
+fake_webdriver is an in-memory WebDriver double; overhead runs the workflow
+on it thousands of times to measure the Python cost per item.
+"""
@@ -0,0 +1,236 @@
+"""
+In-memory stand-in for the WebDriver / WebElement surface vahan_automation uses.
+
+FakeWebDriver answers find_element(s) through a resolver(driver, by, value)
+that returns a FakeElement or None, and execute_script through handlers keyed
+by the script text. Nothing talks to a browser and nothing sleeps, so a
+workflow run against it costs only the Python orchestration around the
+driver calls.
+
+VahanScenario is a resolver modelling the NEW-RC-APPROVAL flow: a queue of
+pending applications, the Pending Applications table, the approval page and
+the confirmation that moves an application to the next seat.
+"""
+
+import re
+
+from selenium.webdriver.common.by import By
+from selenium.common.exceptions import NoSuchElementException, WebDriverException
+
+CLICK_SCRIPT = "arguments[0].click();"
+ROW_INDEX_PATTERN = re.compile(r"@data-ri='(\d+)'")
+
+
+class FakeElement:
+    """A WebElement with fixed text/attributes and an optional on_click(driver) callback"""
+
+    def __init__(self, driver, key, text="", attributes=None, displayed=True, enabled=True,
+                 on_click=None, tag_name="div", children=None):
+        self._driver = driver
+        self.key = key
+        self.text = text
+        self.attributes = dict(attributes or {})
+        self.displayed = displayed
+        self.enabled = enabled
+        self.on_click = on_click
+        self.tag_name = tag_name
+        self.children = children or {}
+
+    def click(self):
+        self._driver.clicks += 1
+        if self.on_click:
+            self.on_click(self._driver)
+
+    def get_attribute(self, name):
+        return self.attributes.get(name)
+
+    def is_displayed(self):
+        return self.displayed() if callable(self.displayed) else self.displayed
+
+    def is_enabled(self):
+        return self.enabled
+
+    def find_element(self, by=By.ID, value=None):
+        element = self.children.get((by, value))
+        if element is None:
+            raise NoSuchElementException(f"Fake element {self.key!r} has no child {by}={value}")
+        return element
+
+    def find_elements(self, by=By.ID, value=None):
+        element = self.children.get((by, value))
+        return [element] if element is not None else []
+
+
+class FakeSwitchTo:
+    def __init__(self, driver):
+        self._driver = driver
+
+    def frame(self, frame_reference):
+        self._driver.frame = frame_reference
+
+    def default_content(self):
+        self._driver.frame = None
+
+
+class FakeWebDriver:
+    """
+    resolver(driver, by, value) -> FakeElement or None decides which elements
+    exist; script_handlers maps script text to handler(driver, *args). Unknown
+    scripts return None. Counters record how often the workflow hit the driver.
+    """
+
+    def __init__(self, resolver, script_handlers=None, url="http://vahan.parivahan.gov.in/vahan/vahan/home.xhtml"):
+        self.resolver = resolver
+        self.script_handlers = dict(script_handlers or {})
+        self.script_handlers.setdefault(CLICK_SCRIPT, lambda driver, element: element.click())
+        self.current_url = url
+        self.switch_to = FakeSwitchTo(self)
+        self.frame = None
+        self.lookups = 0
+        self.scripts = 0
+        self.clicks = 0
+
+    def find_element(self, by=By.ID, value=None):
+        self.lookups += 1
+        element = self.resolver(self, by, value)
+        if element is None:
+            raise NoSuchElementException(f"Fake page has no element {by}={value}")
+        return element
+
+    def find_elements(self, by=By.ID, value=None):
+        self.lookups += 1
+        element = self.resolver(self, by, value)
+        return [element] if element is not None else []
+
+    def execute_script(self, script, *args):
+        self.scripts += 1
+        handler = self.script_handlers.get(script)
+        return handler(self, *args) if handler else None
+
+    def execute_async_script(self, script, *args):
+        return self.execute_script(script, *args)
+
+    def get(self, url):
+        self.current_url = url
+
+    def get_log(self, log_type):
+        # No performance log: network-idle waits fall back to the page-script check
+        raise WebDriverException(f"Fake driver has no '{log_type}' log")
+
+    def execute_cdp_cmd(self, cmd, cmd_args):
+        return {}
+
+    def set_script_timeout(self, time_to_wait):
+        pass
+
+    def quit(self):
+        pass
+
+
+class VahanScenario:
+    """
+    Resolver and script handlers for the NEW-RC-APPROVAL workflow.
+
+    Every locator resolves to an element except the ones listed in
+    ABSENT_MARKERS (error pages, optional popups, already-expanded tree
+    nodes), so the workflow takes its normal path. Clicking an Approve
+    button opens the approval page; clicking Yes in the confirmation moves
+    the application to the next seat and returns to the home page.
+    """
+
+    HOME_URL = "http://vahan.parivahan.gov.in/vahan/vahan/home.xhtml"
+    PENDING_URL = "http://vahan.parivahan.gov.in/vahan/vahan/ui/workbench/pending.xhtml"
+    APPROVE_URL = "http://vahan.parivahan.gov.in/vahan/vahan/ui/workbench/approve.xhtml"
+
+    ABSENT_MARKERS = (
+        "j_idt45",  # Back to Home-Page button of the error page
+        "back to home",
+        "Sorry",
+        "primefacesmessagedlg",  # Alert popup
+        "Vehicle Location Tracking Device",  # VLTD popup
+        "ui-icon-triangle-1-s",  # Tree nodes start collapsed
+    )
+
+    def __init__(self, items=10, documents=4, first_serial=1):
+        # Distinct serials per run keep earlier runs' leases out of the way
+        self.pending = [f"MH12{i:010d}" for i in range(first_serial, first_serial + items)]
+        self.documents = documents
+        self.approved = []
+        self.page = "home"
+        self.application_no = None
+        self._elements = {}
+
+    def driver(self):
+        from vahan_automation import PENDING_ROWS_SCRIPT, BULK_APPROVE_CHECKBOXES_SCRIPT
+        from vahan_waits import IDLE_SCRIPT
+
+        driver = FakeWebDriver(self.resolve, {
+            IDLE_SCRIPT: lambda driver, conditions: {name: True for name in conditions},
+            PENDING_ROWS_SCRIPT: self.pending_rows,
+            BULK_APPROVE_CHECKBOXES_SCRIPT: self.approve_checkboxes,
+        }, url=self.HOME_URL)
+        driver.get = self.navigate(driver)
+        return driver
+
+    def navigate(self, driver):
+        def get(url):
+            driver.current_url = url
+            self.page = "pending" if url == self.PENDING_URL else "home"
+        return get
+
+    def element(self, driver, key, **kwargs):
+        """Elements are created once per locator, like a page that does not re-render"""
+        element = self._elements.get(key)
+        if element is None:
+            element = self._elements[key] = FakeElement(driver, key, **kwargs)
+        return element
+
+    def resolve(self, driver, by, value):
+        if any(marker in value for marker in self.ABSENT_MARKERS):
+            return None
+        if value == "workDetails":
+            return self.element(driver, value, displayed=lambda: self.page == "pending")
+        if value.startswith("//tbody[@id='workDetails_data']"):
+            row = int(ROW_INDEX_PATTERN.search(value).group(1))
+            return self.element(driver, value, tag_name="button", on_click=lambda d: self.open_application(d, row))
+        if "NEW-RC-APPROVAL" in value:
+            return self.element(driver, value, tag_name="a", on_click=lambda d: d.get(self.PENDING_URL))
+        if "ui-confirmdialog-yes" in value:
+            return self.element(driver, value, tag_name="button", on_click=self.confirm)
+        if value == "workbench_tabview:verifyCheckValue":
+            box = FakeElement(driver, "ui-chkbox-box", attributes={"class": "ui-chkbox-box ui-widget ui-state-default"},
+                              on_click=lambda d: box.attributes.update({"class": "ui-chkbox-box ui-state-active"}))
+            return self.element(driver, value, children={(By.CLASS_NAME, "ui-chkbox-box"): box})
+        if "Proceed to Next Seat" in value:
+            return self.element(driver, value, tag_name="label", attributes={"for": "app_disapp_form:movement:0"})
+        if value == "workbench_tabview:idViewDoc":
+            return self.element(driver, value, tag_name="button", text=f"Modify/View Documents ({self.application_no})")
+        return self.element(driver, value)
+
+    def pending_rows(self, driver):
+        if self.page != "pending":
+            return []
+        return [
+            {"ri": ri, "appl": application_no, "cells": [str(ri + 1), application_no, "Approve"]}
+            for ri, application_no in enumerate(self.pending)
+        ]
+
+    def approve_checkboxes(self, driver, toggle):
+        return [
+            {"name": f"approvedStatus{index}", "disabled": False, "checked": True,
+             "action": "clicked" if toggle else "skipped"}
+            for index in range(self.documents)
+        ]
+
+    def open_application(self, driver, row):
+        self.application_no = self.pending[row] if row < len(self.pending) else None
+        self.page = "approve"
+        driver.current_url = f"{self.APPROVE_URL}?appl={self.application_no}"
+        self._elements.pop("workbench_tabview:verifyCheckValue", None)
+
+    def confirm(self, driver):
+        if self.application_no in self.pending:
+            self.pending.remove(self.application_no)
+            self.approved.append(self.application_no)
+        self.page = "home"
+        driver.current_url = self.HOME_URL
@@ -0,0 +1,476 @@
+"""
+Local mock of the Vahan pages used by the NEW-RC-APPROVAL workflow.
+
+The pages reproduce the structure the automation's locators rely on (ids,
+classes, PrimeFaces dialogs and tree toggles), and every partial update goes
+through a real XHR round-trip tracked by a PrimeFaces-style AJAX queue, so the
+condition waits and the CDP network-idle wait behave as on the live site.
+Server latencies are configurable.
+
+Pages:
+    /vahan/vahan/home.xhtml                 home with Dashboard Pendency and the task tree
+    /vahan/vahan/ui/workbench/pending.xhtml workDetails table of pending applications
+    /vahan/vahan/ui/workbench/approve.xhtml approval workbench (VLTD dialog, tabs, DMS modal,
+                                            Save-Options / File Movement)
+    /dms-app/dealer-search-within-dms       DMS iframe with approvedStatus checkboxes
+    /mock/state                             JSON counters
+
+The automation checks for vahan.parivahan.gov.in in the browser URL, so the
+benchmark points that host at the mock with Chrome's --host-resolver-rules
+(see chrome_arguments).
+
+Run standalone:
+    python -m benchmarks.mock_vahan --port 8765 --items 20 --ajax-latency 0.3
+"""
+
+import html
+import json
+import time
+import random
+import logging
+import argparse
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import urlparse, parse_qs
+
+logger = logging.getLogger(__name__)
+
+VAHAN_HOST = "vahan.parivahan.gov.in"
+HOME_PATH = "/vahan/vahan/home.xhtml"
+PENDING_PATH = "/vahan/vahan/ui/workbench/pending.xhtml"
+APPROVE_PATH = "/vahan/vahan/ui/workbench/approve.xhtml"
+DMS_PATH = "/dms-app/dealer-search-within-dms"
+
+
+class MockLatency:
+    """
+    Server-side delays in seconds. jitter is a fraction: 0.2 spreads every
+    delay uniformly over +/-20%.
+    """
+
+    def __init__(self, page=0.2, ajax=0.15, dms=0.5, jitter=0.2):
+        self.page = page
+        self.ajax = ajax
+        self.dms = dms
+        self.jitter = jitter
+
+    def sleep(self, seconds):
+        if seconds <= 0:
+            return
+        spread = seconds * self.jitter
+        time.sleep(max(0.0, seconds + random.uniform(-spread, spread)))
+
+    def as_dict(self):
+        return {"page": self.page, "ajax": self.ajax, "dms": self.dms, "jitter": self.jitter}
+
+
+class MockVahanState:
+    """Pending applications and counters shared by all requests"""
+
+    def __init__(self, items=20, documents=4, vltd_rate=0.3, alert_rate=0.2, seed=None):
+        self.pending = [f"MH12{i:010d}" for i in range(1, items + 1)]
+        self.documents = documents
+        self.vltd_rate = vltd_rate
+        self.alert_rate = alert_rate
+        self.approved = []
+        self.requests = 0
+        self.random = random.Random(seed)
+        self._lock = threading.Lock()
+
+    def pending_snapshot(self):
+        with self._lock:
+            return list(self.pending)
+
+    def approve(self, application_no):
+        """Move an application to the next seat. Returns False if it was not pending."""
+        with self._lock:
+            if application_no not in self.pending:
+                return False
+            self.pending.remove(application_no)
+            self.approved.append(application_no)
+            return True
+
+    def roll(self, rate):
+        with self._lock:
+            return self.random.random() < rate
+
+    def count_request(self):
+        with self._lock:
+            self.requests += 1
+
+    def as_dict(self):
+        with self._lock:
+            return {"pending": len(self.pending), "approved": len(self.approved), "requests": self.requests}
+
+
+STYLE = """
+body { font-family: sans-serif; margin: 0; padding: 16px; }
+.ui-icon { display: inline-block; width: 16px; height: 16px; background: #999; cursor: pointer; vertical-align: middle; }
+.ui-widget-overlay { position: fixed; top: 0; left: 0; width: 100%; height: 100%; background: rgba(0, 0, 0, 0.3); z-index: 900; }
+.ui-dialog { position: fixed; top: 80px; left: 50%; width: 640px; margin-left: -320px; background: #fff;
+             border: 1px solid #444; z-index: 1000; }
+.ui-dialog-titlebar { background: #2d5d8b; color: #fff; padding: 6px 10px; }
+.ui-dialog-titlebar-close { float: right; color: #fff; padding: 0 4px; }
+.ui-dialog-content { padding: 10px; }
+.ui-chkbox-box, .ui-radiobutton-box { display: inline-block; width: 18px; height: 18px; border: 1px solid #444;
+                                      cursor: pointer; vertical-align: middle; }
+.ui-state-active { background: #2d5d8b; }
+.ui-helper-hidden-accessible { position: absolute; width: 1px; height: 1px; overflow: hidden; clip: rect(0 0 0 0); }
+.ui-tabs-nav li { display: inline-block; margin-right: 12px; }
+#dmsFrame { width: 600px; height: 260px; border: 0; }
+table { border-collapse: collapse; }
+td, th { border: 1px solid #ccc; padding: 4px 8px; }
+"""
+
+# PrimeFaces-like AJAX queue and dialog helpers shared by every page.
+# (Kept free of the words the automation's error-page check looks for.)
+SCRIPT = """
+window.PrimeFaces = {ajax: {Queue: {xhrs: [], isEmpty: function() { return this.xhrs.length === 0; }}}};
+
+function mockAjax(action, appl, done) {
+    var queue = PrimeFaces.ajax.Queue;
+    var xhr = new XMLHttpRequest();
+    queue.xhrs.push(xhr);
+    xhr.open('POST', '/mock/ajax?action=' + encodeURIComponent(action) + '&appl=' + encodeURIComponent(appl || ''));
+    xhr.onloadend = function() {
+        queue.xhrs.splice(queue.xhrs.indexOf(xhr), 1);
+        if (done) { done(xhr); }
+    };
+    xhr.send();
+}
+
+function setShown(id, shown) {
+    var el = document.getElementById(id);
+    if (el) { el.style.display = shown ? 'block' : 'none'; }
+}
+
+function showDialog(id) { setShown('overlay', true); setShown(id, true); }
+function hideDialog(id) { setShown(id, false); setShown('overlay', false); }
+
+function expandNode(toggler, childId, action) {
+    mockAjax(action, '', function() {
+        toggler.className = 'ui-treetable-toggler ui-icon ui-icon-triangle-1-s ui-c';
+        document.getElementById(childId).style.display = '';
+    });
+}
+
+function toggleBox(box, action) {
+    mockAjax(action, '', function() {
+        box.className = box.className.indexOf('ui-state-active') >= 0
+            ? box.className.replace(' ui-state-active', '') : box.className + ' ui-state-active';
+    });
+}
+"""
+
+PAGE_TEMPLATE = """<!DOCTYPE html>
+<html><head><meta charset="utf-8"><title>{title}</title>
+<link rel="stylesheet" href="/mock/vahan.css"><script src="/mock/vahan.js"></script></head>
+<body>
+<div id="overlay" class="ui-widget-overlay" style="display: {overlay};"></div>
+{body}
+</body></html>
+"""
+
+HOME_BODY = """
+<h3>Vahan Home (mock)</h3>
+<button type="button" title="Dashboard Pendency" onclick="mockAjax('pendency', '', function() {{ setShown('pendency', true); }});">
+    <span>Dashboard Pendency</span></button>
+<div id="pendency" style="display: none;">
+<table class="ui-treetable"><tbody>
+<tr id="node-dealer"><td role="gridcell">
+    <span class="ui-treetable-toggler ui-icon ui-icon-triangle-1-e ui-c" onclick="expandNode(this, 'node-new-registration', 'tree_dealer');"></span><label>Dealer Registration</label>
+</td><td role="gridcell"></td></tr>
+<tr id="node-new-registration" style="display: none;"><td role="gridcell">
+    <span class="ui-treetable-toggler ui-icon ui-icon-triangle-1-e ui-c" onclick="expandNode(this, 'node-rc-approval', 'tree_new_registration');"></span><label>New Registration (Dealer Side)</label>
+</td><td role="gridcell"></td></tr>
+<tr id="node-rc-approval" style="display: none;"><td role="gridcell"><label>NEW-RC-APPROVAL</label></td>
+<td role="gridcell"><a href="#" class="ui-commandlink" onclick="mockAjax('view_detail', '', function() {{ window.location.href = '{pending_path}'; }}); return false;">View Detail</a></td></tr>
+</tbody></table>
+</div>
+{alert}
+"""
+
+ALERT_DIALOG = """
+<div id="primefacesmessagedlg" class="ui-message-dialog ui-dialog ui-widget" style="display: block;">
+<div class="ui-dialog-titlebar"><span class="ui-dialog-title">Alert</span>
+<a href="#" class="ui-dialog-titlebar-close" aria-label="Close" onclick="hideDialog('primefacesmessagedlg'); return false;"><span class="ui-icon ui-icon-closethick"></span></a></div>
+<div class="ui-dialog-content">Please update your contact details.</div>
+</div>
+"""
+
+PENDING_BODY = """
+<h3>Pending Applications (mock)</h3>
+<table id="workDetails"><thead><tr><th>Sr. No.</th><th>Appl No</th><th>Owner</th><th>Action</th></tr></thead>
+<tbody id="workDetails_data">{rows}</tbody></table>
+"""
+
+PENDING_ROW = """<tr data-ri="{ri}"><td>{sr}</td><td>{appl}</td><td>Owner {sr}</td>
+<td><button type="button" id="workDetails:{ri}:j_idt270" onclick="mockAjax('open_application', '{appl}', function() {{ window.location.href = '{approve_path}?appl={appl}'; }});"><span>Approve</span></button></td></tr>"""
+
+EMPTY_ROW = """<tr class="ui-datatable-empty-message"><td colspan="4">No records found.</td></tr>"""
+
+APPROVE_BODY = """
+<h3>Approval Workbench (mock) - {appl}</h3>
+<div id="workbench_tabview:verifyCheckValue" class="ui-chkbox ui-widget">
+    <div class="ui-chkbox-box ui-widget ui-state-default" onclick="toggleBox(this, 'verify');"></div>
+    <label>I have verified the application</label>
+</div>
+<ul class="ui-tabs-nav">
+    <li data-index="0"><a href="#">Owner Details</a></li>
+    <li data-index="1"><a href="#">Vehicle Details</a></li>
+    <li data-index="2"><a href="#">Hypothecation</a></li>
+    <li data-index="3"><a href="#">Insurance</a></li>
+    <li data-index="4"><a href="#">Tax</a></li>
+    <li data-index="5"><a href="#" onclick="mockAjax('documents_tab', '{appl}', function() {{ setShown('documentsPanel', true); }}); return false;">Documents Uploaded</a></li>
+</ul>
+<div id="documentsPanel" style="display: none;">
+    <button type="button" id="workbench_tabview:idViewDoc" onclick="openDms();"><span>Modify/View Documents ({appl})</span></button>
+</div>
+
+<button type="button" onclick="setShown('saveMenu', true);"><span>Save-Options</span></button>
+<ul id="saveMenu" style="display: none;">
+    <li><a href="#" onclick="mockAjax('file_movement_form', '{appl}', function() {{ setShown('saveMenu', false); showDialog('panelAppDisapp'); }}); return false;"><span>File Movement</span></a></li>
+</ul>
+
+<div id="workbench_tabview:viewUploadedDms" class="ui-dialog ui-widget" style="display: none;">
+<div class="ui-dialog-titlebar"><span id="workbench_tabview:viewUploadedDms_title" class="ui-dialog-title">Uploaded Documents</span>
+<a href="#" class="ui-dialog-titlebar-close" aria-label="Close" onclick="closeDms(); return false;"><span class="ui-icon ui-icon-closethick"></span></a></div>
+<div class="ui-dialog-content"><iframe id="dmsFrame" src="about:blank"></iframe></div>
+</div>
+
+<div id="savedMessage" class="ui-dialog ui-widget" style="display: none;">
+<div class="ui-dialog-titlebar"><span class="ui-dialog-title">Confirmation</span><a href="#" class="ui-dialog-titlebar-close" aria-label="Close" onclick="hideDialog('savedMessage'); return false;"><span class="ui-icon ui-icon-closethick"></span></a></div>
+<div class="ui-dialog-content">Document details saved successfully.</div>
+</div>
+
+<div id="panelAppDisapp" class="ui-dialog ui-widget" style="display: none;">
+<div class="ui-dialog-titlebar"><span class="ui-dialog-title">File Movement</span></div>
+<div class="ui-dialog-content"><form id="app_disapp_form" onsubmit="return false;">
+    <div class="ui-radiobutton ui-widget">
+        <div class="ui-helper-hidden-accessible"><input type="radio" id="app_disapp_form:movement:0" name="movement" value="next"></div>
+        <div class="ui-radiobutton-box ui-widget ui-state-default" onclick="toggleBox(this, 'next_seat');"></div>
+    </div>
+    <label for="app_disapp_form:movement:0">Proceed to Next Seat</label>
+    <br><br>
+    <a href="#" id="app_disapp_form:j_idt1949" class="ui-commandlink ui-widget" data-pfconfirmcommand="PF('confirmMovement').show()" onclick="setShown('confirmMovement', true); return false;">Save</a>
+</form></div>
+</div>
+
+<div id="confirmMovement" class="ui-confirm-dialog ui-dialog ui-widget" style="display: none;">
+<div class="ui-dialog-titlebar"><span class="ui-dialog-title">Confirm File Movement</span></div>
+<div class="ui-dialog-content">Move the file to the next seat?
+    <button type="button" id="app_disapp_form:j_idt1951" class="ui-button ui-confirmdialog-yes" onclick="confirmMovement();"><span>Yes</span></button>
+    <button type="button" class="ui-button ui-confirmdialog-no" onclick="setShown('confirmMovement', false);"><span>No</span></button>
+</div>
+</div>
+
+{vltd}
+
+<script>
+function openDms() {{
+    mockAjax('open_dms', '{appl}', function() {{
+        document.getElementById('dmsFrame').src = '{dms_path}?appl={appl}';
+        showDialog('workbench_tabview:viewUploadedDms');
+    }});
+}}
+function closeDms() {{
+    setShown('workbench_tabview:viewUploadedDms', false);
+    showDialog('savedMessage');
+}}
+function confirmMovement() {{
+    setShown('confirmMovement', false);
+    mockAjax('approve', '{appl}', function() {{
+        hideDialog('panelAppDisapp');
+        window.location.href = '{home_path}';
+    }});
+}}
+</script>
+"""
+
+VLTD_DIALOG = """
+<div id="vltdDialog" class="ui-dialog ui-widget" style="display: block;">
+<div class="ui-dialog-titlebar"><span class="ui-dialog-title">Vehicle Location Tracking Device</span></div>
+<div class="ui-dialog-content">VLTD details are pending for this vehicle.
+    <button type="button" id="j_idt124" class="ui-button" onclick="hideDialog('vltdDialog');"><span class="ui-icon-check"></span><span>OK</span></button>
+</div>
+</div>
+"""
+
+DMS_PAGE = """<!DOCTYPE html>
+<html><head><meta charset="utf-8"><title>DMS</title></head>
+<body><h4>Documents of {appl}</h4>
+<table>{rows}</table>
+</body></html>
+"""
+
+DMS_ROW = """<tr><td>{label}</td><td><input type="checkbox" name="approvedStatus{index}"{state}></td></tr>"""
+
+
+class MockVahanHandler(BaseHTTPRequestHandler):
+    server_version = "MockVahan/1.0"
+
+    def log_message(self, format, *args):
+        logger.debug(f"[MOCK] {self.address_string()} {format % args}")
+
+    def send_body(self, body, content_type="text/html; charset=utf-8", status=200):
+        data = body.encode("utf-8")
+        self.send_response(status)
+        self.send_header("Content-Type", content_type)
+        self.send_header("Content-Length", str(len(data)))
+        if content_type.startswith("text/html"):
+            self.send_header("Cache-Control", "no-store")
+        else:
+            self.send_header("Cache-Control", "max-age=3600")
+        self.end_headers()
+        self.wfile.write(data)
+
+    def redirect(self, location):
+        self.send_response(302)
+        self.send_header("Location", location)
+        self.send_header("Content-Length", "0")
+        self.end_headers()
+
+    def page(self, title, body, overlay=False):
+        self.server.latency.sleep(self.server.latency.page)
+        self.send_body(PAGE_TEMPLATE.format(title=title, body=body, overlay="block" if overlay else "none"))
+
+    def do_HEAD(self):
+        # Session keepalive pings
+        self.send_response(200)
+        self.send_header("Content-Length", "0")
+        self.end_headers()
+
+    def do_GET(self):
+        state, latency = self.server.state, self.server.latency
+        state.count_request()
+        url = urlparse(self.path)
+        appl = html.escape(parse_qs(url.query).get("appl", [""])[0])
+
+        if url.path in ("/", "/vahan", "/vahan/", "/vahan/vahan/ui/login/login.xhtml"):
+            self.redirect(HOME_PATH)
+        elif url.path == HOME_PATH:
+            show_alert = state.roll(state.alert_rate)
+            self.page("Vahan Home", HOME_BODY.format(
+                pending_path=PENDING_PATH, alert=ALERT_DIALOG if show_alert else ""
+            ), overlay=show_alert)
+        elif url.path == PENDING_PATH:
+            rows = "".join(
+                PENDING_ROW.format(ri=ri, sr=ri + 1, appl=html.escape(number), approve_path=APPROVE_PATH)
+                for ri, number in enumerate(state.pending_snapshot())
+            )
+            self.page("Pending Applications", PENDING_BODY.format(rows=rows or EMPTY_ROW))
+        elif url.path == APPROVE_PATH:
+            show_vltd = state.roll(state.vltd_rate)
+            self.page("Approval Workbench", APPROVE_BODY.format(
+                appl=appl, vltd=VLTD_DIALOG if show_vltd else "",
+                dms_path=DMS_PATH, home_path=HOME_PATH
+            ), overlay=show_vltd)
+        elif url.path == DMS_PATH:
+            latency.sleep(latency.dms)
+            rows = []
+            for index in range(state.documents):
+                # The last document is always verified already and locked, like on the live DMS
+                locked = index == state.documents - 1
+                rows.append(DMS_ROW.format(
+                    label=f"Document {index + 1}", index=index, state=" checked disabled" if locked else ""
+                ))
+            self.send_body(DMS_PAGE.format(appl=appl, rows="".join(rows)))
+        elif url.path == "/mock/vahan.js":
+            self.send_body(SCRIPT, "application/javascript")
+        elif url.path == "/mock/vahan.css":
+            self.send_body(STYLE, "text/css")
+        elif url.path == "/mock/state":
+            self.send_body(json.dumps(state.as_dict()), "application/json")
+        else:
+            self.send_body("Not found", "text/plain", status=404)
+
+    def do_POST(self):
+        state, latency = self.server.state, self.server.latency
+        state.count_request()
+        url = urlparse(self.path)
+        params = parse_qs(url.query)
+        action = params.get("action", [""])[0]
+        appl = params.get("appl", [""])[0]
+
+        latency.sleep(latency.ajax)
+        if url.path != "/mock/ajax":
+            self.send_body("Not found", "text/plain", status=404)
+            return
+        if action == "approve":
+            state.approve(appl)
+        # JSF partial-response, as PrimeFaces AJAX requests receive it
+        self.send_body(
+            '<?xml version="1.0" encoding="UTF-8"?><partial-response><changes></changes></partial-response>',
+            "text/xml"
+        )
+
+
+class MockVahanServer:
+    """Threaded HTTP server for the mock site. port=0 picks a free port."""
+
+    def __init__(self, port=0, host="127.0.0.1", items=20, latency=None, documents=4,
+                 vltd_rate=0.3, alert_rate=0.2, seed=None):
+        self.state = MockVahanState(items, documents, vltd_rate, alert_rate, seed)
+        self.latency = latency or MockLatency()
+        self.httpd = ThreadingHTTPServer((host, port), MockVahanHandler)
+        self.httpd.daemon_threads = True
+        self.httpd.state = self.state
+        self.httpd.latency = self.latency
+        self._thread = None
+
+    @property
+    def port(self):
+        return self.httpd.server_address[1]
+
+    def chrome_arguments(self):
+        """Chrome flags that send the Vahan host to this server over plain HTTP"""
+        return [
+            f"--host-resolver-rules=MAP {VAHAN_HOST} 127.0.0.1:{self.port}",
+            "--disable-features=HttpsUpgrades",
+        ]
+
+    def url(self, path=HOME_PATH):
+        """URL as the browser sees it (needs chrome_arguments)"""
+        return f"http://{VAHAN_HOST}{path}"
+
+    def start(self):
+        self._thread = threading.Thread(target=self.httpd.serve_forever, name="mock-vahan", daemon=True)
+        self._thread.start()
+        logger.info(f"[MOCK] Mock Vahan listening on 127.0.0.1:{self.port} ({len(self.state.pending)} pending)")
+        return self
+
+    def stop(self):
+        self.httpd.shutdown()
+        self.httpd.server_close()
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Serve a local mock of the Vahan approval pages")
+    parser.add_argument("--port", type=int, default=8765)
+    parser.add_argument("--items", type=int, default=20, help="pending applications")
+    parser.add_argument("--documents", type=int, default=4, help="DMS documents per application")
+    parser.add_argument("--page-latency", type=float, default=0.2)
+    parser.add_argument("--ajax-latency", type=float, default=0.15)
+    parser.add_argument("--dms-latency", type=float, default=0.5)
+    parser.add_argument("--jitter", type=float, default=0.2)
+    parser.add_argument("--vltd-rate", type=float, default=0.3, help="share of applications showing the VLTD dialog")
+    parser.add_argument("--alert-rate", type=float, default=0.2, help="share of home page loads showing an alert")
+    args = parser.parse_args()
+
+    logging.basicConfig(level=logging.INFO)
+    server = MockVahanServer(
+        port=args.port, items=args.items, documents=args.documents,
+        latency=MockLatency(args.page_latency, args.ajax_latency, args.dms_latency, args.jitter),
+        vltd_rate=args.vltd_rate, alert_rate=args.alert_rate,
+    ).start()
+    print(f"Mock Vahan on http://127.0.0.1:{server.port}{HOME_PATH}")
+    print(f"Chrome flags: {' '.join(server.chrome_arguments())}")
+    try:
+        while True:
+            time.sleep(1)
+    except KeyboardInterrupt:
+        server.stop()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,166 @@
+"""
+Python-overhead micro-benchmark for the NEW-RC-APPROVAL workflow.
+
+Runs process_queue against the in-memory FakeWebDriver (no browser, no
+sleeps), so what is measured is the orchestration itself: XPath
+construction, locator fallbacks, wait bookkeeping, safe_print formatting,
+the pipeline, leases, the checkpoint journal and the ledger. Reports CPU
+time, driver calls and memory per item, and compares against a saved
+baseline to flag regressions.
+
+Run from the backend directory:
+    python -m benchmarks.overhead --items 2000 --save overhead_baseline.json
+    python -m benchmarks.overhead --items 2000 --baseline overhead_baseline.json
+"""
+
+import os
+import gc
+import sys
+import json
+import time
+import shutil
+import logging
+import argparse
+import tempfile
+import tracemalloc
+
+from benchmarks.fake_webdriver import VahanScenario
+
+DEFAULT_TOLERANCE = 0.15  # Relative slowdown that counts as a regression
+RETAINED_NOISE_KIB = 0.5  # Retained-memory changes below this per item are noise (caches, interning)
+
+
+class OverheadRun:
+    """Runs the workflow on fresh fake drivers; application serials never repeat between runs"""
+
+    def __init__(self, vahan_automation, documents=4):
+        self.vahan_automation = vahan_automation
+        self.documents = documents
+        self.next_serial = 1
+
+    def __call__(self, items):
+        scenario = VahanScenario(items, self.documents, first_serial=self.next_serial)
+        self.next_serial += items
+        self.vahan_automation.pending_table_urls.clear()  # Every run starts with the full navigation
+        driver = scenario.driver()
+        result = self.vahan_automation.process_queue(driver, worker_id=0)
+        if result.get("processed_count") != items:
+            raise RuntimeError(f"Workflow did not finish on the fake driver: {result.get('status')} {result.get('message')}")
+        return driver
+
+
+def measure(run, items, alloc_items, top=5):
+    """Timing pass over `items`, then a (slower) tracemalloc pass over `alloc_items`"""
+    gc.collect()
+    cpu_started, wall_started = time.process_time(), time.perf_counter()
+    driver = run(items)
+    cpu = time.process_time() - cpu_started
+    wall = time.perf_counter() - wall_started
+
+    gc.collect()
+    tracemalloc.start(10)
+    before = tracemalloc.take_snapshot()
+    run(alloc_items)
+    gc.collect()
+    after = tracemalloc.take_snapshot()
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    ignore_tracemalloc = [tracemalloc.Filter(False, tracemalloc.__file__)]
+    retained = after.filter_traces(ignore_tracemalloc).compare_to(before.filter_traces(ignore_tracemalloc), "lineno")
+
+    return {
+        "items": items,
+        "cpu_ms_per_item": round(cpu / items * 1000, 3),
+        "wall_ms_per_item": round(wall / items * 1000, 3),
+        "items_per_cpu_second": round(items / cpu, 1) if cpu else None,
+        "driver_lookups_per_item": round(driver.lookups / items, 2),
+        "driver_scripts_per_item": round(driver.scripts / items, 2),
+        "driver_clicks_per_item": round(driver.clicks / items, 2),
+        "alloc_items": alloc_items,
+        "peak_kib": round(peak / 1024, 1),
+        "retained_kib_per_item": round(sum(stat.size_diff for stat in retained) / alloc_items / 1024, 3),
+        "top_retained": [
+            {"where": str(stat.traceback[0]), "kib": round(stat.size_diff / 1024, 1), "blocks": stat.count_diff}
+            for stat in retained[:top] if stat.size_diff > 0
+        ],
+    }
+
+
+def compare(report, baseline, tolerance=DEFAULT_TOLERANCE):
+    """Regression messages for report vs. baseline (empty list when nothing regressed)"""
+    regressions = []
+    old, new = baseline.get("cpu_ms_per_item"), report.get("cpu_ms_per_item")
+    if old and new is not None and new > old * (1 + tolerance):
+        regressions.append(f"cpu_ms_per_item: {old} -> {new} (+{(new / old - 1) * 100:.0f}%)")
+    old, new = baseline.get("retained_kib_per_item"), report.get("retained_kib_per_item")
+    if old is not None and new is not None and new - old > RETAINED_NOISE_KIB:
+        regressions.append(f"retained_kib_per_item: {old} -> {new} (possible leak)")
+    # The fake is deterministic, so any extra driver call per item is a real change
+    for key in ("driver_lookups_per_item", "driver_scripts_per_item", "driver_clicks_per_item"):
+        old, new = baseline.get(key), report.get(key)
+        if old is not None and new is not None and new > old:
+            regressions.append(f"{key}: {old} -> {new}")
+    return regressions
+
+
+def format_report(report):
+    lines = [
+        f"Items: {report['items']}  CPU: {report['cpu_ms_per_item']} ms/item  Wall: {report['wall_ms_per_item']} ms/item  "
+        f"({report['items_per_cpu_second']} items per CPU second)",
+        f"Driver calls per item: {report['driver_lookups_per_item']} lookups, "
+        f"{report['driver_scripts_per_item']} scripts, {report['driver_clicks_per_item']} clicks",
+        f"Memory ({report['alloc_items']} items traced): peak {report['peak_kib']} KiB, "
+        f"retained {report['retained_kib_per_item']} KiB/item",
+    ]
+    for site in report["top_retained"]:
+        lines.append(f"  {site['kib']:>8} KiB {site['blocks']:>6} blocks  {site['where']}")
+    return "\n".join(lines)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Measure the Python cost per item of the approval workflow")
+    parser.add_argument("--items", type=int, default=2000, help="items in the timing pass")
+    parser.add_argument("--alloc-items", type=int, default=200, help="items in the tracemalloc pass")
+    parser.add_argument("--documents", type=int, default=4)
+    parser.add_argument("--baseline", help="JSON report to compare against")
+    parser.add_argument("--tolerance", type=float, default=DEFAULT_TOLERANCE)
+    parser.add_argument("--save", help="write this run's report to a JSON file")
+    parser.add_argument("--quiet-logs", action="store_true",
+                        help="drop log records below WARNING (measures the workflow without log formatting)")
+    args = parser.parse_args()
+
+    # The app logs at INFO; records are formatted as usual but written nowhere
+    logging.basicConfig(level=logging.WARNING if args.quiet_logs else logging.INFO, stream=open(os.devnull, "w"))
+
+    data_dir = tempfile.mkdtemp(prefix="taskify-overhead-")
+    # get_app_data_path() is read when vahan_automation is imported
+    os.environ["XDG_DATA_HOME"] = data_dir
+    os.environ["LOCALAPPDATA"] = data_dir
+    os.environ["TASKIFY_LEAN_MODE"] = "0"
+    try:
+        import vahan_automation
+        run = OverheadRun(vahan_automation, documents=args.documents)
+        run(20)  # Warm-up: imports, SQLite schemas, journal file
+        report = measure(run, args.items, args.alloc_items)
+    finally:
+        shutil.rmtree(data_dir, ignore_errors=True)
+
+    print(format_report(report))
+    if args.save:
+        with open(args.save, "w") as f:
+            json.dump(report, f, indent=2)
+
+    if args.baseline:
+        with open(args.baseline, "r") as f:
+            regressions = compare(report, json.load(f), args.tolerance)
+        if regressions:
+            print("\nREGRESSIONS:")
+            for line in regressions:
+                print(f"  {line}")
+            return 1
+        print("\nNo regressions against the baseline.")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
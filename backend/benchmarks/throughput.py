@@ -0,0 +1,187 @@
+"""
+End-to-end throughput benchmark: run_automation against the mock Vahan site.
+
+Starts benchmarks.mock_vahan, opens Chrome (one browser per worker) with the
+Vahan host pointed at the mock, runs the real NEW-RC-APPROVAL automation until
+the queue is empty and reports items/min plus per-step timings taken from the
+processed-applications ledger. App data (ledger, journal, leases) goes to a
+temporary directory, so the operator's real history is not touched.
+
+Run from the backend directory:
+    python -m benchmarks.throughput --items 20 --workers 2 --ajax-latency 0.3
+    python -m benchmarks.throughput --lean --json results.json
+"""
+
+import os
+import sys
+import json
+import time
+import shutil
+import logging
+import argparse
+import tempfile
+import statistics
+
+from benchmarks.mock_vahan import MockLatency, MockVahanServer
+
+
+def percentile(values, fraction):
+    ordered = sorted(values)
+    if not ordered:
+        return 0.0
+    return ordered[min(len(ordered) - 1, int(round(fraction * (len(ordered) - 1))))]
+
+
+def summarize_steps(items):
+    """Per-step mean/p50/p95/max wall time over the ledger items"""
+    per_step = {}
+    for item in items:
+        for step, wall_time in item["step_timings"].items():
+            per_step.setdefault(step, []).append(wall_time)
+    return {
+        step: {
+            "count": len(values),
+            "mean": round(statistics.mean(values), 3),
+            "p50": round(percentile(values, 0.5), 3),
+            "p95": round(percentile(values, 0.95), 3),
+            "max": round(max(values), 3),
+        }
+        for step, values in per_step.items()
+    }
+
+
+def create_benchmark_driver(server, headless=True, lean=False):
+    """Plain Selenium Chrome with the mock's host mapping and the automation's CDP logging"""
+    from selenium import webdriver
+    from vahan_waits import enable_network_events
+    import chrome_tuning
+
+    options = webdriver.ChromeOptions()
+    if headless:
+        options.add_argument("--headless=new")
+    options.add_argument("--window-size=1366,900")
+    options.add_argument("--no-first-run")
+    options.add_argument("--no-default-browser-check")
+    for argument in server.chrome_arguments():
+        options.add_argument(argument)
+    enable_network_events(options)
+    if lean:
+        chrome_tuning.apply_lean_options(options)
+
+    driver = webdriver.Chrome(options=options)
+    if lean:
+        chrome_tuning.apply_blocked_urls(driver, after_login=True)
+    driver.get(server.url())
+    return driver
+
+
+def run_benchmark(items=20, workers=1, latency=None, headless=True, lean=False, vltd_rate=0.3,
+                  alert_rate=0.2, documents=4, seed=1):
+    """Run one benchmark and return the report dict"""
+    data_dir = tempfile.mkdtemp(prefix="taskify-bench-")
+    # get_app_data_path() is read when vahan_automation is imported
+    os.environ["XDG_DATA_HOME"] = data_dir
+    os.environ["LOCALAPPDATA"] = data_dir
+    os.environ["TASKIFY_LEAN_MODE"] = "1" if lean else "0"
+    import vahan_automation
+
+    server = MockVahanServer(
+        items=items, latency=latency, documents=documents, vltd_rate=vltd_rate, alert_rate=alert_rate, seed=seed
+    ).start()
+    drivers = []
+    try:
+        for _ in range(workers):
+            drivers.append(create_benchmark_driver(server, headless=headless, lean=lean))
+
+        # The mock session counts as logged in; extra browsers join the pool as ready workers
+        vahan_automation.driver_instance = drivers[0]
+        vahan_automation.is_logged_in = True
+        for worker_id, driver in enumerate(drivers[1:], start=1):
+            worker = vahan_automation.worker_pool.get_or_create(worker_id)
+            worker.driver = driver
+            worker.is_logged_in = True
+            worker.status = "ready"
+
+        started = time.perf_counter()
+        result = vahan_automation.run_automation()
+        elapsed = time.perf_counter() - started
+
+        ledger = vahan_automation.processed_ledger.query(page_size=500)["items"]
+        completed = [item for item in ledger if item["outcome"] == "completed"]
+        return {
+            "items": items,
+            "workers": workers,
+            "lean": lean,
+            "latency": server.latency.as_dict(),
+            "elapsed": round(elapsed, 2),
+            "processed": len(completed),
+            "failed": len(ledger) - len(completed),
+            "items_per_minute": round(len(completed) / elapsed * 60, 2) if elapsed else 0.0,
+            "mean_item_seconds": round(statistics.mean(i["duration"] for i in completed), 2) if completed else None,
+            "mock": server.state.as_dict(),
+            "status": result.get("status"),
+            "message": result.get("message"),
+            "steps": summarize_steps(completed),
+        }
+    finally:
+        for driver in drivers:
+            try:
+                driver.quit()
+            except Exception:
+                pass
+        vahan_automation.driver_instance = None
+        vahan_automation.is_logged_in = False
+        server.stop()
+        shutil.rmtree(data_dir, ignore_errors=True)
+
+
+def format_report(report):
+    lines = [
+        f"Items: {report['processed']}/{report['items']} processed, {report['failed']} failed "
+        f"({report['workers']} browser(s){', lean mode' if report['lean'] else ''})",
+        f"Elapsed: {report['elapsed']}s  Throughput: {report['items_per_minute']} items/min  "
+        f"Mean per item: {report['mean_item_seconds']}s",
+        f"Latency: {report['latency']}",
+        f"Result: {report['status']}",
+        "",
+        f"{'step':<28}{'count':>6}{'mean':>9}{'p50':>9}{'p95':>9}{'max':>9}",
+    ]
+    for step, stats in report["steps"].items():
+        lines.append(
+            f"{step:<28}{stats['count']:>6}{stats['mean']:>9.3f}{stats['p50']:>9.3f}{stats['p95']:>9.3f}{stats['max']:>9.3f}"
+        )
+    return "\n".join(lines)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Measure automation throughput against the mock Vahan site")
+    parser.add_argument("--items", type=int, default=20)
+    parser.add_argument("--workers", type=int, default=1, help="browsers processing the queue in parallel")
+    parser.add_argument("--page-latency", type=float, default=0.2)
+    parser.add_argument("--ajax-latency", type=float, default=0.15)
+    parser.add_argument("--dms-latency", type=float, default=0.5)
+    parser.add_argument("--jitter", type=float, default=0.2)
+    parser.add_argument("--vltd-rate", type=float, default=0.3)
+    parser.add_argument("--alert-rate", type=float, default=0.2)
+    parser.add_argument("--documents", type=int, default=4)
+    parser.add_argument("--lean", action="store_true", help="run with TASKIFY_LEAN_MODE")
+    parser.add_argument("--headed", action="store_true", help="show the browser windows")
+    parser.add_argument("--json", help="also write the report to this file")
+    args = parser.parse_args()
+
+    logging.basicConfig(level=logging.WARNING)
+    report = run_benchmark(
+        items=args.items, workers=args.workers,
+        latency=MockLatency(args.page_latency, args.ajax_latency, args.dms_latency, args.jitter),
+        headless=not args.headed, lean=args.lean, vltd_rate=args.vltd_rate,
+        alert_rate=args.alert_rate, documents=args.documents,
+    )
+    print(format_report(report))
+    if args.json:
+        with open(args.json, "w") as f:
+            json.dump(report, f, indent=2)
+    return 0 if report["failed"] == 0 and report["processed"] == report["items"] else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
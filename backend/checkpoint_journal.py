@@ -0,0 +1,117 @@
+import os
+import json
+import time
+import logging
+import threading
+
+logger = logging.getLogger(__name__)
+
+JOURNAL_FILENAME = "checkpoint_journal.jsonl"
+CHECKPOINT_MAX_AGE = 6 * 3600  # Older checkpoints are ignored; the Vahan session is long gone
+COMPACT_SIZE = 1024 * 1024  # Rewrite the journal once it grows past this many bytes
+
+
+class CheckpointJournal:
+    """
+    Append-only journal of workflow progress per application, stored under the
+    app data path so a run can resume an application mid-workflow after the
+    backend or Chrome restarts.
+
+    Each line records (worker_id, application_no, step) after a step completes,
+    and a final "closed" line when the application is finished or given up.
+    Lines are flushed and fsynced before the next step runs.
+    """
+
+    def __init__(self, app_data_path: str):
+        self.app_data_path = app_data_path
+        self.journal_file = os.path.join(app_data_path, JOURNAL_FILENAME)
+        self._lock = threading.Lock()
+        self._open = None  # worker_id -> latest open checkpoint, loaded lazily
+
+    def _load(self):
+        # Caller holds self._lock
+        if self._open is not None:
+            return
+        self._open = {}
+        if not os.path.exists(self.journal_file):
+            return
+        try:
+            with open(self.journal_file, "r", encoding="utf-8") as f:
+                for line in f:
+                    try:
+                        entry = json.loads(line)
+                    except json.JSONDecodeError:
+                        continue  # Torn last line from a crash mid-write
+                    self._apply(entry)
+        except OSError as e:
+            logger.error(f"Error reading checkpoint journal: {e}")
+        self._compact()
+
+    def _apply(self, entry):
+        worker_id = entry.get("worker_id", 0)
+        if entry.get("event") == "closed":
+            current = self._open.get(worker_id)
+            if current and current["application_no"] == entry.get("application_no"):
+                del self._open[worker_id]
+        else:
+            self._open[worker_id] = entry
+
+    def _append(self, entry):
+        # Caller holds self._lock
+        try:
+            os.makedirs(self.app_data_path, exist_ok=True)
+            with open(self.journal_file, "a", encoding="utf-8") as f:
+                f.write(json.dumps(entry) + "\n")
+                f.flush()
+                os.fsync(f.fileno())
+        except OSError as e:
+            logger.error(f"Error writing checkpoint journal: {e}")
+        self._apply(entry)
+
+    def _compact(self):
+        """Rewrite the journal with only the open checkpoints (atomic replace)"""
+        temp_file = self.journal_file + ".tmp"
+        try:
+            with open(temp_file, "w", encoding="utf-8") as f:
+                for entry in self._open.values():
+                    f.write(json.dumps(entry) + "\n")
+                f.flush()
+                os.fsync(f.fileno())
+            os.replace(temp_file, self.journal_file)
+        except OSError as e:
+            logger.error(f"Error compacting checkpoint journal: {e}")
+
+    def record_step(self, worker_id: int, application_no: str, step: str):
+        """Record that `step` completed for the application this worker is on"""
+        with self._lock:
+            self._load()
+            self._append({
+                "event": "step",
+                "worker_id": worker_id,
+                "application_no": application_no,
+                "step": step,
+                "ts": time.time(),
+            })
+
+    def close(self, worker_id: int, application_no: str, outcome: str):
+        """Mark the application finished (or abandoned); it will not be resumed"""
+        with self._lock:
+            self._load()
+            self._append({
+                "event": "closed",
+                "worker_id": worker_id,
+                "application_no": application_no,
+                "outcome": outcome,
+                "ts": time.time(),
+            })
+            if os.path.exists(self.journal_file) and os.path.getsize(self.journal_file) > COMPACT_SIZE:
+                self._compact()
+
+    def open_checkpoint(self, worker_id: int):
+        """Latest unfinished checkpoint of this worker, or None"""
+        with self._lock:
+            self._load()
+            entry = self._open.get(worker_id)
+            if entry and time.time() - entry.get("ts", 0) > CHECKPOINT_MAX_AGE:
+                return None
+            return dict(entry) if entry else None
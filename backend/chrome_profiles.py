@@ -0,0 +1,134 @@
+import os
+import time
+import shutil
+import logging
+from typing import Optional
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_MAX_PROFILE_MB = 1024  # Per profile; caches are trimmed above this
+DEFAULT_DISK_CACHE_MB = 512  # Passed to Chrome as --disk-cache-size
+STALE_PROFILE_DAYS = 30  # Worker profiles unused this long are deleted
+
+# Profile subdirectories that only hold caches, cheapest to rebuild first.
+# "Default/Cache" (the HTTP cache we want to keep) is trimmed last.
+DISPOSABLE_DIRS = [
+    "Crashpad",
+    "ShaderCache",
+    "GrShaderCache",
+    "GraphiteDawnCache",
+    os.path.join("Default", "GPUCache"),
+    os.path.join("Default", "DawnCache"),
+    os.path.join("Default", "Code Cache"),
+    os.path.join("Default", "Service Worker", "CacheStorage"),
+    os.path.join("Default", "Service Worker", "ScriptCache"),
+    os.path.join("Default", "Cache"),
+]
+
+# Left behind when Chrome crashes; they make the next launch think the profile is in use
+SINGLETON_FILES = ["SingletonLock", "SingletonCookie", "SingletonSocket", "lockfile"]
+
+
+def _env_int(name, default):
+    try:
+        return int(os.environ.get(name, default))
+    except ValueError:
+        return default
+
+
+def directory_size(path: str) -> int:
+    total = 0
+    for root, _, files in os.walk(path):
+        for name in files:
+            try:
+                total += os.path.getsize(os.path.join(root, name))
+            except OSError:
+                pass
+    return total
+
+
+class ChromeProfileManager:
+    """
+    Persistent Chrome profiles under the app data path, one per browser
+    worker, so the HTTP cache (Vahan scripts, stylesheets, PrimeFaces
+    resources) and site state survive restarts. Profiles are kept below a
+    size limit by trimming cache directories before Chrome starts, and
+    profiles of workers that are no longer used are removed.
+
+    Environment:
+        TASKIFY_PERSISTENT_PROFILE  "0" to go back to throwaway profiles
+        TASKIFY_PROFILE_MAX_MB      size limit per profile (default 1024)
+        TASKIFY_DISK_CACHE_MB       Chrome HTTP cache size (default 512)
+    """
+
+    def __init__(self, app_data_path: str):
+        self.profile_root = os.path.join(app_data_path, "chrome-profiles")
+        self.max_bytes = _env_int("TASKIFY_PROFILE_MAX_MB", DEFAULT_MAX_PROFILE_MB) * 1024 * 1024
+        self.disk_cache_bytes = _env_int("TASKIFY_DISK_CACHE_MB", DEFAULT_DISK_CACHE_MB) * 1024 * 1024
+
+    def enabled(self) -> bool:
+        return os.environ.get("TASKIFY_PERSISTENT_PROFILE", "1").lower() not in ("0", "false", "no", "off")
+
+    def profile_dir(self, worker_id: int, create: bool = True) -> Optional[str]:
+        """Profile directory of a worker (0 is the primary browser), or None when disabled"""
+        if not self.enabled():
+            return None
+        path = os.path.join(self.profile_root, f"worker-{worker_id}")
+        if create:
+            os.makedirs(path, exist_ok=True)
+        return path
+
+    def chrome_arguments(self):
+        return [f"--disk-cache-size={self.disk_cache_bytes}"]
+
+    def prepare(self, profile_dir: str):
+        """
+        Make a profile ready for a fresh Chrome launch (Chrome must not be
+        running on it): drop stale singleton locks and enforce the size limit.
+        """
+        for name in SINGLETON_FILES:
+            path = os.path.join(profile_dir, name)
+            if os.path.lexists(path):
+                try:
+                    os.remove(path)
+                except OSError as e:
+                    logger.info(f"[PROFILE] Could not remove stale {name}: {e}")
+
+        size = directory_size(profile_dir)
+        if size <= self.max_bytes:
+            logger.info(f"[PROFILE] {profile_dir}: {size / 1048576:.0f} MB")
+            return size
+
+        logger.info(f"[PROFILE] {profile_dir} is {size / 1048576:.0f} MB, trimming caches")
+        for relative in DISPOSABLE_DIRS:
+            path = os.path.join(profile_dir, relative)
+            if not os.path.isdir(path):
+                continue
+            freed = directory_size(path)
+            shutil.rmtree(path, ignore_errors=True)
+            size -= freed
+            if size <= self.max_bytes:
+                break
+        logger.info(f"[PROFILE] {profile_dir} trimmed to {size / 1048576:.0f} MB")
+        return size
+
+    def cleanup_stale(self, keep_worker_ids=(0,), max_age_days: int = STALE_PROFILE_DAYS) -> int:
+        """Delete worker profiles untouched for max_age_days. Returns how many were removed."""
+        if not os.path.isdir(self.profile_root):
+            return 0
+        keep = {f"worker-{worker_id}" for worker_id in keep_worker_ids}
+        cutoff = time.time() - max_age_days * 86400
+        removed = 0
+        for name in os.listdir(self.profile_root):
+            path = os.path.join(self.profile_root, name)
+            if name in keep or not os.path.isdir(path):
+                continue
+            try:
+                if os.path.getmtime(path) < cutoff:
+                    shutil.rmtree(path, ignore_errors=True)
+                    removed += 1
+            except OSError:
+                pass
+        if removed:
+            logger.info(f"[PROFILE] Removed {removed} unused worker profile(s)")
+        return removed
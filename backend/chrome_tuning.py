@@ -0,0 +1,79 @@
+"""
+Lean page-load mode for the Vahan Chrome instances.
+
+Operators work on slow government network links, and every navigation pulls
+images, fonts and third-party scripts the automation never looks at. In lean
+mode Chrome uses the "eager" page-load strategy (driver.get returns once the
+DOM is parsed; the workflow's own readiness checks take over from there) and
+blocks configurable URL patterns through CDP Network.setBlockedURLs.
+
+Images stay allowed until the operator has logged in because the login page
+shows a captcha.
+
+Environment:
+    TASKIFY_LEAN_MODE                   "1" to enable (default off)
+    TASKIFY_BLOCK_RESOURCES             resource types blocked from the start
+    TASKIFY_BLOCK_RESOURCES_AFTER_LOGIN resource types blocked once logged in
+    TASKIFY_BLOCK_URLS                  extra comma-separated URL patterns
+"""
+
+import os
+import logging
+
+logger = logging.getLogger(__name__)
+
+# URL patterns (Network.setBlockedURLs wildcards) per resource type
+RESOURCE_TYPE_PATTERNS = {
+    "image": ["*.png", "*.jpg", "*.jpeg", "*.gif", "*.webp", "*.bmp", "*.ico"],
+    "font": ["*.woff", "*.woff2", "*.ttf", "*.otf", "*.eot"],
+    "media": ["*.mp4", "*.webm", "*.mp3", "*.ogg", "*.wav"],
+    "analytics": [
+        "*google-analytics.com*", "*googletagmanager.com*", "*doubleclick.net*",
+        "*facebook.net*", "*hotjar.com*",
+    ],
+}
+DEFAULT_BLOCKED_TYPES = "font,media,analytics"
+DEFAULT_BLOCKED_TYPES_AFTER_LOGIN = "image"
+
+
+def _env_list(name, default=""):
+    return [item.strip() for item in os.environ.get(name, default).split(",") if item.strip()]
+
+
+def lean_mode_enabled():
+    return os.environ.get("TASKIFY_LEAN_MODE", "0").lower() in ("1", "true", "yes", "on")
+
+
+def blocked_url_patterns(after_login=False):
+    """URL patterns to block before (or, with after_login, after) the operator logs in"""
+    types = _env_list("TASKIFY_BLOCK_RESOURCES", DEFAULT_BLOCKED_TYPES)
+    if after_login:
+        types += _env_list("TASKIFY_BLOCK_RESOURCES_AFTER_LOGIN", DEFAULT_BLOCKED_TYPES_AFTER_LOGIN)
+
+    patterns = []
+    for resource_type in types:
+        if resource_type not in RESOURCE_TYPE_PATTERNS:
+            logger.warning(f"[LEAN] Unknown resource type '{resource_type}' ignored")
+            continue
+        patterns.extend(RESOURCE_TYPE_PATTERNS[resource_type])
+    patterns.extend(_env_list("TASKIFY_BLOCK_URLS"))
+    return list(dict.fromkeys(patterns))
+
+
+def apply_lean_options(options):
+    """ChromeOptions changes for lean mode (set before the driver is created)"""
+    options.page_load_strategy = "eager"
+    return options
+
+
+def apply_blocked_urls(driver, after_login=False):
+    """Install the URL block list on the driver's current tab. Returns True on success."""
+    patterns = blocked_url_patterns(after_login)
+    try:
+        driver.execute_cdp_cmd("Network.enable", {})
+        driver.execute_cdp_cmd("Network.setBlockedURLs", {"urls": patterns})
+        logger.info(f"[LEAN] Blocking {len(patterns)} URL patterns{' (logged in)' if after_login else ''}")
+        return True
+    except Exception as e:
+        logger.warning(f"[LEAN] Could not install URL block list: {str(e)[:100]}")
+        return False
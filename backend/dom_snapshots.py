@@ -0,0 +1,405 @@
+"""
+DOM snapshot fixtures for offline selector checks.
+
+When TASKIFY_RECORD_DOM is on, the workflow stores a sanitized copy of the
+page DOM (and of every same-origin iframe) once each step's ready condition
+is met, i.e. the page the step's locators run against, for the first few
+applications of a run. A recording is a versioned fixture directory under
+<app data>/dom-fixtures with a manifest.json that also notes how each
+recorded item ended.
+
+validate_fixture() replays the workflow's locators against a fixture with
+lxml (no browser), so a change on the Vahan site can be checked offline in
+milliseconds before an update is rolled out:
+
+    python dom_snapshots.py                     # latest fixture
+    python dom_snapshots.py <fixture dir> --json report.json
+
+Sanitizing removes script/style bodies, form values and the JSF view state,
+and masks all text in data table cells (letters -> X, digits -> 9) so owner
+details never end up in a fixture while the shape of application numbers is
+kept. The only cell texts left readable are the ones the workflow's locators
+match on (locator_texts(): "NEW-RC-APPROVAL", "Dealer Registration", ...).
+Validation needs lxml and cssselect (requirements-dev.txt).
+
+Environment:
+    TASKIFY_RECORD_DOM        "1" to record
+    TASKIFY_RECORD_DOM_ITEMS  applications recorded per run (default 3)
+"""
+
+import os
+import re
+import sys
+import json
+import time
+import logging
+import argparse
+import threading
+from typing import Optional
+
+logger = logging.getLogger(__name__)
+
+FIXTURE_FORMAT = 1
+FIXTURE_DIRNAME = "dom-fixtures"
+DEFAULT_RECORD_ITEMS = 3
+
+# Item outcomes where the workflow took no application (the final, queue-empty
+# iteration, or every row held by other workers): their pages legitimately lack
+# the action targets
+NO_WORK_STATUSES = ("no_approve_button", "all_rows_leased", "application_numbers_unreadable")
+
+# Text a locator compares against: contains(., 'X'), contains(text(), 'X'), text()='X'
+LOCATOR_TEXT_PATTERN = re.compile(r"(?:text\(\)|\.)\s*[,=]\s*'([^']+)'")
+
+# Clones the document, sanitizes the clone and returns it with the same-origin iframe DOMs.
+# arguments[0]: cell texts that stay readable (exactly, or followed by a count like " (12)")
+SNAPSHOT_SCRIPT = """
+var KEEP_VALUE_TYPES = ['checkbox', 'radio', 'button', 'submit', 'reset', 'image'];
+var KEEP_TEXTS = arguments[0] || [];
+function maskText(text) { return text.replace(/[A-Za-z]/g, 'X').replace(/[0-9]/g, '9'); }
+function keepText(text) {
+    var normalized = text.replace(/\\s+/g, ' ').trim();
+    for (var i = 0; i < KEEP_TEXTS.length; i++) {
+        var keep = KEEP_TEXTS[i];
+        if (normalized.indexOf(keep) === 0 && /^[\\s\\d()\\[\\]:.\\-]*$/.test(normalized.slice(keep.length))) {
+            return true;
+        }
+    }
+    return false;
+}
+function serialize(doc) {
+    if (!doc || !doc.documentElement) { return null; }
+    var liveInputs = doc.querySelectorAll('input');
+    var clone = doc.documentElement.cloneNode(true);
+    var inputs = clone.querySelectorAll('input');
+    for (var i = 0; i < inputs.length && i < liveInputs.length; i++) {
+        var type = (inputs[i].getAttribute('type') || 'text').toLowerCase();
+        if (KEEP_VALUE_TYPES.indexOf(type) < 0 || inputs[i].name === 'javax.faces.ViewState') {
+            inputs[i].removeAttribute('value');
+        }
+        // Live state is not reflected in attributes; locators may test it
+        if (liveInputs[i].checked) { inputs[i].setAttribute('checked', 'checked'); } else { inputs[i].removeAttribute('checked'); }
+        if (liveInputs[i].disabled) { inputs[i].setAttribute('disabled', 'disabled'); }
+    }
+    clone.querySelectorAll('script, style, noscript, textarea').forEach(function(el) { el.textContent = ''; });
+    clone.querySelectorAll('tbody td').forEach(function(td) {
+        var walker = document.createTreeWalker(td, NodeFilter.SHOW_TEXT);
+        var node;
+        while ((node = walker.nextNode())) {
+            if (!keepText(node.nodeValue)) {
+                node.nodeValue = maskText(node.nodeValue);
+            }
+        }
+    });
+    return '<!DOCTYPE html>\\n' + clone.outerHTML;
+}
+var frames = [];
+document.querySelectorAll('iframe').forEach(function(iframe) {
+    var html = null;
+    try { html = serialize(iframe.contentDocument); } catch (e) { html = null; }
+    frames.push({id: iframe.id || null, src: iframe.getAttribute('src'), html: html});
+});
+return {url: window.location.href, title: document.title, html: serialize(document), frames: frames};
+"""
+
+
+def record_enabled() -> bool:
+    return os.environ.get("TASKIFY_RECORD_DOM", "0").lower() in ("1", "true", "yes", "on")
+
+
+def locator_texts(steps, *locator_maps):
+    """Texts the XPath locators of steps (and of {step: locators} maps) match on, sorted"""
+    locators = [locator for step in steps for locator in step.locators]
+    locators += [locator for mapping in locator_maps for group in mapping.values() for locator in group]
+    texts = set()
+    for locator in locators:
+        if locator.by == "xpath":
+            texts.update(LOCATOR_TEXT_PATTERN.findall(locator.value))
+    return sorted(texts)
+
+
+def _safe_name(value) -> str:
+    return "".join(c if c.isalnum() or c in "-_" else "_" for c in str(value))
+
+
+class DomSnapshotRecorder:
+    """
+    Writes one fixture directory per backend run:
+
+        dom-fixtures/<timestamp>/manifest.json
+        dom-fixtures/<timestamp>/<item>/<nn>-<step>.json
+
+    Each snapshot file holds the step name, URL, capture time, sanitized
+    HTML and the iframe DOMs. The manifest maps each item to the status its
+    workflow run ended with. Recording stops after max_items applications.
+    keep_texts are the data cell texts left unmasked (see locator_texts).
+    """
+
+    def __init__(self, app_data_path: str, workflow: str = "NEW-RC-APPROVAL", max_items: Optional[int] = None,
+                 keep_texts=()):
+        self.root = os.path.join(app_data_path, FIXTURE_DIRNAME)
+        self.workflow = workflow
+        self.keep_texts = list(keep_texts)
+        if max_items is None:
+            try:
+                max_items = int(os.environ.get("TASKIFY_RECORD_DOM_ITEMS", DEFAULT_RECORD_ITEMS))
+            except ValueError:
+                max_items = DEFAULT_RECORD_ITEMS
+        self.max_items = max_items
+        self.fixture_dir = None
+        self._items = {}  # (worker_id, item key) -> [item dir, next snapshot index]
+        self._outcomes = {}  # item dir name -> status of the finished run
+        self._lock = threading.Lock()
+
+    def on_ready(self, driver, context, worker_id):
+        """run_pipeline on_ready callback that snapshots each step's page once it is ready"""
+        return lambda step_name: self.capture(driver, step_name, context, worker_id)
+
+    def finish(self, context, worker_id, result):
+        """Note in the manifest how a recorded item ended"""
+        key = (worker_id, context.get("recording_id"))
+        with self._lock:
+            slot = self._items.get(key)
+            if slot is None:
+                return
+            self._outcomes[os.path.basename(slot[0])] = result.get("status") or (
+                "completed" if result.get("success") else "error"
+            )
+            self._write_manifest()
+
+    def _slot(self, context, worker_id):
+        """Directory and file index for the next snapshot of this item, or None when recording is done"""
+        key = (worker_id, context.setdefault("recording_id", f"{time.time():.6f}"))
+        with self._lock:
+            slot = self._items.get(key)
+            if slot is None:
+                if len(self._items) >= self.max_items:
+                    return None
+                if self.fixture_dir is None:
+                    self.fixture_dir = os.path.join(self.root, time.strftime("%Y%m%d-%H%M%S"))
+                slot = self._items[key] = [os.path.join(self.fixture_dir, f"item-{len(self._items) + 1:03d}-w{worker_id}"), 0]
+                os.makedirs(slot[0], exist_ok=True)
+                self._write_manifest()
+            slot[1] += 1
+            return slot[0], slot[1]
+
+    def _write_manifest(self):
+        # Caller holds self._lock
+        manifest = {
+            "format": FIXTURE_FORMAT,
+            "workflow": self.workflow,
+            "created_at": time.time(),
+            "items": sorted(os.path.basename(slot[0]) for slot in self._items.values()),
+            "outcomes": dict(self._outcomes),
+        }
+        temp_file = os.path.join(self.fixture_dir, "manifest.json.tmp")
+        with open(temp_file, "w") as f:
+            json.dump(manifest, f, indent=2)
+        os.replace(temp_file, os.path.join(self.fixture_dir, "manifest.json"))
+
+    def capture(self, driver, step_name, context, worker_id=0):
+        """Store a snapshot for step_name. Never raises: recording must not break the workflow."""
+        try:
+            slot = self._slot(context, worker_id)
+            if slot is None:
+                return False
+            item_dir, index = slot
+            snapshot = driver.execute_script(SNAPSHOT_SCRIPT, self.keep_texts) or {}
+            snapshot.update(step=step_name, captured_at=time.time())
+            with open(os.path.join(item_dir, f"{index:02d}-{_safe_name(step_name)}.json"), "w", encoding="utf-8") as f:
+                json.dump(snapshot, f)
+            return True
+        except Exception as e:
+            logger.info(f"[DOM] Snapshot of step '{step_name}' failed: {str(e)[:100]}")
+            return False
+
+
+def latest_fixture(app_data_path: str) -> Optional[str]:
+    root = os.path.join(app_data_path, FIXTURE_DIRNAME)
+    if not os.path.isdir(root):
+        return None
+    names = sorted(name for name in os.listdir(root) if os.path.isfile(os.path.join(root, name, "manifest.json")))
+    return os.path.join(root, names[-1]) if names else None
+
+
+def load_fixture(fixture_dir: str):
+    """Return (manifest, items) where items is a list of snapshot lists in capture order"""
+    with open(os.path.join(fixture_dir, "manifest.json"), "r") as f:
+        manifest = json.load(f)
+    if manifest.get("format") != FIXTURE_FORMAT:
+        raise ValueError(f"Unsupported fixture format {manifest.get('format')} (expected {FIXTURE_FORMAT})")
+    items = []
+    for item in manifest.get("items", []):
+        item_dir = os.path.join(fixture_dir, item)
+        snapshots = []
+        for name in sorted(os.listdir(item_dir)):
+            if name.endswith(".json"):
+                with open(os.path.join(item_dir, name), "r", encoding="utf-8") as f:
+                    snapshots.append(json.load(f))
+        items.append(snapshots)
+    return manifest, items
+
+
+def _xpath_literal(value: str) -> str:
+    if "'" not in value:
+        return f"'{value}'"
+    if '"' not in value:
+        return f'"{value}"'
+    return "concat(" + ", \"'\", ".join(f"'{part}'" for part in value.split("'")) + ")"
+
+
+def locator_xpath(by: str, value: str) -> Optional[str]:
+    """XPath equivalent of a Selenium locator, or None when it cannot be translated"""
+    if by == "xpath":
+        return value
+    if by == "id":
+        return f"//*[@id={_xpath_literal(value)}]"
+    if by == "name":
+        return f"//*[@name={_xpath_literal(value)}]"
+    if by == "tag name":
+        return f"//{value}"
+    if by == "class name":
+        return f"//*[contains(concat(' ', normalize-space(@class), ' '), {_xpath_literal(' ' + value + ' ')})]"
+    if by == "css selector":
+        try:
+            from cssselect import GenericTranslator
+        except ImportError:
+            return None
+        return GenericTranslator().css_to_xpath(value)
+    return None
+
+
+class _Documents:
+    """Parsed snapshot DOMs, each parsed once"""
+
+    def __init__(self):
+        try:
+            from lxml import html  # Only the replay needs lxml; it is not bundled with the app
+        except ImportError:
+            raise ImportError("Validating DOM fixtures needs lxml (pip install -r requirements-dev.txt)")
+        self._html = html
+        self._cache = {}
+
+    def parse(self, markup):
+        if not markup:
+            return None
+        key = id(markup)
+        if key not in self._cache:
+            self._cache[key] = (markup, self._html.document_fromstring(markup))
+        return self._cache[key][1]
+
+    def matches(self, markup, by, value):
+        document = self.parse(markup)
+        xpath = locator_xpath(by, value)
+        if document is None or xpath is None:
+            return None
+        return len(document.xpath(xpath)) > 0
+
+
+def validate_fixture(fixture_dir: str, steps, action_locators=None, frame_locators=None) -> dict:
+    """
+    Check every step's locators against the snapshots recorded at that step.
+
+    steps are vahan_pipeline.Step objects: their locators are alternatives,
+    so a step passes when one of them matches ("fallback" when only a later
+    one does). action_locators maps step name -> locators that must all
+    match the page; frame_locators maps step name -> locators that must
+    match inside an iframe of that step's snapshot or the next one. Items
+    that ended in one of NO_WORK_STATUSES (nothing left to approve) are not
+    checked against action_locators.
+    Returns {"fixture", "elapsed_ms", "ok", "steps": [...]}.
+    """
+    started = time.perf_counter()
+    manifest, items = load_fixture(fixture_dir)
+    outcomes = manifest.get("outcomes", {})
+    documents = _Documents()
+    action_locators = action_locators or {}
+    frame_locators = frame_locators or {}
+
+    by_step = {}
+    for name, snapshots in zip(manifest.get("items", []), items):
+        has_work = outcomes.get(name) not in NO_WORK_STATUSES
+        for index, snapshot in enumerate(snapshots):
+            following = snapshots[index + 1] if index + 1 < len(snapshots) else None
+            by_step.setdefault(snapshot["step"], []).append((snapshot, following, has_work))
+
+    report = []
+    for step in steps:
+        recorded = by_step.get(step.name, [])
+        entry = {"step": step.name, "snapshots": len(recorded), "optional": step.optional, "problems": []}
+        if not recorded:
+            entry["status"] = "not_recorded"
+            report.append(entry)
+            continue
+
+        matched_labels = set()
+        for snapshot, following, has_work in recorded:
+            where = f"{snapshot.get('url', '?')} ({snapshot.get('captured_at', 0):.0f})"
+            if step.locators:
+                hit = next((locator for locator in step.locators
+                            if documents.matches(snapshot.get("html"), locator.by, locator.value)), None)
+                if hit is None:
+                    entry["problems"].append(f"no locator matched at {where}")
+                else:
+                    matched_labels.add(hit.label)
+            for locator in action_locators.get(step.name, ()) if has_work else ():
+                if not documents.matches(snapshot.get("html"), locator.by, locator.value):
+                    entry["problems"].append(f"'{locator.label}' not found at {where}")
+            if frame_locators.get(step.name):
+                frames = [frame.get("html") for s in (snapshot, following) if s for frame in s.get("frames", [])]
+                for locator in frame_locators[step.name]:
+                    if not any(documents.matches(html, locator.by, locator.value) for html in frames):
+                        entry["problems"].append(f"'{locator.label}' not found in any iframe at {where}")
+
+        entry["matched"] = sorted(matched_labels)
+        primary = step.locators[0].label if step.locators else None
+        if entry["problems"]:
+            entry["status"] = "absent" if step.optional else "broken"
+        elif primary and matched_labels - {primary}:
+            entry["status"] = "fallback"
+        else:
+            entry["status"] = "ok"
+        report.append(entry)
+
+    return {
+        "fixture": fixture_dir,
+        "elapsed_ms": round((time.perf_counter() - started) * 1000, 1),
+        "ok": not any(entry["status"] == "broken" for entry in report),
+        "steps": report,
+    }
+
+
+def format_validation(result) -> str:
+    lines = [f"Fixture: {result['fixture']} ({result['elapsed_ms']} ms)"]
+    for entry in result["steps"]:
+        matched = f" via {', '.join(entry['matched'])}" if entry.get("matched") else ""
+        lines.append(f"  {entry['status']:<13}{entry['step']:<28}{entry['snapshots']:>3} snapshot(s){matched}")
+        for problem in entry["problems"][:3]:
+            lines.append(f"               - {problem}")
+    lines.append("OK" if result["ok"] else "BROKEN SELECTORS FOUND")
+    return "\n".join(lines)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Validate the workflow's selectors against recorded DOM snapshots")
+    parser.add_argument("fixture", nargs="?", help="fixture directory (default: latest recording)")
+    parser.add_argument("--json", help="also write the report to this file")
+    args = parser.parse_args()
+
+    from app_config import get_app_data_path
+    from vahan_automation import NEW_RC_APPROVAL_STEPS, ACTION_LOCATORS, FRAME_LOCATORS
+
+    fixture = args.fixture or latest_fixture(get_app_data_path())
+    if not fixture:
+        print("No DOM fixtures recorded yet. Run the automation with TASKIFY_RECORD_DOM=1 first.")
+        return 2
+    result = validate_fixture(fixture, NEW_RC_APPROVAL_STEPS, ACTION_LOCATORS, FRAME_LOCATORS)
+    print(format_validation(result))
+    if args.json:
+        with open(args.json, "w") as f:
+            json.dump(result, f, indent=2)
+    return 0 if result["ok"] else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,173 @@
+import os
+import re
+import sys
+import json
+import time
+import shutil
+import filecmp
+import logging
+import subprocess
+from typing import Optional
+
+logger = logging.getLogger(__name__)
+
+CACHE_FILENAME = "driver_cache.json"
+DRIVER_NAME = "chromedriver.exe" if os.name == "nt" else "chromedriver"
+
+
+def bundled_drivers_dir() -> str:
+    """backend/drivers, or the copy PyInstaller unpacks next to the frozen app"""
+    base_dir = getattr(sys, "_MEIPASS", os.path.dirname(os.path.abspath(__file__)))
+    return os.path.join(base_dir, "drivers")
+
+
+def bundled_driver_path() -> Optional[str]:
+    path = os.path.join(bundled_drivers_dir(), DRIVER_NAME)
+    return path if os.path.isfile(path) else None
+
+
+def detect_chrome_version() -> Optional[str]:
+    """Installed Chrome version (e.g. "140.0.7339.210") without starting a browser"""
+    if os.name == "nt":
+        try:
+            import winreg
+            for hive in (winreg.HKEY_CURRENT_USER, winreg.HKEY_LOCAL_MACHINE):
+                try:
+                    with winreg.OpenKey(hive, r"Software\Google\Chrome\BLBeacon") as key:
+                        return winreg.QueryValueEx(key, "version")[0]
+                except OSError:
+                    continue
+        except ImportError:
+            pass
+        return None
+
+    candidates = ["/Applications/Google Chrome.app/Contents/MacOS/Google Chrome"] + [
+        shutil.which(name) for name in ("google-chrome", "google-chrome-stable", "chromium", "chromium-browser")
+    ]
+    for binary in candidates:
+        if not binary or not os.path.exists(binary):
+            continue
+        try:
+            output = subprocess.check_output([binary, "--version"], text=True, timeout=5, stderr=subprocess.DEVNULL)
+        except (subprocess.SubprocessError, OSError):
+            continue
+        match = re.search(r"(\d+\.\d+\.\d+\.\d+)", output)
+        if match:
+            return match.group(1)
+    return None
+
+
+def major_version(version: Optional[str]) -> Optional[int]:
+    try:
+        return int(version.split(".")[0]) if version else None
+    except ValueError:
+        return None
+
+
+class DriverResolutionCache:
+    """
+    Remembers which chromedriver launch strategy worked, for which Chrome
+    version, together with a private copy of the undetected_chromedriver
+    patched binary. The next start launches straight from that copy (no
+    version probing, no download, no re-patching); the cache is dropped when
+    Chrome is updated or the cached launch fails.
+    """
+
+    def __init__(self, app_data_path: str):
+        self.app_data_path = app_data_path
+        self.cache_file = os.path.join(app_data_path, CACHE_FILENAME)
+        self.drivers_dir = os.path.join(app_data_path, "drivers")
+
+    def load(self) -> Optional[dict]:
+        try:
+            if os.path.exists(self.cache_file):
+                with open(self.cache_file, "r") as f:
+                    return json.load(f)
+        except Exception as e:
+            logger.error(f"Error reading driver cache: {e}")
+        return None
+
+    def lookup(self, chrome_version: Optional[str]) -> Optional[dict]:
+        """
+        Launch kwargs for undetected_chromedriver from the cache, or None when
+        there is no entry, Chrome's major version changed or the driver is gone.
+        """
+        entry = self.load()
+        if not entry:
+            return None
+        if chrome_version and major_version(entry.get("chrome_version")) != major_version(chrome_version):
+            logger.info(f"[DRIVER] Chrome changed ({entry.get('chrome_version')} -> {chrome_version}), driver cache ignored")
+            return None
+        driver_path = entry.get("driver_path")
+        if driver_path and not os.path.isfile(driver_path):
+            return None
+
+        kwargs = {"version_main": entry.get("version_main")}
+        if driver_path:
+            kwargs["driver_executable_path"] = driver_path
+        return kwargs
+
+    def prepare_driver(self, source_path: str, chrome_version: Optional[str]) -> Optional[str]:
+        """
+        Copy a chromedriver binary into the app data drivers directory (the
+        bundled one may live in a read-only install folder) and return the copy.
+        An identical copy is left alone: on Windows it cannot be overwritten
+        while another browser worker is running it. Returns None on failure.
+        """
+        try:
+            os.makedirs(self.drivers_dir, exist_ok=True)
+            tag = major_version(chrome_version) or "current"
+            name = DRIVER_NAME.replace("chromedriver", f"chromedriver-{tag}")
+            target = os.path.join(self.drivers_dir, name)
+            if os.path.abspath(source_path) == os.path.abspath(target):
+                return target
+            if os.path.isfile(target) and filecmp.cmp(source_path, target, shallow=False):
+                return target
+            temp_file = target + ".tmp"
+            try:
+                shutil.copy2(source_path, temp_file)
+                os.replace(temp_file, target)
+            finally:
+                if os.path.exists(temp_file):
+                    os.remove(temp_file)
+            return target
+        except Exception as e:
+            logger.error(f"Error copying chromedriver {source_path}: {e}")
+            return None
+
+    def remember(self, strategy: str, chrome_version: Optional[str], version_main: Optional[int],
+                 patched_driver_path: Optional[str]) -> bool:
+        """
+        Store the strategy that just launched Chrome successfully. Nothing is
+        stored without a usable driver copy, so a failed copy leaves the
+        previous entry (and its fast path) in place.
+        """
+        driver_path = None
+        if patched_driver_path and os.path.isfile(patched_driver_path):
+            driver_path = self.prepare_driver(patched_driver_path, chrome_version)
+        if not driver_path:
+            logger.info(f"[DRIVER] No driver copy for strategy '{strategy}', driver cache left unchanged")
+            return False
+        try:
+            os.makedirs(self.app_data_path, exist_ok=True)
+            temp_file = self.cache_file + ".tmp"
+            with open(temp_file, "w") as f:
+                json.dump({
+                    "strategy": strategy,
+                    "chrome_version": chrome_version,
+                    "version_main": version_main or major_version(chrome_version),
+                    "driver_path": driver_path,
+                    "updated_at": time.time(),
+                }, f, indent=2)
+            os.replace(temp_file, self.cache_file)
+            return True
+        except Exception as e:
+            logger.error(f"Error saving driver cache: {e}")
+            return False
+
+    def invalidate(self):
+        try:
+            if os.path.exists(self.cache_file):
+                os.remove(self.cache_file)
+        except Exception as e:
+            logger.error(f"Error clearing driver cache: {e}")
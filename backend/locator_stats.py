@@ -0,0 +1,120 @@
+import os
+import json
+import time
+import logging
+import threading
+
+logger = logging.getLogger(__name__)
+
+STATS_FILENAME = "locator_stats.json"
+MAX_OBSERVATIONS = 200  # Counts are halved beyond this so the order follows site changes
+
+
+def adaptive_locators_enabled():
+    return os.environ.get("TASKIFY_ADAPTIVE_LOCATORS", "1").lower() not in ("0", "false", "no", "off")
+
+
+class LocatorStats:
+    """
+    Hit statistics per (step, locator strategy), persisted in the app data
+    directory. order() puts the strategies that matched most often first, so
+    a step stops spending its timeout on a strategy the site no longer
+    supports. Strategies without statistics keep their declared order.
+
+    Only informative outcomes are recorded: the strategy that matched is a
+    hit and the ones tried before it are misses. When nothing matched (an
+    optional popup that simply is not there) nothing is recorded.
+    """
+
+    def __init__(self, app_data_path: str):
+        self.app_data_path = app_data_path
+        self.stats_file = os.path.join(app_data_path, STATS_FILENAME)
+        self._stats = None  # step -> label -> {"value", "hits", "misses", "last_hit"}
+        self._dirty = False
+        self._lock = threading.Lock()
+
+    def _load(self):
+        # Caller holds self._lock
+        if self._stats is None:
+            self._stats = {}
+            try:
+                if os.path.exists(self.stats_file):
+                    with open(self.stats_file, "r") as f:
+                        self._stats = json.load(f)
+            except Exception as e:
+                logger.error(f"Error reading locator statistics: {e}")
+        return self._stats
+
+    def _entry(self, step_name, label, value):
+        # Caller holds self._lock. A strategy whose locator changed starts over.
+        entries = self._load().setdefault(step_name, {})
+        entry = entries.get(label)
+        if entry is None or entry.get("value") != value:
+            entry = entries[label] = {"value": value, "hits": 0, "misses": 0, "last_hit": None}
+        return entry
+
+    @staticmethod
+    def _score(entry):
+        if not entry:
+            return 0.5
+        return (entry["hits"] + 1) / (entry["hits"] + entry["misses"] + 2)
+
+    def order(self, step_name, locators):
+        """locators (objects with .label and .value) sorted by success rate, stable for ties"""
+        with self._lock:
+            entries = self._load().get(step_name, {})
+            scored = []
+            for index, locator in enumerate(locators):
+                entry = entries.get(locator.label)
+                if entry is not None and entry.get("value") != locator.value:
+                    entry = None
+                scored.append((-self._score(entry), index, locator))
+        return [locator for _, _, locator in sorted(scored, key=lambda item: item[:2])]
+
+    def record(self, step_name, hit, missed=()):
+        """hit: the locator that matched; missed: the locators tried (and failed) before it"""
+        with self._lock:
+            for locator in missed:
+                self._bump(self._entry(step_name, locator.label, locator.value), "misses")
+            entry = self._entry(step_name, hit.label, hit.value)
+            self._bump(entry, "hits")
+            entry["last_hit"] = time.time()
+            self._dirty = True
+
+    @staticmethod
+    def _bump(entry, field):
+        entry[field] += 1
+        if entry["hits"] + entry["misses"] > MAX_OBSERVATIONS:
+            entry["hits"] //= 2
+            entry["misses"] //= 2
+
+    def save(self):
+        """
+        Write the statistics if they changed since the last save. Workers
+        share one temp file, so the write happens under the lock; a failed
+        write leaves the statistics dirty for the next save.
+        """
+        with self._lock:
+            if not self._dirty:
+                return False
+            try:
+                os.makedirs(self.app_data_path, exist_ok=True)
+                temp_file = self.stats_file + ".tmp"
+                with open(temp_file, "w") as f:
+                    json.dump(self._stats, f, indent=2)
+                os.replace(temp_file, self.stats_file)
+                self._dirty = False
+                return True
+            except Exception as e:
+                logger.error(f"Error saving locator statistics: {e}")
+                return False
+
+    def snapshot(self):
+        with self._lock:
+            return json.loads(json.dumps(self._load()))
+
+    def reset(self):
+        with self._lock:
+            self._stats = {}
+            self._dirty = True
+        return self.save()
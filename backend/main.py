@@ -3,18 +3,27 @@ import subprocess
 import hashlib
 import asyncio
 import sys 
+import time
 import logging
 
-from fastapi import FastAPI, HTTPException
+from fastapi import FastAPI, HTTPException, Request, Query
 from fastapi.middleware.cors import CORSMiddleware
-from fastapi.responses import JSONResponse
+from fastapi.responses import JSONResponse, Response, StreamingResponse
 from pydantic import BaseModel
 from contextlib import asynccontextmanager
 from typing import Optional 
+from datetime import date
 from firebase_activation import firebase_activation_manager
 from local_activation import LocalActivationStorage
-from app_config import get_current_config, get_port
-from vahan_automation import start_vahan_browser, close_vahan_browser, run_automation, check_browser_status
+from app_config import get_current_config, get_port, get_app_data_path
+from automation_jobs import job_manager, format_sse
+from vahan_automation import (
+    start_vahan_browser, close_vahan_browser, run_automation, check_browser_status,
+    start_worker_browsers, close_worker_browsers, get_worker_status, processed_ledger,
+    prewarm_enabled, prewarm_vahan_browser, get_logged_in_drivers, record_session_health, browser_usage
+)
+from session_keepalive import SessionKeepalive
+import metrics
 
 APP_AUTHOR = "YourCompany"
 APP_NAME = "taskify"  # This should match the name in app_config.py
@@ -25,6 +34,18 @@ logger = logging.getLogger(__name__)
 
 shutdown_event = asyncio.Event()
 SHUTDOWN_GRACE_PERIOD = 5
+EVENT_LOOP_LAG_INTERVAL = 0.5  # Seconds between event-loop lag samples
+SSE_HEARTBEAT_INTERVAL = 15  # Seconds between keep-alive comments on idle event streams
+SHUTDOWN_DRAIN_TIMEOUT = 300  # Seconds /shutdown waits for the in-flight item before closing browsers
+
+async def monitor_event_loop_lag():
+    """Measure how late the loop wakes us up; blocking handlers show up as lag."""
+    loop = asyncio.get_running_loop()
+    while True:
+        scheduled = loop.time()
+        await asyncio.sleep(EVENT_LOOP_LAG_INTERVAL)
+        lag = max(0.0, loop.time() - scheduled - EVENT_LOOP_LAG_INTERVAL)
+        metrics.observe_event_loop_lag(lag)
 
 @asynccontextmanager
 async def lifespan(app: FastAPI):
@@ -32,7 +53,15 @@ async def lifespan(app: FastAPI):
     FastAPI lifespan context manager for startup and shutdown events.
     """
     logger.info("FastAPI app starting up...")
+    lag_monitor = asyncio.create_task(monitor_event_loop_lag())
+    session_keepalive.start()
+    if prewarm_enabled():
+        # Opt-in (TASKIFY_PREWARM_BROWSER=1): launch Chrome while the activation screen is showing
+        logger.info("Pre-warming the Vahan browser in the background...")
+        app.state.prewarm = asyncio.create_task(asyncio.to_thread(prewarm_vahan_browser))
     yield
+    lag_monitor.cancel()
+    session_keepalive.stop()
     logger.info("FastAPI app received shutdown signal. Waiting for graceful termination...")
 
     try:
@@ -46,16 +75,8 @@ async def lifespan(app: FastAPI):
     logger.info("FastAPI app completed graceful shutdown.")
 
 # Determine application data directory
-if os.name == 'nt':
-    app_data_dir = os.getenv('LOCALAPPDATA')
-    if app_data_dir is None:
-        app_data_dir = os.path.join(os.path.expanduser('~'), 'AppData', 'Local')
-else:
-    app_data_dir = os.getenv('XDG_DATA_HOME', os.path.join(os.path.expanduser('~'), '.local', 'share'))
-
 current_config = get_current_config()
-APP_NAME_DIR = APP_NAME.lower().replace(" ", "-")
-APP_DATA_PATH = os.path.join(app_data_dir, APP_NAME_DIR)
+APP_DATA_PATH = get_app_data_path()
           
 try:
     os.makedirs(APP_DATA_PATH, exist_ok=True)
@@ -66,6 +87,14 @@ except OSError as e:
 
 local_activation = LocalActivationStorage(APP_DATA_PATH)
 
+# Keeps idle Vahan sessions alive; paused while an automation job is running
+session_keepalive = SessionKeepalive(
+    get_logged_in_drivers,
+    is_busy=lambda: job_manager.active() is not None,
+    on_result=record_session_health,
+    usage=browser_usage
+)
+
 # Create FastAPI app (only once!)
 app = FastAPI(
     lifespan=lifespan,
@@ -83,11 +112,31 @@ app.add_middleware(
     allow_headers=["*"],
 )
 
+@app.middleware("http")
+async def record_request_latency(request: Request, call_next):
+    started = time.perf_counter()
+    status_code = 500
+    try:
+        response = await call_next(request)
+        status_code = response.status_code
+        return response
+    finally:
+        # Use the route template (e.g. /jobs/{job_id}) so label cardinality stays bounded
+        route = request.scope.get("route")
+        route_path = getattr(route, "path", "unmatched")
+        metrics.http_request_duration.observe(
+            time.perf_counter() - started,
+            method=request.method, route=route_path, status_code=status_code
+        )
+
 class ActivationRequest(BaseModel):
     systemId: str
     activationKey: str
     appName: Optional[str] = APP_NAME
 
+class StartWorkersRequest(BaseModel):
+    count: Optional[int] = None  # Total browsers including the primary; defaults to TASKIFY_BROWSER_WORKERS
+
 def get_motherboard_serial():
     try:
         try:
@@ -171,7 +220,7 @@ async def root():
         "message": f"{current_config['display_name']} Backend API", 
         "app_name": APP_NAME,
         "status": "running", 
-        "endpoints": ["/system-info", "/check-activation", "/activate-device", "/start-browser", "/check-browser-status", "/run-automation", "/close-browser", "/health"]
+        "endpoints": ["/system-info", "/check-activation", "/activate-device", "/start-browser", "/check-browser-status", "/run-automation", "/jobs", "/history", "/close-browser", "/start-workers", "/workers", "/session-health", "/health", "/metrics"]
     }
 
 @app.get("/system-info")
@@ -310,8 +359,13 @@ async def health_check():
     logger.info("Health check requested.")
     return {"status": "healthy", "message": "Taskify API is running"}
 
+@app.get("/metrics")
+async def metrics_endpoint():
+    """Prometheus text exposition of HTTP, automation and event-loop metrics."""
+    return Response(content=metrics.render(), media_type=metrics.CONTENT_TYPE)
+
 @app.post("/start-browser")
-async def start_browser_endpoint():
+def start_browser_endpoint():
     """
     Start the browser and navigate to Vahan website.
     Wait for user login and acknowledge when successful.
@@ -348,7 +402,7 @@ async def start_browser_endpoint():
         }
 
 @app.get("/check-browser-status")
-async def check_browser_status_endpoint():
+def check_browser_status_endpoint():
     """
     Check if browser is open and if user is logged in.
     """
@@ -372,14 +426,48 @@ async def check_browser_status_endpoint():
             "message": f"Error checking status: {str(e)}"
         }
 
+@app.post("/start-workers")
+def start_workers_endpoint(request: StartWorkersRequest = StartWorkersRequest()):
+    """
+    Start additional Chrome workers (each with its own debug port and profile)
+    and wait for the operator to login in each of them.
+    """
+    logger.info(f"Received request to start worker browsers (count={request.count})")
+    
+    try:
+        return start_worker_browsers(request.count)
+    except Exception as e:
+        logger.error(f"Error starting worker browsers: {e}", exc_info=True)
+        return {
+            "success": False,
+            "message": f"Error starting worker browsers: {str(e)}",
+            "workers": []
+        }
+
+@app.get("/workers")
+async def workers_endpoint():
+    """
+    List the primary browser and every pool worker with its login state.
+    """
+    return {"success": True, "workers": get_worker_status()}
+
+@app.get("/session-health")
+async def session_health_endpoint():
+    """
+    Result of the last keepalive per logged-in browser, so operators know
+    whether a new batch can start without logging in again.
+    """
+    return {"success": True, **session_keepalive.health()}
+
 @app.post("/close-browser")
-async def close_browser_endpoint():
+def close_browser_endpoint():
     """
     Close the browser instance if it exists.
     """
     logger.info("Received request to close browser")
     
     try:
+        close_worker_browsers()
         result = close_vahan_browser()
         
         if result:
@@ -403,31 +491,29 @@ async def close_browser_endpoint():
 @app.post("/run-automation")
 async def run_automation_endpoint():
     """
-    Run the automation process after login.
-    Runs in a loop until all pending applications are processed.
+    Start the automation as a background job and return its job ID right away.
+    The job runs in a loop until all pending applications are processed;
+    poll /jobs/{job_id} for progress and the final result.
     """
     logger.info("Received request to run automation")
     
     try:
-        result = run_automation()
-        
-        if result.get("success"):
-            logger.info(f"Automation completed successfully. Processed {result.get('processed_count', 0)} items.")
-            return {
-                "success": True,
-                "message": result.get("message", "Automation completed successfully!"),
-                "status": result.get("status", "completed"),
-                "processed_count": result.get("processed_count", 0)
-            }
-        else:
-            logger.warning(f"Automation failed: {result.get('message')}")
+        job, created = job_manager.start(run_automation)
+        if not created:
             return {
                 "success": False,
-                "message": result.get("message", "Automation failed"),
-                "status": result.get("status", "error"),
-                "processed_count": result.get("processed_count", 0),
-                "error": result.get("error", result.get("message"))
+                "message": "Automation is already running.",
+                "status": "already_running",
+                "job_id": job.job_id
             }
+        
+        logger.info(f"Automation job {job.job_id} started")
+        return {
+            "success": True,
+            "message": "Automation started.",
+            "status": "started",
+            "job_id": job.job_id
+        }
             
     except Exception as e:
         logger.error(f"Error in run-automation endpoint: {e}", exc_info=True)
@@ -439,12 +525,140 @@ async def run_automation_endpoint():
             "error": str(e)
         }
 
+@app.get("/jobs")
+async def list_jobs_endpoint():
+    """
+    List the active and recently finished automation jobs.
+    """
+    return {"success": True, "jobs": job_manager.list()}
+
+@app.get("/jobs/{job_id}")
+async def get_job_endpoint(job_id: str):
+    """
+    Progress of an automation job: processed, errors, current step and items/min.
+    """
+    job = job_manager.get(job_id)
+    if not job:
+        raise HTTPException(status_code=404, detail=f"Job {job_id} not found")
+    return {"success": True, **job.snapshot()}
+
+def control_job(job_id: str, action: str):
+    job = job_manager.get(job_id)
+    if not job:
+        raise HTTPException(status_code=404, detail=f"Job {job_id} not found")
+    
+    accepted = getattr(job, action)()
+    return {
+        "success": accepted,
+        "message": f"Job {action} requested." if accepted else f"Cannot {action} job in its current state.",
+        "status": job.status,
+        "control": job.control,
+        "job_id": job_id
+    }
+
+@app.post("/jobs/{job_id}/pause")
+async def pause_job_endpoint(job_id: str):
+    """
+    Pause the job before its next step; browsers stay on their current page.
+    """
+    return control_job(job_id, "pause")
+
+@app.post("/jobs/{job_id}/resume")
+async def resume_job_endpoint(job_id: str):
+    """
+    Resume a paused job.
+    """
+    return control_job(job_id, "resume")
+
+@app.post("/jobs/{job_id}/drain")
+async def drain_job_endpoint(job_id: str):
+    """
+    Finish the application currently being processed, then stop.
+    """
+    return control_job(job_id, "drain")
+
+@app.post("/jobs/{job_id}/cancel")
+async def cancel_job_endpoint(job_id: str):
+    """
+    Stop before the next step, even in the middle of an application.
+    """
+    return control_job(job_id, "cancel")
+
+@app.get("/jobs/{job_id}/events")
+async def job_events_endpoint(job_id: str, request: Request):
+    """
+    Server-Sent Events stream of a job's progress: step_started, step_finished
+    (with its duration), item_approved, item_failed, queue_empty and finally
+    job_finished. Reconnecting clients resume from their Last-Event-ID.
+    """
+    job = job_manager.get(job_id)
+    if not job:
+        raise HTTPException(status_code=404, detail=f"Job {job_id} not found")
+
+    try:
+        last_id = int(request.headers.get("last-event-id", 0))
+    except ValueError:
+        last_id = 0
+
+    async def event_stream():
+        nonlocal last_id
+        while not await request.is_disconnected():
+            # Wait on the job's condition in a worker thread so the loop stays free
+            events, finished = await asyncio.to_thread(job.wait_for_events, last_id, SSE_HEARTBEAT_INTERVAL)
+            for event_id, event, data in events:
+                last_id = event_id
+                yield format_sse(event_id, event, data)
+            if finished:
+                break
+            if not events:
+                yield ": keep-alive\n\n"
+
+    return StreamingResponse(
+        event_stream(), media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"}
+    )
+
+@app.get("/history")
+def history_endpoint(
+    page: int = Query(1, ge=1),
+    page_size: int = Query(50, ge=1, le=500),
+    outcome: Optional[str] = None,
+    date_from: Optional[date] = Query(None, description="YYYY-MM-DD, inclusive"),
+    date_to: Optional[date] = Query(None, description="YYYY-MM-DD, inclusive"),
+    application_no: Optional[str] = None,
+    worker_id: Optional[int] = None
+):
+    """
+    Paginated ledger of processed applications, newest first, filterable by
+    outcome, date range, application number and worker. Dates that are not
+    YYYY-MM-DD are rejected with 422.
+    """
+    try:
+        return {"success": True, **processed_ledger.query(
+            page=page, page_size=page_size, outcome=outcome,
+            date_from=date_from.isoformat() if date_from else None,
+            date_to=date_to.isoformat() if date_to else None,
+            application_no=application_no, worker_id=worker_id
+        )}
+    except Exception as e:
+        logger.error(f"Error reading processed-application history: {e}", exc_info=True)
+        raise HTTPException(status_code=500, detail=f"Error reading history: {str(e)}")
+
 @app.post("/shutdown")
 async def shutdown_backend_endpoint():
     logger.info("Received shutdown request for backend. Signaling graceful exit...")
     
+    # Let the running automation finish its current item so nothing is left half-submitted
+    job = job_manager.active()
+    if job:
+        logger.info(f"Draining automation job {job.job_id} before shutdown...")
+        job.drain()
+        if not await asyncio.to_thread(job.wait_finished, SHUTDOWN_DRAIN_TIMEOUT):
+            logger.warning(f"Automation job {job.job_id} did not drain within {SHUTDOWN_DRAIN_TIMEOUT} seconds.")
+    
     # Close browser before shutdown
     try:
+        close_worker_browsers()
         close_vahan_browser()
     except Exception as e:
         logger.error(f"Error closing browser during shutdown: {e}")
@@ -0,0 +1,189 @@
+"""
+Minimal Prometheus metrics for the Taskify backend.
+
+Implements just enough of the Prometheus text exposition format (counters,
+gauges and histograms with labels) for the /metrics endpoint, without adding
+a dependency to the PyInstaller bundle.
+"""
+
+import math
+import threading
+
+CONTENT_TYPE = "text/plain; version=0.0.4; charset=utf-8"
+
+# Buckets (seconds) suited to HTTP handlers and browser steps respectively
+HTTP_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10, 30, 60)
+STEP_BUCKETS = (0.05, 0.1, 0.25, 0.5, 1, 2, 3, 5, 7.5, 10, 15, 30, 60)
+LAG_BUCKETS = (0.001, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 5)
+
+
+def _escape(value):
+    return str(value).replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+
+
+def _format_labels(names, values, extra=None):
+    pairs = [f'{name}="{_escape(value)}"' for name, value in zip(names, values)]
+    if extra:
+        pairs.append(extra)
+    return "{" + ",".join(pairs) + "}" if pairs else ""
+
+
+def _format_value(value):
+    if value == math.inf:
+        return "+Inf"
+    if float(value).is_integer():
+        return str(int(value))
+    return repr(float(value))
+
+
+class _Metric:
+    kind = "untyped"
+
+    def __init__(self, name, documentation, labelnames=()):
+        self.name = name
+        self.documentation = documentation
+        self.labelnames = tuple(labelnames)
+        self._lock = threading.Lock()
+        self._values = {}
+        if not self.labelnames and self.kind in ("counter", "gauge"):
+            self._values[()] = 0  # Unlabelled series are exported from the start
+
+    def _key(self, labels):
+        if set(labels) != set(self.labelnames):
+            raise ValueError(f"{self.name} expects labels {self.labelnames}, got {tuple(labels)}")
+        return tuple(str(labels[name]) for name in self.labelnames)
+
+    def render(self):
+        lines = [f"# HELP {self.name} {self.documentation}", f"# TYPE {self.name} {self.kind}"]
+        with self._lock:
+            items = sorted(self._values.items())
+        for key, value in items:
+            lines.extend(self._render_sample(key, value))
+        return lines
+
+    def _render_sample(self, key, value):
+        return [f"{self.name}{_format_labels(self.labelnames, key)} {_format_value(value)}"]
+
+
+class Counter(_Metric):
+    kind = "counter"
+
+    def inc(self, amount=1, **labels):
+        key = self._key(labels)
+        with self._lock:
+            self._values[key] = self._values.get(key, 0) + amount
+
+
+class Gauge(_Metric):
+    kind = "gauge"
+
+    def set(self, value, **labels):
+        key = self._key(labels)
+        with self._lock:
+            self._values[key] = value
+
+
+class Histogram(_Metric):
+    kind = "histogram"
+
+    def __init__(self, name, documentation, labelnames=(), buckets=STEP_BUCKETS):
+        super().__init__(name, documentation, labelnames)
+        self.buckets = tuple(sorted(buckets)) + (math.inf,)
+
+    def observe(self, value, **labels):
+        key = self._key(labels)
+        with self._lock:
+            state = self._values.get(key)
+            if state is None:
+                state = {"counts": [0] * len(self.buckets), "sum": 0.0, "count": 0}
+                self._values[key] = state
+            for i, bound in enumerate(self.buckets):
+                if value <= bound:
+                    state["counts"][i] += 1
+            state["sum"] += value
+            state["count"] += 1
+
+    def render(self):
+        with self._lock:
+            snapshot = {key: {"counts": list(s["counts"]), "sum": s["sum"], "count": s["count"]}
+                        for key, s in self._values.items()}
+        lines = [f"# HELP {self.name} {self.documentation}", f"# TYPE {self.name} {self.kind}"]
+        for key, state in sorted(snapshot.items()):
+            for bound, count in zip(self.buckets, state["counts"]):
+                le = 'le="' + _format_value(bound) + '"'
+                lines.append(f"{self.name}_bucket{_format_labels(self.labelnames, key, le)} {count}")
+            labels = _format_labels(self.labelnames, key)
+            lines.append(f"{self.name}_sum{labels} {_format_value(state['sum'])}")
+            lines.append(f"{self.name}_count{labels} {state['count']}")
+        return lines
+
+
+class Registry:
+    def __init__(self):
+        self._metrics = []
+
+    def register(self, metric):
+        self._metrics.append(metric)
+        return metric
+
+    def render(self):
+        lines = []
+        for metric in self._metrics:
+            lines.extend(metric.render())
+        return "\n".join(lines) + "\n"
+
+
+REGISTRY = Registry()
+
+http_request_duration = REGISTRY.register(Histogram(
+    "taskify_http_request_duration_seconds", "HTTP request latency by route.",
+    ("method", "route", "status_code"), buckets=HTTP_BUCKETS,
+))
+step_duration = REGISTRY.register(Histogram(
+    "taskify_automation_step_duration_seconds", "Wall time of each Vahan workflow step.",
+    ("step", "outcome"), buckets=STEP_BUCKETS,
+))
+step_wait = REGISTRY.register(Histogram(
+    "taskify_automation_step_wait_seconds", "Time each Vahan workflow step spent waiting for the page.",
+    ("step",), buckets=STEP_BUCKETS,
+))
+step_retries = REGISTRY.register(Counter(
+    "taskify_automation_step_retries_total", "Recovery retries per Vahan workflow step.", ("step",),
+))
+items_processed = REGISTRY.register(Counter(
+    "taskify_automation_items_processed_total", "Applications approved by the automation loop.",
+))
+automation_errors = REGISTRY.register(Counter(
+    "taskify_automation_errors_total", "Failed automation iterations by status code.", ("status",),
+))
+automation_retries = REGISTRY.register(Counter(
+    "taskify_automation_retries_total", "Retried automation iterations by failure class.", ("error_class",),
+))
+circuit_opened = REGISTRY.register(Counter(
+    "taskify_automation_circuit_opened_total", "Times repeated Vahan error pages paused the automation.",
+))
+event_loop_lag = REGISTRY.register(Gauge(
+    "taskify_event_loop_lag_seconds", "Most recent asyncio event-loop lag.",
+))
+event_loop_lag_histogram = REGISTRY.register(Histogram(
+    "taskify_event_loop_lag_distribution_seconds", "Distribution of asyncio event-loop lag.",
+    buckets=LAG_BUCKETS,
+))
+
+
+def observe_step_timings(step_timings):
+    """Record the step_timings list produced by vahan_pipeline.run_pipeline"""
+    for timing in step_timings:
+        step_duration.observe(timing["wall_time"], step=timing["step"], outcome=timing["outcome"])
+        step_wait.observe(timing["wait_time"], step=timing["step"])
+        if timing["retries"]:
+            step_retries.inc(timing["retries"], step=timing["step"])
+
+
+def observe_event_loop_lag(lag):
+    event_loop_lag.set(lag)
+    event_loop_lag_histogram.observe(lag)
+
+
+def render():
+    return REGISTRY.render()
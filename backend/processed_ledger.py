@@ -0,0 +1,132 @@
+import os
+import json
+import time
+import sqlite3
+import logging
+import threading
+from datetime import datetime
+from typing import Optional
+
+logger = logging.getLogger(__name__)
+
+MAX_PAGE_SIZE = 500
+
+
+class ProcessedLedger:
+    """
+    Local SQLite ledger of every application the automation handled: number,
+    timestamps, per-step durations, outcome status and worker. Indexed by day
+    and outcome so /history stays fast with months of records.
+    """
+
+    def __init__(self, app_data_path: str):
+        self.app_data_path = app_data_path
+        self.db_file = os.path.join(app_data_path, "processed_applications.db")
+        self._lock = threading.Lock()
+        self._initialized = False
+
+    def _connect(self) -> sqlite3.Connection:
+        if not self._initialized:
+            os.makedirs(self.app_data_path, exist_ok=True)
+        conn = sqlite3.connect(self.db_file, timeout=10)
+        conn.row_factory = sqlite3.Row
+        if not self._initialized:
+            with self._lock:
+                conn.execute("PRAGMA journal_mode=WAL")
+                conn.executescript(
+                    """
+                    CREATE TABLE IF NOT EXISTS processed_applications (
+                        id INTEGER PRIMARY KEY AUTOINCREMENT,
+                        application_no TEXT,
+                        worker_id INTEGER NOT NULL DEFAULT 0,
+                        job_id TEXT,
+                        day TEXT NOT NULL,
+                        started_at REAL NOT NULL,
+                        finished_at REAL NOT NULL,
+                        duration REAL NOT NULL,
+                        outcome TEXT NOT NULL,
+                        message TEXT,
+                        stopped_at TEXT,
+                        step_timings TEXT
+                    );
+                    CREATE INDEX IF NOT EXISTS idx_processed_day_outcome ON processed_applications (day, outcome);
+                    CREATE INDEX IF NOT EXISTS idx_processed_outcome_finished ON processed_applications (outcome, finished_at);
+                    CREATE INDEX IF NOT EXISTS idx_processed_finished ON processed_applications (finished_at);
+                    CREATE INDEX IF NOT EXISTS idx_processed_application_no ON processed_applications (application_no);
+                    """
+                )
+                self._initialized = True
+        return conn
+
+    def record(self, application_no: Optional[str], worker_id: int, started_at: float, result: dict,
+               job_id: Optional[str] = None) -> bool:
+        """Store the outcome of one workflow run for an application"""
+        finished_at = time.time()
+        step_timings = {t["step"]: t["wall_time"] for t in result.get("step_timings", [])}
+        try:
+            conn = self._connect()
+            try:
+                with conn:
+                    conn.execute(
+                        "INSERT INTO processed_applications (application_no, worker_id, job_id, day, started_at, "
+                        "finished_at, duration, outcome, message, stopped_at, step_timings) "
+                        "VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)",
+                        (
+                            application_no, worker_id, job_id,
+                            datetime.fromtimestamp(finished_at).strftime("%Y-%m-%d"),
+                            started_at, finished_at, round(finished_at - started_at, 3),
+                            result.get("status", "completed" if result.get("success") else "error"),
+                            result.get("message"), result.get("stopped_at"), json.dumps(step_timings),
+                        )
+                    )
+            finally:
+                conn.close()
+            return True
+        except Exception as e:
+            logger.error(f"Error recording processed application: {e}")
+            return False
+
+    def query(self, page: int = 1, page_size: int = 50, outcome: Optional[str] = None,
+              date_from: Optional[str] = None, date_to: Optional[str] = None,
+              application_no: Optional[str] = None, worker_id: Optional[int] = None) -> dict:
+        """
+        One page of the ledger, newest first. Dates are YYYY-MM-DD (inclusive).
+        Returns {"items", "total", "page", "page_size"}.
+        """
+        page = max(1, page)
+        page_size = max(1, min(page_size, MAX_PAGE_SIZE))
+
+        clauses, params = [], []
+        if outcome:
+            clauses.append("outcome = ?")
+            params.append(outcome)
+        if date_from:
+            clauses.append("day >= ?")
+            params.append(date_from)
+        if date_to:
+            clauses.append("day <= ?")
+            params.append(date_to)
+        if application_no:
+            clauses.append("application_no = ?")
+            params.append(application_no)
+        if worker_id is not None:
+            clauses.append("worker_id = ?")
+            params.append(worker_id)
+        where = f"WHERE {' AND '.join(clauses)}" if clauses else ""
+
+        conn = self._connect()
+        try:
+            total = conn.execute(f"SELECT COUNT(*) FROM processed_applications {where}", params).fetchone()[0]
+            rows = conn.execute(
+                f"SELECT * FROM processed_applications {where} ORDER BY finished_at DESC, id DESC LIMIT ? OFFSET ?",
+                params + [page_size, (page - 1) * page_size]
+            ).fetchall()
+        finally:
+            conn.close()
+
+        items = []
+        for row in rows:
+            item = dict(row)
+            item["step_timings"] = json.loads(item["step_timings"] or "{}")
+            items.append(item)
+        return {"items": items, "total": total, "page": page, "page_size": page_size}
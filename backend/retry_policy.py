@@ -0,0 +1,256 @@
+"""
+Retry, backoff and circuit-breaker policy for the automation loop.
+
+A failed item is classified by what went wrong, and each class has its own
+policy:
+
+- stale: the page re-rendered under the workflow; retry immediately.
+- network: the browser or Vahan did not answer; exponential backoff with
+  jitter so a flaky connection is not hammered.
+- error_page: Vahan showed "Sorry, Something Went Wrong". These also feed a
+  CircuitBreaker shared by every worker: after a few in a row the breaker
+  opens, all workers pause, and after the cool-down one worker sends a cheap
+  probe request before a single trial item is allowed through.
+- other: a locator or flow problem; fixed delay, few attempts (the
+  behaviour the loop always had).
+
+On top of the per-class limits, MAX_CONSECUTIVE_FAILURES caps consecutive
+failures of any mix of classes. A success resets every counter.
+"""
+
+import os
+import time
+import random
+import logging
+import threading
+
+logger = logging.getLogger(__name__)
+
+STALE = "stale"
+NETWORK = "network"
+ERROR_PAGE = "error_page"
+OTHER = "other"
+
+STALE_MARKERS = ("stale element",)
+ERROR_PAGE_MARKERS = ("sorry", "went wrong")
+NETWORK_MARKERS = (
+    "net::err_", "err_connection", "err_internet_disconnected", "err_name_not_resolved",
+    "connection refused", "connection reset", "connection aborted", "remotedisconnected",
+    "max retries exceeded", "failed to establish", "read timed out", "timed out receiving message",
+    "disconnected", "unreachable", "bad gateway", "service unavailable", "gateway timeout",
+)
+
+# No single class may retry more often than this, so alternating classes stop as soon as one class would
+MAX_CONSECUTIVE_FAILURES = 8
+ALL_CLASSES = "all"
+
+
+class BackoffPolicy:
+    """
+    Delay before attempt n (1-based) of a failure class: base * multiplier**(n-1),
+    capped at max_delay. With jitter the delay is drawn from [delay/2, delay]
+    so workers that failed together do not retry together.
+    """
+
+    def __init__(self, max_attempts, base_delay=0.0, multiplier=1.0, max_delay=None, jitter=False):
+        self.max_attempts = max_attempts
+        self.base_delay = base_delay
+        self.multiplier = multiplier
+        self.max_delay = base_delay if max_delay is None else max_delay
+        self.jitter = jitter
+
+    def delay(self, attempt, rng=random):
+        delay = min(self.max_delay, self.base_delay * self.multiplier ** (attempt - 1))
+        if self.jitter and delay > 0:
+            delay = rng.uniform(delay / 2, delay)
+        return delay
+
+
+def _env_float(name, default):
+    try:
+        return float(os.environ.get(name, default))
+    except ValueError:
+        return default
+
+
+def default_policies():
+    return {
+        STALE: BackoffPolicy(max_attempts=5),
+        NETWORK: BackoffPolicy(
+            max_attempts=8, base_delay=_env_float("TASKIFY_RETRY_BASE_DELAY", 2), multiplier=2,
+            max_delay=_env_float("TASKIFY_RETRY_MAX_DELAY", 60), jitter=True,
+        ),
+        ERROR_PAGE: BackoffPolicy(max_attempts=8, base_delay=5, multiplier=2, max_delay=30, jitter=True),
+        OTHER: BackoffPolicy(max_attempts=3, base_delay=5),
+    }
+
+
+def classify_result(result, error_page=False):
+    """Failure class of a failed run_automation_internal result"""
+    if result.get("restart") or error_page:
+        return ERROR_PAGE
+    message = (result.get("message") or "").lower()
+    if any(marker in message for marker in STALE_MARKERS):
+        return STALE
+    if any(marker in message for marker in ERROR_PAGE_MARKERS):
+        return ERROR_PAGE
+    if any(marker in message for marker in NETWORK_MARKERS):
+        return NETWORK
+    return OTHER
+
+
+class RetryDecision:
+    """
+    attempt/max_attempts is the counter the decision was made on: the
+    failure class's own (scope == error_class) or, once that is the tighter
+    one, the count across all classes (scope == ALL_CLASSES).
+    """
+
+    def __init__(self, retry, delay, error_class, attempt, max_attempts, scope):
+        self.retry = retry
+        self.delay = delay
+        self.error_class = error_class
+        self.attempt = attempt
+        self.max_attempts = max_attempts
+        self.scope = scope
+
+
+class RetryPolicy:
+    """Per-worker retry state: consecutive failures per class and overall, reset on success"""
+
+    def __init__(self, policies=None, rng=None, max_consecutive=None):
+        self.policies = policies or default_policies()
+        self.rng = rng or random.Random()
+        if max_consecutive is None:
+            max_consecutive = int(_env_float("TASKIFY_MAX_CONSECUTIVE_ERRORS", MAX_CONSECUTIVE_FAILURES))
+        self.max_consecutive = max(1, max_consecutive)
+        self.attempts = {}
+        self.consecutive = 0
+
+    def on_success(self):
+        self.attempts.clear()
+        self.consecutive = 0
+
+    def on_failure(self, error_class):
+        policy = self.policies.get(error_class, self.policies[OTHER])
+        attempt = self.attempts[error_class] = self.attempts.get(error_class, 0) + 1
+        self.consecutive += 1
+        # Report whichever counter is closer to its limit
+        if self.max_consecutive - self.consecutive < policy.max_attempts - attempt:
+            count, limit, scope = self.consecutive, self.max_consecutive, ALL_CLASSES
+        else:
+            count, limit, scope = attempt, policy.max_attempts, error_class
+        if count >= limit:
+            return RetryDecision(False, 0.0, error_class, count, limit, scope)
+        return RetryDecision(True, policy.delay(attempt, self.rng), error_class, count, limit, scope)
+
+
+class CircuitBreaker:
+    """
+    Closed: items run normally. `failure_threshold` error pages in a row
+    (from any worker) open it. Open: workers wait `open_seconds`. Then one
+    worker gets "probe"; a healthy probe lets that worker run one trial item
+    (half-open) while the others keep waiting. A successful trial closes the
+    breaker; a failed probe or trial opens it again for twice as long, up to
+    `max_open_seconds`. After `max_failed_probes` failed probes in a row
+    before_attempt answers "stop" to every worker until reset().
+    """
+
+    CLOSED = "closed"
+    OPEN = "open"
+    HALF_OPEN = "half_open"
+
+    def __init__(self, failure_threshold=3, open_seconds=30, max_open_seconds=300,
+                 trial_timeout=600, max_failed_probes=5, clock=time.monotonic):
+        self.failure_threshold = failure_threshold
+        self.max_failed_probes = max_failed_probes  # With the defaults about 12 minutes of outage
+        self.base_open_seconds = open_seconds
+        self.max_open_seconds = max_open_seconds
+        self.trial_timeout = trial_timeout  # A trial that never reports back frees the slot
+        self.clock = clock
+        self._lock = threading.Lock()
+        self.reset()
+
+    def reset(self):
+        with self._lock:
+            self.state = self.CLOSED
+            self.failures = 0
+            self.open_seconds = self.base_open_seconds
+            self.opened_at = None
+            self.trial_owner = None
+            self.trial_started = None
+            self.failed_probes = 0
+
+    def before_attempt(self, worker_id):
+        """("run" | "wait" | "probe" | "stop", seconds to wait)"""
+        with self._lock:
+            now = self.clock()
+            if self.failed_probes >= self.max_failed_probes:
+                return "stop", 0.0
+            if self.state == self.CLOSED:
+                return "run", 0.0
+            if self.state == self.OPEN:
+                remaining = self.opened_at + self.open_seconds - now
+                if remaining > 0:
+                    return "wait", remaining
+                self.state = self.HALF_OPEN
+            elif self.trial_owner == worker_id:
+                return "run", 0.0
+            elif self.trial_owner is not None and now - self.trial_started < self.trial_timeout:
+                return "wait", min(self.base_open_seconds, self.trial_timeout - (now - self.trial_started))
+            self.trial_owner = worker_id
+            self.trial_started = now
+            return "probe", 0.0
+
+    def probe_result(self, healthy):
+        """Outcome of the probe of the worker that got "probe"; a healthy one allows its trial item"""
+        if not healthy:
+            with self._lock:
+                self.failed_probes += 1
+                self._open(longer=True)
+
+    def record_success(self):
+        with self._lock:
+            if self.state != self.CLOSED:
+                logger.info("[CIRCUIT] Vahan answered normally again, circuit closed")
+            self.state = self.CLOSED
+            self.failures = 0
+            self.failed_probes = 0
+            self.open_seconds = self.base_open_seconds
+            self.trial_owner = None
+
+    def record_inconclusive(self, worker_id):
+        """A failure that was not an error page; a trial held by this worker goes back to probing"""
+        with self._lock:
+            if self.state == self.HALF_OPEN and self.trial_owner == worker_id:
+                self.trial_owner = None
+
+    def record_failure(self):
+        """An error page was seen. Returns True when this opened the circuit."""
+        with self._lock:
+            self.failures += 1
+            if self.state == self.HALF_OPEN:
+                self._open(longer=True)
+                return True
+            if self.state == self.CLOSED and self.failures >= self.failure_threshold:
+                self._open(longer=False)
+                return True
+            return False
+
+    def _open(self, longer):
+        # Caller holds self._lock
+        if longer:
+            self.open_seconds = min(self.max_open_seconds, self.open_seconds * 2)
+        self.state = self.OPEN
+        self.opened_at = self.clock()
+        self.trial_owner = None
+        logger.info(f"[CIRCUIT] Circuit open after {self.failures} error page(s), pausing {self.open_seconds:.0f}s")
+
+    def allows_traffic(self):
+        with self._lock:
+            return self.state == self.CLOSED
+
+    def snapshot(self):
+        with self._lock:
+            return {"state": self.state, "failures": self.failures, "open_seconds": self.open_seconds,
+                    "failed_probes": self.failed_probes}
@@ -0,0 +1,235 @@
+"""
+Keeps the Vahan sessions of idle browsers alive.
+
+Vahan logs users out after a period of inactivity, and logging in again can
+take the operator several minutes. While no automation job is running, a
+background thread periodically sends a HEAD request for the current page
+from inside each logged-in browser (same cookies, nothing is submitted).
+That refreshes the server-side session. The result is kept as per-browser
+session health for the dashboard.
+
+A ping never runs on a browser another thread is driving (start and login,
+status checks, automation): BrowserUsage tracks who is using which browser.
+"""
+
+import os
+import time
+import logging
+import threading
+from contextlib import contextmanager
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_KEEPALIVE_INTERVAL = 240  # Seconds; TASKIFY_KEEPALIVE_INTERVAL=0 disables the keepalive
+PING_TIMEOUT = 20
+SESSION_EXPIRED = "Session expired (redirected to login)"
+DEFAULT_SCRIPT_TIMEOUT = 30  # WebDriver's default, used when the current value cannot be read
+
+# HEAD request for the current page from inside the browser; reports where it ended up
+KEEPALIVE_SCRIPT = """
+var done = arguments[arguments.length - 1];
+fetch(window.location.href, {method: 'HEAD', credentials: 'same-origin', cache: 'no-store'})
+    .then(function(response) {
+        done({status: response.status, url: response.url, redirected: response.redirected});
+    })
+    .catch(function(error) { done({error: String(error).substring(0, 200)}); });
+"""
+
+
+# GET of a known page of the logged-in application (path resolved against the
+# current origin). Unlike the HEAD above it also reads the body, since Vahan
+# serves its "Something Went Wrong" page with HTTP 200.
+HEALTH_PROBE_SCRIPT = """
+var done = arguments[arguments.length - 1];
+var url = new URL(arguments[0], window.location.href).href;
+fetch(url, {method: 'GET', credentials: 'same-origin', cache: 'no-store'})
+    .then(function(response) {
+        return response.text().then(function(body) {
+            done({status: response.status, url: response.url, error_page: /Something Went Wrong/i.test(body)});
+        });
+    })
+    .catch(function(error) { done({error: String(error).substring(0, 200)}); });
+"""
+
+
+def configured_interval():
+    try:
+        return max(0, int(os.environ.get("TASKIFY_KEEPALIVE_INTERVAL", DEFAULT_KEEPALIVE_INTERVAL)))
+    except ValueError:
+        return DEFAULT_KEEPALIVE_INTERVAL
+
+
+@contextmanager
+def script_timeout(driver, seconds):
+    """Set the driver's async script timeout for the block, then restore the previous one"""
+    try:
+        previous = driver.timeouts.script
+    except Exception:
+        previous = DEFAULT_SCRIPT_TIMEOUT
+    driver.set_script_timeout(seconds)
+    try:
+        yield
+    finally:
+        try:
+            driver.set_script_timeout(previous)
+        except Exception:
+            pass
+
+
+def ping_session(driver):
+    """One keepalive round-trip. Returns (healthy, detail)."""
+    try:
+        if "login" in driver.current_url.lower():
+            return False, "Browser is on the login page"
+        with script_timeout(driver, PING_TIMEOUT):
+            result = driver.execute_async_script(KEEPALIVE_SCRIPT) or {}
+    except Exception as e:
+        return False, f"Browser not responding: {str(e)[:100]}"
+
+    if result.get("error"):
+        return False, f"Keepalive request failed: {result['error']}"
+    if "login" in (result.get("url") or "").lower():
+        return False, SESSION_EXPIRED
+    if result.get("status", 0) >= 400:
+        return False, f"Keepalive request returned HTTP {result['status']}"
+    return True, "Session alive"
+
+
+def probe_site(driver, path):
+    """
+    Cheap health check of the Vahan application itself (circuit breaker probe).
+    Healthy only when `path` answers below HTTP 400, without a redirect to the
+    login page and without the error page. Returns (healthy, detail); detail
+    is SESSION_EXPIRED when the request ended on the login page.
+    """
+    try:
+        with script_timeout(driver, PING_TIMEOUT):
+            result = driver.execute_async_script(HEALTH_PROBE_SCRIPT, path) or {}
+    except Exception as e:
+        return False, f"Browser not responding: {str(e)[:100]}"
+
+    if result.get("error"):
+        return False, f"Probe request failed: {result['error']}"
+    if "login" in (result.get("url") or "").lower():
+        return False, SESSION_EXPIRED
+    if result.get("status", 0) >= 400:
+        return False, f"Probe request returned HTTP {result['status']}"
+    if result.get("error_page"):
+        return False, "Vahan still shows its error page"
+    return True, f"Vahan answered HTTP {result.get('status')}"
+
+
+class BrowserUsage:
+    """
+    Which browsers (by worker id) other threads are driving. Any number of
+    threads may use a browser at the same time; a keepalive ping only runs on
+    a browser nobody is using, and a thread that starts using a browser
+    waits for a running ping on it to finish (at most PING_TIMEOUT).
+    """
+
+    def __init__(self):
+        self._condition = threading.Condition()
+        self._users = {}  # worker_id -> number of threads using the browser
+        self._pinging = set()
+
+    @contextmanager
+    def using(self, worker_id):
+        with self._condition:
+            self._users[worker_id] = self._users.get(worker_id, 0) + 1
+            self._condition.wait_for(lambda: worker_id not in self._pinging)
+        try:
+            yield
+        finally:
+            with self._condition:
+                self._users[worker_id] -= 1
+
+    @contextmanager
+    def ping(self, worker_id):
+        """Yields True when the browser is free and now reserved for a ping, False when it is busy"""
+        with self._condition:
+            free = not self._users.get(worker_id) and worker_id not in self._pinging
+            if free:
+                self._pinging.add(worker_id)
+        try:
+            yield free
+        finally:
+            if free:
+                with self._condition:
+                    self._pinging.discard(worker_id)
+                    self._condition.notify_all()
+
+
+class SessionKeepalive:
+    """
+    Background keepalive loop.
+
+    get_targets() returns [(worker_id, driver)] for the logged-in browsers,
+    is_busy() is True while an automation job is using them (the job's own
+    traffic keeps the session alive), and on_result(worker_id, healthy) lets
+    the owner update its login state. Browsers marked in use in `usage`
+    are skipped for this round.
+    """
+
+    def __init__(self, get_targets, is_busy=None, on_result=None, interval=None, usage=None):
+        self.get_targets = get_targets
+        self.is_busy = is_busy or (lambda: False)
+        self.on_result = on_result
+        self.usage = usage or BrowserUsage()
+        self.interval = configured_interval() if interval is None else interval
+        self._health = {}
+        self._lock = threading.Lock()
+        self._stop = threading.Event()
+        self._thread = None
+
+    def start(self):
+        if not self.interval:
+            logger.info("[KEEPALIVE] Session keepalive disabled")
+            return False
+        if self._thread and self._thread.is_alive():
+            return True
+        self._stop.clear()
+        self._thread = threading.Thread(target=self._run, name="session-keepalive", daemon=True)
+        self._thread.start()
+        logger.info(f"[KEEPALIVE] Session keepalive every {self.interval}s while idle")
+        return True
+
+    def stop(self):
+        self._stop.set()
+
+    def _run(self):
+        while not self._stop.wait(self.interval):
+            try:
+                self.run_once()
+            except Exception as e:
+                logger.error(f"[KEEPALIVE] Keepalive round failed: {e}")
+
+    def run_once(self):
+        """Ping every logged-in browser once, unless an automation job is running"""
+        if self.is_busy():
+            return False
+        for worker_id, driver in self.get_targets():
+            with self.usage.ping(worker_id) as free:
+                if not free:
+                    logger.info(f"[KEEPALIVE] Browser {worker_id} is in use, skipping this round")
+                    continue
+                healthy, detail = ping_session(driver)
+            with self._lock:
+                self._health[worker_id] = {
+                    "worker_id": worker_id,
+                    "healthy": healthy,
+                    "detail": detail,
+                    "checked_at": time.time(),
+                }
+            if not healthy:
+                logger.warning(f"[KEEPALIVE] Browser {worker_id}: {detail}")
+            if self.on_result:
+                self.on_result(worker_id, healthy)
+        return True
+
+    def health(self):
+        with self._lock:
+            return {
+                "enabled": bool(self.interval),
+                "interval": self.interval,
+                "browsers": [dict(h) for _, h in sorted(self._health.items())],
+            }
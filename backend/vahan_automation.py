@@ -1,44 +1,128 @@
 import os
+import re
 import sys
 import time
 import logging
 import subprocess
 import json
 import socket
+import threading
 import undetected_chromedriver as uc
 from selenium.webdriver.common.by import By
 from selenium.webdriver.support.ui import WebDriverWait
 from selenium.webdriver.support import expected_conditions as EC
 from selenium.common.exceptions import TimeoutException, WebDriverException
 from webdriver_manager.chrome import ChromeDriverManager
+from vahan_waits import (
+    wait_for_idle, wait_for_element,
+    PAGE_LOADED, PAGE_SETTLED, AJAX_IDLE, UI_SETTLED, UI_CLEAR, ANGULAR_SETTLED,
+    SERVER_SETTLED, SERVER_LOADED, enable_network_events,
+)
+from vahan_pipeline import Step, Locator, StepFailed, run_pipeline, format_step_timings, set_locator_stats
+import metrics
+from app_config import get_app_data_path
+from vahan_workers import WorkerPool, run_parallel, configured_worker_count
+from application_leases import ApplicationLeaseStore, DEFAULT_LEASE_TTL
+from checkpoint_journal import CheckpointJournal
+from processed_ledger import ProcessedLedger
+import chrome_tuning
+from driver_cache import DriverResolutionCache, detect_chrome_version, bundled_driver_path
+from chrome_profiles import ChromeProfileManager
+from locator_stats import LocatorStats, adaptive_locators_enabled
+from dom_snapshots import (
+    DomSnapshotRecorder, locator_texts, record_enabled as dom_recording_enabled, NO_WORK_STATUSES,
+)
+from retry_policy import RetryPolicy, CircuitBreaker, classify_result, ERROR_PAGE, OTHER
+from session_keepalive import probe_site, BrowserUsage, SESSION_EXPIRED
 
 # Logging setup
 logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
 logger = logging.getLogger(__name__)
 
 VAHAN_URL = "https://vahan.parivahan.gov.in/vahan/vahan/ui/login/login.xhtml"
+VAHAN_HOME_PATH = "/vahan/vahan/home.xhtml"  # Requested by the circuit breaker probe
 CHROME_DEBUG_PORT = 9222  # Port for Chrome debugging
+# Any input of the login form; the readiness check of lean (eager) page loads
+LOGIN_FORM_XPATH = "//form//input[@type='text' or @type='password']"
 
 # Global driver instance
 driver_instance = None
 is_logged_in = False  # Track login status
 
+# Additional Chrome workers (worker 0 is driver_instance above)
+chrome_profiles = ChromeProfileManager(get_app_data_path())
+worker_pool = WorkerPool(chrome_profiles.profile_root, base_port=CHROME_DEBUG_PORT)
+
+# Expiring leases on application numbers so concurrent workers never pick the same row
+lease_store = ApplicationLeaseStore(
+    get_app_data_path(),
+    lease_ttl=int(os.environ.get("TASKIFY_LEASE_TTL", DEFAULT_LEASE_TTL))
+)
+
+# Chromedriver strategy that worked last time, so the next launch skips the probing
+driver_cache = DriverResolutionCache(get_app_data_path())
+
+# Held while the pre-warm launches Chrome so Start doesn't launch a second one
+browser_launch_lock = threading.Lock()
+
+# Browsers (by worker id) being driven outside the keepalive; the keepalive skips them
+browser_usage = BrowserUsage()
+
+# Journal of completed steps per application, to resume after a crash or restart
+checkpoint_journal = CheckpointJournal(get_app_data_path())
+
+# SQLite record of every application handled, served by /history
+processed_ledger = ProcessedLedger(get_app_data_path())
+
+# Locator strategies are tried most-successful-first (TASKIFY_ADAPTIVE_LOCATORS=0 keeps the declared order)
+locator_stats = LocatorStats(get_app_data_path())
+if adaptive_locators_enabled():
+    set_locator_stats(locator_stats)
+
+# Opt-in DOM fixtures for offline selector checks (TASKIFY_RECORD_DOM)
+dom_recorder = DomSnapshotRecorder(get_app_data_path())
+
+# Shared by all workers: repeated "Sorry, Something Went Wrong" pages pause the whole run
+circuit_breaker = CircuitBreaker()
+CIRCUIT_POLL_INTERVAL = 5  # Seconds between breaker checks while it is open
+
+# URL of the Pending Applications table per worker, used to jump straight back to it
+pending_table_urls = {}
+# Workers whose table only showed rows leased by others; their next item reloads it
+stale_pending_tables = set()
+LEASED_ROWS_WAIT = 10  # Seconds before such a worker looks at the table again
+
 # File to persist session info across backend restarts
 SESSION_FILE = os.path.join(os.path.dirname(__file__), '.vahan_session.json')
+SESSION_REFRESH_INTERVAL = 900  # An unchanged session is rewritten this often, keeping it inside load_session_info's 1-hour window
+session_file_lock = threading.Lock()
+last_saved_session = {}
+
+# check_browser_status answers from this cache; concurrent callers share one probe
+STATUS_CACHE_TTL = 2.0
+STATUS_PROBE_TIMEOUT = 30
+status_lock = threading.Lock()
+status_cache = {"result": None, "checked_at": 0.0, "key": None, "inflight": None}
+
+# Set while run_automation drives the browsers; status checks then never touch the driver
+automation_active = threading.Event()
 
 def save_session_info():
-    """Save session info to file"""
-    try:
-        session_data = {
-            'has_driver': driver_instance is not None,
-            'is_logged_in': is_logged_in,
-            'timestamp': time.time()
-        }
-        with open(SESSION_FILE, 'w') as f:
-            json.dump(session_data, f)
-        safe_print(f"[SESSION] Saved session info")
-    except Exception as e:
-        safe_print(f"[SESSION] Error saving session: {e}")
+    """Save session info to file (atomically, and only when it changed or is getting old)"""
+    state = {'has_driver': driver_instance is not None, 'is_logged_in': is_logged_in}
+    now = time.time()
+    with session_file_lock:
+        if last_saved_session.get('state') == state and now - last_saved_session.get('timestamp', 0) < SESSION_REFRESH_INTERVAL:
+            return
+        try:
+            temp_file = SESSION_FILE + '.tmp'
+            with open(temp_file, 'w') as f:
+                json.dump(dict(state, timestamp=now), f)
+            os.replace(temp_file, SESSION_FILE)
+            last_saved_session.update(state=state, timestamp=now)
+            safe_print(f"[SESSION] Saved session info")
+        except Exception as e:
+            safe_print(f"[SESSION] Error saving session: {e}")
 
 def load_session_info():
     """Load session info from file"""
@@ -59,6 +143,8 @@ def load_session_info():
 def clear_session_info():
     """Clear session info file"""
     try:
+        with session_file_lock:
+            last_saved_session.clear()
         if os.path.exists(SESSION_FILE):
             os.remove(SESSION_FILE)
             safe_print("[SESSION] Cleared session info")
@@ -75,9 +161,9 @@ def safe_print(message):
     except Exception as e:
         logger.info(f"[LOGGING_ERROR] Message could not be logged: {str(e)}")
 
-def is_chrome_debugging_available():
+def is_chrome_debugging_available(port=CHROME_DEBUG_PORT):
     """
-    Check if Chrome is running with debugging port 9222.
+    Check if Chrome is running with the given debugging port (default 9222).
     Returns True if available, False otherwise.
     Does NOT create any browser instance.
     """
@@ -85,13 +171,13 @@ def is_chrome_debugging_available():
         import socket
         sock = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
         sock.settimeout(1)
-        result = sock.connect_ex(('127.0.0.1', CHROME_DEBUG_PORT))
+        result = sock.connect_ex(('127.0.0.1', port))
         sock.close()
         return result == 0
     except Exception:
         return False
 
-def try_connect_to_existing_chrome():
+def try_connect_to_existing_chrome(port=CHROME_DEBUG_PORT):
     """
     Try to connect to an existing Chrome instance with debugging enabled.
     Returns driver if successful, None otherwise.
@@ -99,14 +185,15 @@ def try_connect_to_existing_chrome():
     """
     try:
         # First check if debugging port is available
-        if not is_chrome_debugging_available():
-            safe_print("[CONNECT] No Chrome with debugging port detected on port 9222")
+        if not is_chrome_debugging_available(port):
+            safe_print(f"[CONNECT] No Chrome with debugging port detected on port {port}")
             return None
         
-        safe_print("[CONNECT] Debugging port 9222 is active, attempting to connect...")
+        safe_print(f"[CONNECT] Debugging port {port} is active, attempting to connect...")
         
         options = uc.ChromeOptions()
-        options.add_experimental_option("debuggerAddress", f"127.0.0.1:{CHROME_DEBUG_PORT}")
+        options.add_experimental_option("debuggerAddress", f"127.0.0.1:{port}")
+        enable_network_events(options)
         
         # Create driver that connects to existing Chrome
         # This should ONLY connect, not create new browser
@@ -129,15 +216,25 @@ def try_connect_to_existing_chrome():
         safe_print(f"[CONNECT] Connection failed: {str(e)[:100]}")
         return None
 
-def create_vahan_driver():
+def create_vahan_driver(debug_port=CHROME_DEBUG_PORT, user_data_dir=None, lean=None):
     """
     Create a Chrome driver with fallback mechanisms for version compatibility.
     Specifically configured for Vahan website automation.
     Uses remote debugging port to survive backend restarts.
+    user_data_dir is the persistent profile (see chrome_profiles); pool workers
+    pass their own debug_port and profile so several Chrome instances can run
+    side by side.
+    lean (default: TASKIFY_LEAN_MODE) uses the eager page-load strategy and
+    blocks heavy resources, see chrome_tuning.
     """
+    if lean is None:
+        lean = chrome_tuning.lean_mode_enabled()
+    
     # First try to connect to existing Chrome instance
-    existing_driver = try_connect_to_existing_chrome()
+    existing_driver = try_connect_to_existing_chrome(debug_port)
     if existing_driver:
+        if lean:
+            chrome_tuning.apply_blocked_urls(existing_driver, after_login=is_logged_in)
         return existing_driver
     
     attempt_number = 1
@@ -160,7 +257,13 @@ def create_vahan_driver():
         options.add_argument("--disable-features=VizDisplayCompositor")
         
         # Enable remote debugging (allows reconnection after backend restart)
-        options.add_argument(f"--remote-debugging-port={CHROME_DEBUG_PORT}")
+        options.add_argument(f"--remote-debugging-port={debug_port}")
+        
+        # Persistent profile (separate per pool worker) so the HTTP cache survives restarts
+        if user_data_dir:
+            options.add_argument(f"--user-data-dir={user_data_dir}")
+            for argument in chrome_profiles.chrome_arguments():
+                options.add_argument(argument)
         
         # Set user agent
         options.add_argument("--user-agent=Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/140.0.7339.210 Safari/537.36")
@@ -172,13 +275,56 @@ def create_vahan_driver():
         }
         options.add_experimental_option("prefs", prefs)
         
+        # CDP network events for wait_for_network_idle
+        enable_network_events(options)
+        
+        if lean:
+            chrome_tuning.apply_lean_options(options)
+        
         return options
     
+    if user_data_dir:
+        chrome_profiles.prepare(user_data_dir)
+    
+    chrome_version = detect_chrome_version()
+    safe_print(f"[DRIVER] Installed Chrome version: {chrome_version or 'unknown'}")
+    
+    def launch(strategy, **kwargs):
+        driver = uc.Chrome(options=get_base_options(), **kwargs)
+        if lean:
+            chrome_tuning.apply_blocked_urls(driver)
+        if strategy != "cache":
+            patched_path = getattr(getattr(driver, "patcher", None), "executable_path", None)
+            driver_cache.remember(strategy, chrome_version, kwargs.get("version_main"), patched_path)
+        return driver
+    
+    # Strategy 0: The strategy and patched driver that worked last time (no probing, works offline)
+    cached = driver_cache.lookup(chrome_version)
+    if cached:
+        try:
+            safe_print(f"[DRIVER] Attempt {attempt_number}: Using cached driver resolution {cached}...")
+            return launch("cache", **cached)
+        except Exception as e:
+            safe_print(f"[DRIVER] Cached driver failed, clearing cache: {str(e)[:200]}...")
+            driver_cache.invalidate()
+            attempt_number += 1
+    
+    # Strategy 0.5: chromedriver bundled in backend/drivers (offline)
+    bundled_path = bundled_driver_path()
+    if bundled_path:
+        try:
+            safe_print(f"[DRIVER] Attempt {attempt_number}: Using bundled ChromeDriver {bundled_path}...")
+            # Work on a copy: the install folder may be read-only and uc patches the binary
+            driver_path = driver_cache.prepare_driver(bundled_path, chrome_version) or bundled_path
+            return launch("bundled", driver_executable_path=driver_path, version_main=None)
+        except Exception as e:
+            safe_print(f"[DRIVER] Attempt {attempt_number} failed: {str(e)[:200]}...")
+            attempt_number += 1
+    
     # Strategy 1: Auto-detect Chrome version
     try:
         safe_print(f"[DRIVER] Attempt {attempt_number}: Auto-detecting Chrome version...")
-        options = get_base_options()
-        return uc.Chrome(options=options, version_main=None)
+        return launch("auto", version_main=None)
     except Exception as e:
         safe_print(f"[DRIVER] Attempt {attempt_number} failed: {str(e)[:200]}...")
         attempt_number += 1
@@ -186,8 +332,7 @@ def create_vahan_driver():
     # Strategy 2: Try with Chrome version 140
     try:
         safe_print(f"[DRIVER] Attempt {attempt_number}: Using Chrome version 140...")
-        options = get_base_options()
-        return uc.Chrome(options=options, version_main=140)
+        return launch("version", version_main=140)
     except Exception as e:
         safe_print(f"[DRIVER] Attempt {attempt_number} failed: {str(e)[:200]}...")
         attempt_number += 1
@@ -198,8 +343,7 @@ def create_vahan_driver():
         chromedriver_path = ChromeDriverManager().install()
         safe_print(f"[DRIVER] Downloaded ChromeDriver to: {chromedriver_path}")
         
-        options = get_base_options()
-        return uc.Chrome(options=options, driver_executable_path=chromedriver_path)
+        return launch("webdriver_manager", driver_executable_path=chromedriver_path)
     except Exception as e:
         safe_print(f"[DRIVER] Attempt {attempt_number} failed: {str(e)[:200]}...")
         attempt_number += 1
@@ -208,8 +352,7 @@ def create_vahan_driver():
     for version in [139, 138, 137, 136]:
         try:
             safe_print(f"[DRIVER] Attempt {attempt_number}: Trying Chrome version {version}...")
-            options = get_base_options()
-            return uc.Chrome(options=options, version_main=version)
+            return launch("version", version_main=version)
         except Exception as e:
             safe_print(f"[DRIVER] Chrome version {version} failed: {str(e)[:100]}...")
             attempt_number += 1
@@ -225,12 +368,54 @@ def create_vahan_driver():
     )
     raise Exception(error_msg)
 
-def check_browser_status():
+def check_browser_status(max_age=STATUS_CACHE_TTL):
     """
     Check if browser is already open and if user is logged in.
+    The answer is cached for max_age seconds (for as long as an automation is
+    running), and is dropped as soon as the browser or login state changes.
+    Callers arriving while a check is in progress wait for its result instead
+    of probing the driver again.
+    Returns dict with browser_open, logged_in status.
+    """
+    with status_lock:
+        key = (id(driver_instance), is_logged_in)
+        cached = status_cache["result"]
+        if cached and status_cache["key"] == key and (
+                time.time() - status_cache["checked_at"] < max_age or automation_active.is_set()):
+            return dict(cached)
+        inflight = status_cache["inflight"]
+        owner = inflight is None
+        if owner:
+            inflight = status_cache["inflight"] = threading.Event()
+    
+    if not owner:
+        inflight.wait(STATUS_PROBE_TIMEOUT)
+        with status_lock:
+            cached = status_cache["result"]
+        if cached:
+            return dict(cached)
+        return {
+            "browser_open": driver_instance is not None,
+            "logged_in": is_logged_in,
+            "message": "Browser is busy, status check timed out"
+        }
+    
+    result = None
+    try:
+        with browser_usage.using(0):
+            result = probe_browser_status()
+        return dict(result)
+    finally:
+        with status_lock:
+            status_cache.update(result=result, checked_at=time.time(),
+                                key=(id(driver_instance), is_logged_in), inflight=None)
+        inflight.set()
+
+def probe_browser_status():
+    """
+    Live browser check behind check_browser_status.
     Only checks existing driver instance, does NOT open new browser.
     Attempts to reconnect to existing Chrome ONLY if one is running with debugging port.
-    Returns dict with browser_open, logged_in status.
     """
     global driver_instance, is_logged_in
     
@@ -309,15 +494,47 @@ def check_browser_status():
             "message": "Browser instance is not responding"
         }
 
+def login_acknowledged(driver):
+    """Post-login tuning: in lean mode images (kept for the captcha) are blocked too"""
+    if chrome_tuning.lean_mode_enabled():
+        chrome_tuning.apply_blocked_urls(driver, after_login=True)
+
+# Resolves when post-login elements appear in the page (AJAX login). A real
+# navigation unloads the document, which makes chromedriver fail the call at
+# once; both are events, so nothing is polled while the operator types.
+LOGIN_WATCH_SCRIPT = """
+var done = arguments[arguments.length - 1];
+var selector = "a[href*='logout'], a[href*='Logout'], [id*='logout'], [id*='Logout']";
+function loggedIn() {
+    if (document.querySelector(selector)) { return true; }
+    var buttons = document.querySelectorAll('button');
+    for (var i = 0; i < buttons.length; i++) {
+        if (/logout/i.test(buttons[i].textContent)) { return true; }
+    }
+    return false;
+}
+if (loggedIn()) { done('logged_in'); return; }
+var observer = new MutationObserver(function() {
+    if (loggedIn()) { observer.disconnect(); done('logged_in'); }
+});
+observer.observe(document.documentElement, {childList: true, subtree: true});
+"""
+LOGIN_WATCH_CHUNK = 10  # Seconds per watch call, so other driver calls are never held up for long
+DEFAULT_SCRIPT_TIMEOUT = 30
+
+def is_post_login_url(current_url, login_url):
+    return current_url != login_url and "login" not in current_url.lower()
+
 def wait_for_login(driver, timeout=300):
     """
     Wait for user to login to Vahan website.
-    Detects successful login by monitoring URL changes.
+    Event driven: returns as soon as the page navigates away from the login
+    page (the document unloads) or post-login elements appear in it.
     """
     safe_print("[WAIT] Waiting for user to login...")
     safe_print("[INFO] Please login manually in the browser window")
     
-    start_time = time.time()
+    deadline = time.time() + timeout
     
     try:
         login_url = driver.current_url
@@ -326,36 +543,33 @@ def wait_for_login(driver, timeout=300):
         return False
     
     try:
-        while time.time() - start_time < timeout:
+        while time.time() < deadline:
             try:
                 current_url = driver.current_url
-                
-                # Check if URL has changed from login page
-                if current_url != login_url and "login" not in current_url.lower():
+                if is_post_login_url(current_url, login_url):
                     safe_print("[SUCCESS] ✅ Login acknowledged - URL changed!")
                     safe_print(f"[INFO] Current URL: {current_url}")
+                    login_acknowledged(driver)
                     return True
                 
-                # Also check for common post-login elements (optional additional check)
-                try:
-                    # Look for elements that typically appear after login
-                    post_login_elements = driver.find_elements(By.XPATH, "//a[contains(@href, 'logout')] | //button[contains(text(), 'Logout')] | //div[contains(@class, 'user')]")
-                    if post_login_elements:
-                        safe_print("[SUCCESS] ✅ Login acknowledged - user elements found!")
-                        return True
-                except:
-                    pass
+                driver.set_script_timeout(max(1, min(LOGIN_WATCH_CHUNK, deadline - time.time())))
+                if driver.execute_async_script(LOGIN_WATCH_SCRIPT) == "logged_in":
+                    safe_print("[SUCCESS] ✅ Login acknowledged - user elements found!")
+                    login_acknowledged(driver)
+                    return True
                 
-            except Exception as e:
-                # Browser might have been closed
-                error_str = str(e)
-                if "connection" in error_str.lower() or "target" in error_str.lower():
+            except TimeoutException:
+                continue  # Nothing happened in this watch window
+            except WebDriverException as e:
+                error_str = str(e).lower()
+                if "unloaded" in error_str or "navigat" in error_str or "detached" in error_str:
+                    # The page committed a navigation (login submitted); check where it went
+                    continue
+                if "connection" in error_str or "target" in error_str:
                     safe_print(f"[ERROR] ❌ Lost connection to browser (was it closed?)")
                     return False
-                safe_print(f"[ERROR] ❌ Error checking login status: {error_str[:100]}")
+                safe_print(f"[ERROR] ❌ Error checking login status: {str(e)[:100]}")
                 return False
-            
-            time.sleep(2)  # Check every 2 seconds
         
         # Timeout reached
         safe_print(f"[TIMEOUT] ⏰ Login timeout after {timeout} seconds.")
@@ -364,14 +578,133 @@ def wait_for_login(driver, timeout=300):
     except Exception as e:
         safe_print(f"[ERROR] ❌ Error during login wait: {str(e)[:100]}")
         return False
+    finally:
+        try:
+            driver.set_script_timeout(DEFAULT_SCRIPT_TIMEOUT)
+        except Exception:
+            pass
+
+def open_vahan_login_page(driver, max_retries=3):
+    """
+    Navigate the given driver to the Vahan login page, retrying on timeouts
+    and connection resets. Returns True once the page has loaded.
+    """
+    lean = chrome_tuning.lean_mode_enabled()
+    retry_count = 0
+    page_loaded = False
+
+    while retry_count < max_retries and not page_loaded:
+        try:
+            safe_print(f"[NAVIGATE] Opening Vahan website (attempt {retry_count + 1}/{max_retries}): {VAHAN_URL}")
+
+            # Set page load timeout
+            driver.set_page_load_timeout(60)
+
+            # Navigate to URL
+            driver.get(VAHAN_URL)
+
+            if lean:
+                # Eager strategy: get() returned once the DOM was parsed; wait for the login form only
+                safe_print("[WAIT] Waiting for the login form...")
+                WebDriverWait(driver, 30, poll_frequency=0.2).until(
+                    lambda d: d.execute_script("return document.readyState") != "loading"
+                    and d.find_elements(By.XPATH, LOGIN_FORM_XPATH)
+                )
+            else:
+                # Wait a moment for initial page load
+                time.sleep(2)
+
+                # Wait for page to load completely
+                safe_print("[WAIT] Waiting for page to load completely...")
+                WebDriverWait(driver, 30).until(
+                    lambda d: d.execute_script("return document.readyState") == "complete"
+                )
+
+            # Additional check - verify we're on the right page
+            current_url = driver.current_url
+            safe_print(f"[INFO] Current URL: {current_url}")
+
+            if "vahan.parivahan.gov.in" in current_url or "login" in current_url.lower():
+                safe_print("[SUCCESS] ✅ Vahan website loaded successfully!")
+                page_loaded = True
+            else:
+                safe_print(f"[WARNING] ⚠️ Unexpected URL: {current_url}")
+                retry_count += 1
+                if retry_count < max_retries:
+                    safe_print(f"[RETRY] Retrying in 3 seconds...")
+                    time.sleep(3)
+
+        except TimeoutException:
+            safe_print(f"[TIMEOUT] ⏰ Page load timeout on attempt {retry_count + 1}")
+            retry_count += 1
+            if retry_count < max_retries:
+                safe_print(f"[RETRY] Retrying in 3 seconds...")
+                time.sleep(3)
+
+        except WebDriverException as e:
+            if "ERR_CONNECTION_RESET" in str(e) or "net::" in str(e):
+                safe_print(f"[CONNECTION_ERROR] ⚠️ Network error on attempt {retry_count + 1}: Connection reset")
+                retry_count += 1
+                if retry_count < max_retries:
+                    safe_print(f"[RETRY] Retrying in 5 seconds...")
+                    time.sleep(5)
+            else:
+                raise  # Re-raise if it's not a connection error
+    
+    return page_loaded
+
+def prewarm_enabled():
+    return os.environ.get("TASKIFY_PREWARM_BROWSER", "0").lower() in ("1", "true", "yes", "on")
+
+def prewarm_vahan_browser():
+    """
+    Resolve the driver, launch Chrome and load the login page ahead of time
+    (called from the FastAPI lifespan), so the login page is already there
+    when the operator clicks Start. Does not wait for the login itself.
+    """
+    global driver_instance
+    
+    with browser_launch_lock:
+        if driver_instance or is_chrome_debugging_available():
+            safe_print("[PREWARM] Browser already running, nothing to pre-warm")
+            return False
+        
+        started = time.perf_counter()
+        try:
+            safe_print("[PREWARM] Pre-warming Chrome and the Vahan login page...")
+            driver = create_vahan_driver(user_data_dir=chrome_profiles.profile_dir(0))
+            driver_instance = driver
+            if open_vahan_login_page(driver):
+                safe_print(f"[PREWARM] ✅ Login page ready in {time.perf_counter() - started:.1f}s")
+                return True
+            # Start only waits for the login on a browser it reuses, so don't leave one on a failed page
+            safe_print("[PREWARM] ⚠️ Login page did not load; Start will launch the browser again")
+        except Exception as e:
+            safe_print(f"[PREWARM] ❌ Pre-warm failed, Start will launch the browser: {str(e)[:200]}")
+        if driver_instance:
+            try:
+                driver_instance.quit()
+            except Exception:
+                pass
+            driver_instance = None
+        return False
 
 def start_vahan_browser():
     """
     Main function to start browser and navigate to Vahan website.
     Returns dict with success status and message.
     """
+    with browser_usage.using(0):  # No keepalive pings while the browser starts and the operator logs in
+        return launch_primary_browser()
+
+def launch_primary_browser():
+    """Open (or reuse) the primary browser and wait for the operator login; see start_vahan_browser"""
     global driver_instance, is_logged_in
     
+    # A pre-warm still launching Chrome finishes first; then its browser is reused below
+    with browser_launch_lock:
+        pass
+    
     # First check if browser is already open
     status = check_browser_status()
     
@@ -418,64 +751,12 @@ def start_vahan_browser():
         
         # Create driver
         safe_print("[DRIVER] Creating Chrome driver...")
-        driver = create_vahan_driver()
+        driver = create_vahan_driver(user_data_dir=chrome_profiles.profile_dir(0))
         driver_instance = driver
         safe_print("[SUCCESS] ✅ Chrome driver created successfully!")
         
         # Navigate to Vahan website with retry logic
-        max_retries = 3
-        retry_count = 0
-        page_loaded = False
-        
-        while retry_count < max_retries and not page_loaded:
-            try:
-                safe_print(f"[NAVIGATE] Opening Vahan website (attempt {retry_count + 1}/{max_retries}): {VAHAN_URL}")
-                
-                # Set page load timeout
-                driver.set_page_load_timeout(60)
-                
-                # Navigate to URL
-                driver.get(VAHAN_URL)
-                
-                # Wait a moment for initial page load
-                time.sleep(2)
-                
-                # Wait for page to load completely
-                safe_print("[WAIT] Waiting for page to load completely...")
-                WebDriverWait(driver, 30).until(
-                    lambda d: d.execute_script("return document.readyState") == "complete"
-                )
-                
-                # Additional check - verify we're on the right page
-                current_url = driver.current_url
-                safe_print(f"[INFO] Current URL: {current_url}")
-                
-                if "vahan.parivahan.gov.in" in current_url or "login" in current_url.lower():
-                    safe_print("[SUCCESS] ✅ Vahan website loaded successfully!")
-                    page_loaded = True
-                else:
-                    safe_print(f"[WARNING] ⚠️ Unexpected URL: {current_url}")
-                    retry_count += 1
-                    if retry_count < max_retries:
-                        safe_print(f"[RETRY] Retrying in 3 seconds...")
-                        time.sleep(3)
-                
-            except TimeoutException:
-                safe_print(f"[TIMEOUT] ⏰ Page load timeout on attempt {retry_count + 1}")
-                retry_count += 1
-                if retry_count < max_retries:
-                    safe_print(f"[RETRY] Retrying in 3 seconds...")
-                    time.sleep(3)
-                    
-            except WebDriverException as e:
-                if "ERR_CONNECTION_RESET" in str(e) or "net::" in str(e):
-                    safe_print(f"[CONNECTION_ERROR] ⚠️ Network error on attempt {retry_count + 1}: Connection reset")
-                    retry_count += 1
-                    if retry_count < max_retries:
-                        safe_print(f"[RETRY] Retrying in 5 seconds...")
-                        time.sleep(5)
-                else:
-                    raise  # Re-raise if it's not a connection error
+        page_loaded = open_vahan_login_page(driver)
         
         if not page_loaded:
             error_msg = (
@@ -575,58 +856,52 @@ def check_for_error_page(driver):
         safe_print(f"[WARNING] Error checking for error page: {str(e)[:50]}")
         return False
 
+LOWERCASE_TEXT = "translate(text(), 'ABCDEFGHIJKLMNOPQRSTUVWXYZ', 'abcdefghijklmnopqrstuvwxyz')"
+LOWERCASE_VALUE = "translate(@value, 'ABCDEFGHIJKLMNOPQRSTUVWXYZ', 'abcdefghijklmnopqrstuvwxyz')"
+
+# Ways to find the error page's 'Back to Home-Page' button, tried most-successful-first
+BACK_TO_HOME_LOCATORS = (
+    Locator(By.ID, "j_idt45", "ID"),
+    Locator(By.XPATH, f"//*[contains({LOWERCASE_TEXT}, 'back to home page') or contains({LOWERCASE_VALUE}, 'back to home page') "
+                      f"or contains({LOWERCASE_TEXT}, 'back to home-page')]", "text"),
+    Locator(By.XPATH, f"//*[contains({LOWERCASE_TEXT}, 'back to home')]//ancestor::button | "
+                      f"//*[contains({LOWERCASE_TEXT}, 'back to home')]//ancestor::a", "ancestor"),
+)
+
+def click_back_to_home(driver, locator):
+    """Click the first usable element the locator finds. Returns True if one was clicked."""
+    for element in driver.find_elements(locator.by, locator.value):
+        try:
+            # The ID is reused by other buttons; only trust it with the right caption
+            if locator.label == "ID" and "back to home" not in element.text.lower():
+                continue
+            if locator.label == "text" and element.tag_name not in ['button', 'a', 'input']:
+                continue
+            element.click()
+            return True
+        except:
+            continue
+    return False
+
 def check_for_back_to_home_page(driver):
     """
     Check if there's a 'back to home page' button/link and click it if found.
     Returns True if found and clicked, False otherwise.
     """
     try:
-        # Approach 1: Look for the specific button ID (j_idt45)
-        try:
-            back_button_by_id = driver.find_element(By.ID, "j_idt45")
-            if back_button_by_id and "back to home" in back_button_by_id.text.lower():
-                safe_print("[AUTOMATION] Found 'Back to Home-Page' button by ID!")
-                back_button_by_id.click()
-                safe_print("[SUCCESS] ✅ Clicked 'Back to Home-Page' button!")
-                time.sleep(3)  # Wait for page to load
-                return True
-        except:
-            pass
+        locators = BACK_TO_HOME_LOCATORS
+        if adaptive_locators_enabled():
+            locators = locator_stats.order("back_to_home", BACK_TO_HOME_LOCATORS)
         
-        # Approach 2: Look for "back to home page" text or button
-        back_to_home_elements = driver.find_elements(
-            By.XPATH,
-            "//*[contains(translate(text(), 'ABCDEFGHIJKLMNOPQRSTUVWXYZ', 'abcdefghijklmnopqrstuvwxyz'), 'back to home page') or contains(translate(@value, 'ABCDEFGHIJKLMNOPQRSTUVWXYZ', 'abcdefghijklmnopqrstuvwxyz'), 'back to home page') or contains(translate(text(), 'ABCDEFGHIJKLMNOPQRSTUVWXYZ', 'abcdefghijklmnopqrstuvwxyz'), 'back to home-page')]"
-        )
-        
-        if back_to_home_elements:
-            safe_print("[AUTOMATION] Found 'Back to Home Page' element!")
-            
-            # Try to find a clickable button/link
-            for element in back_to_home_elements:
-                try:
-                    if element.tag_name in ['button', 'a', 'input']:
-                        safe_print("[AUTOMATION] Clicking 'Back to Home Page' button...")
-                        element.click()
-                        safe_print("[SUCCESS] ✅ Clicked 'Back to Home Page' button!")
-                        time.sleep(3)  # Wait for page to load
-                        return True
-                except:
-                    continue
-            
-            # If no direct clickable element, look for button near the text
-            try:
-                back_button = driver.find_element(
-                    By.XPATH,
-                    "//*[contains(translate(text(), 'ABCDEFGHIJKLMNOPQRSTUVWXYZ', 'abcdefghijklmnopqrstuvwxyz'), 'back to home')]//ancestor::button | //*[contains(translate(text(), 'ABCDEFGHIJKLMNOPQRSTUVWXYZ', 'abcdefghijklmnopqrstuvwxyz'), 'back to home')]//ancestor::a"
-                )
-                safe_print("[AUTOMATION] Clicking 'Back to Home Page' button (ancestor)...")
-                back_button.click()
-                safe_print("[SUCCESS] ✅ Clicked 'Back to Home Page' button!")
-                time.sleep(3)  # Wait for page to load
+        missed = []
+        for locator in locators:
+            if click_back_to_home(driver, locator):
+                safe_print(f"[SUCCESS] ✅ Clicked 'Back to Home-Page' button (found by {locator.label})!")
+                if adaptive_locators_enabled():
+                    locator_stats.record("back_to_home", locator, missed)
+                wait_for_idle(driver, PAGE_LOADED, timeout=15)
                 return True
-            except:
-                pass
+            missed.append(locator)
         
         return False
     except Exception as e:
@@ -657,7 +932,6 @@ def check_and_close_alert_popup(driver):
                 });
             """)
             safe_print("[AUTOMATION] Removed overlay elements")
-            time.sleep(1)
             
             # Try multiple strategies to close the dialog
             close_clicked = False
@@ -691,7 +965,7 @@ def check_and_close_alert_popup(driver):
             
             # Wait for dialog to disappear
             if close_clicked:
-                time.sleep(2)
+                wait_for_idle(driver, UI_CLEAR, timeout=5)
                 safe_print("[INFO] Alert popup closed successfully")
                 return True
         else:
@@ -702,1194 +976,1027 @@ def check_and_close_alert_popup(driver):
         safe_print(f"[INFO] No alert popup detected or error checking: {e}")
         return False
 
-def run_automation_internal(retry_count=0, max_retries=2):
+# ---------------------------------------------------------------------------
+# NEW-RC-APPROVAL workflow
+#
+# Each step below is declared once in NEW_RC_APPROVAL_STEPS with its locator
+# strategies, readiness condition, timeout and recovery action. The action
+# functions only contain the interaction itself; waiting, failure reporting
+# and per-step timing are handled by vahan_pipeline.run_pipeline.
+# ---------------------------------------------------------------------------
+
+HIDE_OVERLAYS_SCRIPT = """
+    // Hide all overlay elements that might block the click
+    var overlays = document.querySelectorAll('.ui-widget-overlay, .ui-dialog-mask');
+    overlays.forEach(function(overlay) {
+        overlay.style.display = 'none';
+    });
+"""
+
+VISIBLE_DIALOG_XPATH = "//div[contains(@class, 'ui-dialog') and contains(@style, 'display: block')]"
+APPROVE_ROW_XPATH = "//tbody[@id='workDetails_data']//tr[@data-ri='{row}']"
+APPROVE_BUTTON_XPATH = APPROVE_ROW_XPATH + "//button[contains(@id, 'workDetails:{row}:')]"
+APPROVED_STATUS_XPATH = "//input[@type='checkbox' and starts-with(@name, 'approvedStatus')]"
+
+# Vahan application numbers: state code, two digits, then an alphanumeric serial
+APPLICATION_NO_PATTERN = re.compile(r"\b[A-Z]{2}\d{2}[A-Z0-9]{8,}\b")
+
+# Reads every pending row (data-ri, application column, cell texts) in one round-trip
+PENDING_ROWS_SCRIPT = """
+var body = document.getElementById('workDetails_data');
+if (!body) { return []; }
+var headers = document.querySelectorAll('#workDetails thead th');
+var applColumn = -1;
+for (var i = 0; i < headers.length; i++) {
+    if (/appl/i.test(headers[i].textContent)) { applColumn = i; break; }
+}
+var rows = [];
+body.querySelectorAll('tr[data-ri]').forEach(function(tr) {
+    var ri = tr.getAttribute('data-ri');
+    if (!tr.querySelector("button[id*='workDetails:" + ri + ":']")) { return; }
+    var cells = [];
+    tr.querySelectorAll('td').forEach(function(td) { cells.push(td.textContent.trim()); });
+    rows.push({ri: parseInt(ri, 10), appl: applColumn >= 0 ? cells[applColumn] : null, cells: cells});
+});
+return rows;
+"""
+
+# Reads every approvedStatus checkbox and (when arguments[0] is true) clicks the
+# enabled, unchecked ones, all in one round-trip. Returns one report per checkbox.
+BULK_APPROVE_CHECKBOXES_SCRIPT = """
+var toggle = arguments[0];
+var boxes = document.querySelectorAll("input[type='checkbox'][name^='approvedStatus']");
+var report = [];
+for (var i = 0; i < boxes.length; i++) {
+    var box = boxes[i];
+    var entry = {name: box.name || ('checkbox_' + (i + 1)), disabled: box.disabled, checked: box.checked, action: 'skipped'};
+    if (toggle && !box.disabled && !box.checked) {
+        try {
+            box.click();  // Fires the click/change events Angular listens to
+            entry.action = 'clicked';
+        } catch (e) {
+            entry.action = 'error';
+            entry.error = String(e).substring(0, 100);
+        }
+        entry.checked = box.checked;
+    }
+    report.push(entry);
+}
+return report;
+"""
+
+
+def hide_overlays(driver):
+    """Hide PrimeFaces overlays/masks that intercept clicks"""
+    driver.execute_script(HIDE_OVERLAYS_SCRIPT)
+
+
+def click_with_js_fallback(driver, element):
+    """Regular click first, JavaScript click when something intercepts it"""
+    try:
+        element.click()
+        return "click"
+    except Exception as e:
+        safe_print(f"[WARNING] Regular click failed: {str(e)[:80]}, trying JavaScript click...")
+        driver.execute_script("arguments[0].click();", element)
+        return "javascript"
+
+
+def recover_to_home_page(driver, context):
+    """Recovery action: leave an error page through its 'Back to Home-Page' button"""
+    return check_for_back_to_home_page(driver)
+
+
+def is_pending_table_visible(driver):
+    tables = driver.find_elements(By.ID, "workDetails")
+    return bool(tables) and tables[0].is_displayed()
+
+
+def needs_navigation(context):
+    """Dashboard navigation steps only run when the fast path did not reach the table"""
+    return not context.get("on_pending_table")
+
+
+def step_pending_table(driver, step, context):
     """
-    Internal automation function that can be retried.
-    Returns result dict with success status.
+    Fast path: stay on (or deep-link back to) the Pending Applications table
+    instead of navigating Dashboard Pendency → Dealer Registration → View Detail
+    for every item. Leaves context["on_pending_table"] False to fall back to
+    the full navigation.
     """
-    global driver_instance
-    
-    driver = driver_instance
-    
+    context["on_pending_table"] = False
+    if context.get("retry_count"):
+        return  # Retries after an error page always take the full route
+
+    worker_id = context.get("worker_id", 0)
+    stale = worker_id in stale_pending_tables
+    stale_pending_tables.discard(worker_id)
+    if stale or not is_pending_table_visible(driver):
+        table_url = pending_table_urls.get(worker_id)
+        if not table_url:
+            return
+        safe_print("[AUTOMATION] ⚡ Reopening the Pending Applications table directly...")
+        driver.get(table_url)
+        wait_for_idle(driver, PAGE_LOADED, timeout=step.timeout)
+        if not is_pending_table_visible(driver):
+            # The view is not addressable by URL (JSF postback); don't try again
+            safe_print("[INFO] ℹ️ Table not reachable by URL, using full dashboard navigation")
+            pending_table_urls.pop(worker_id, None)
+            return
+
+    context["on_pending_table"] = True
+    safe_print("[AUTOMATION] ⚡ On the Pending Applications table, skipping dashboard navigation")
+
+
+def step_home_page(driver, step, context):
     # Check for "back to home page" before starting
     if check_for_back_to_home_page(driver):
         safe_print("[AUTOMATION] Returned to home page, continuing automation...")
-    
-    # Step 0.5: Check for alert popup BEFORE clicking Dashboard Pendency
-    safe_print("[AUTOMATION] Checking for alert popup before Dashboard Pendency click...")
-    time.sleep(1)  # Brief wait to see if popup is already there
+
+
+def step_alert_popup(driver, step, context):
+    safe_print("[AUTOMATION] Checking for alert popup...")
     check_and_close_alert_popup(driver)
-    
-    # Step 1: Click Dashboard Pendency button
+
+
+def step_dashboard_pendency(driver, step, context):
     safe_print("[AUTOMATION] Looking for Dashboard Pendency button...")
-    try:
-        # Try to find by title attribute first (more reliable)
-        dashboard_button = WebDriverWait(driver, 10).until(
-            EC.element_to_be_clickable((By.XPATH, "//button[@title='Dashboard Pendency']"))
-        )
-        safe_print("[AUTOMATION] Found Dashboard Pendency button (by title)!")
-        dashboard_button.click()
-        safe_print("[SUCCESS] ✅ Clicked Dashboard Pendency button!")
-        
-        # Wait for page transition
-        time.sleep(3)
-        safe_print("[AUTOMATION] Waiting for page to load...")
-        
-    except TimeoutException:
-        safe_print("[ERROR] Dashboard Pendency button not found within timeout")
-        
-        # Check if we need to go back to home page and retry
-        if retry_count < max_retries:
-            safe_print(f"[AUTOMATION] Checking for 'Back to Home Page' button... (Retry {retry_count + 1}/{max_retries})")
-            if check_for_back_to_home_page(driver):
-                safe_print("[AUTOMATION] Retrying automation after returning to home page...")
-                return run_automation_internal(retry_count + 1, max_retries)
-        
-        # If still can't find it, ask user to login
-        return {
-            "success": False,
-            "message": "⚠️ Dashboard Pendency button not found. Please ensure you are logged in correctly. If you see a login page, please login and try again.",
-            "status": "button_not_found",
-            "action_required": "login"
-        }
-    
-    # Continue with remaining automation steps
-    return execute_remaining_steps(driver, retry_count, max_retries)
+    step.click(driver)
+    safe_print("[SUCCESS] ✅ Clicked Dashboard Pendency button!")
+
+
+def expand_tree_node(driver, step, label, expanded_xpath):
+    """Click a PrimeFaces treetable toggler unless the node is already expanded"""
+    safe_print(f"[AUTOMATION] Looking for {label} toggle...")
+    # ui-icon-triangle-1-s (down arrow) means the node is already expanded
+    if driver.find_elements(By.XPATH, expanded_xpath):
+        safe_print(f"[INFO] ℹ️ {label} is already expanded, skipping click")
+        return
+    step.click(driver)
+    safe_print(f"[SUCCESS] ✅ Clicked {label} toggle!")
+
+
+def step_dealer_registration(driver, step, context):
+    expand_tree_node(
+        driver, step, "Dealer Registration",
+        "//td[.//label[contains(., 'Dealer Registration')]]//span[contains(@class, 'ui-icon-triangle-1-s')]"
+    )
+
+
+def step_new_registration(driver, step, context):
+    expand_tree_node(
+        driver, step, "New Registration (Dealer Side)",
+        "//label[contains(., 'New Registration (Dealer Side)')]/preceding-sibling::span[contains(@class, 'ui-icon-triangle-1-s')]"
+    )
+
+
+def step_view_detail(driver, step, context):
+    safe_print("[AUTOMATION] Looking for View Detail link beside NEW-RC-APPROVAL...")
+    step.click(driver)
+    safe_print("[SUCCESS] ✅ Clicked View Detail magnifying glass beside NEW-RC-APPROVAL!")
+
 
-def execute_remaining_steps(driver, retry_count=0, max_retries=2):
-    """Execute automation steps 2-17"""
+def extract_application_no(row):
+    """Application number of a pending row: the application column first, then any cell"""
+    for text in [row.get("appl")] + list(row.get("cells") or []):
+        match = APPLICATION_NO_PATTERN.search((text or "").upper())
+        if match:
+            return match.group(0)
+    return None
+
+def read_pending_rows(driver):
+    """Return [(row_index, application_no or None)] for rows that have an Approve button"""
+    rows = driver.execute_script(PENDING_ROWS_SCRIPT) or []
+    return [(row["ri"], extract_application_no(row)) for row in rows]
+
+def choose_pending_row(driver, context):
+    """
+    Pick the row this worker should approve and lease its application number.
+    Scanning starts at the worker's slot so workers rarely contend for a lease.
+    Rows whose application number cannot be read are only taken when this is
+    the only worker, since nothing else stops two browsers approving them.
+    Returns the row index, or None when the table has no pending rows.
+    Raises StepFailed when rows remain but none may be taken by this worker.
+    """
+    worker_id = context.get("worker_id", 0)
+    slot = context.get("row_index", 0)
+    rows = read_pending_rows(driver)
+    if not rows:
+        return None
     
-    # Step 1.5: Handle optional alert popup after Dashboard Pendency click
-    safe_print("[AUTOMATION] Checking for optional alert popup after Dashboard Pendency click...")
-    time.sleep(2)  # Give popup time to appear
-    check_and_close_alert_popup(driver)
+    # Slots past the end of a short table wrap around instead of finding nothing
+    offset = slot % len(rows)
+    rows = rows[offset:] + rows[:offset]
+    readable = [application_no for _, application_no in rows if application_no]
+    unreadable = [ri for ri, application_no in rows if not application_no]
+    
+    claimed = lease_store.claim_first(readable, worker_id) if readable else None
+    if claimed:
+        safe_print(f"[LEASE] Worker {worker_id} claimed application {claimed}")
+        context["application_no"] = claimed
+        return next(ri for ri, application_no in rows if application_no == claimed)
+    
+    if unreadable:
+        if context.get("worker_count", 1) == 1:
+            # Application number not readable (table layout changed): no other worker to collide with
+            safe_print(f"[LEASE] ⚠️ Could not read the application number of row {unreadable[0]}, approving it without a lease")
+            return unreadable[0]
+        if not readable:
+            raise StepFailed(
+                "application_numbers_unreadable",
+                "Could not read the application numbers in the Pending Applications table, so rows cannot be "
+                "shared safely between browsers. Run with a single browser until the table layout is supported."
+            )
+        safe_print(f"[LEASE] Skipping {len(unreadable)} row(s) without a readable application number")
     
-    # Step 2: Click Dealer Registration span (if not already expanded)
-    safe_print("[AUTOMATION] Looking for Dealer Registration element...")
+    safe_print(f"[LEASE] All {len(readable)} readable pending applications are claimed by other workers")
+    raise StepFailed("all_rows_leased", f"All {len(readable)} pending applications are being processed by other workers.")
+
+def step_approve(driver, step, context):
+    safe_print("[AUTOMATION] Waiting for the Pending Applications table to load...")
+    no_more_items = {
+        "success": False,  # False to stop the loop
+        "message": "No more pending applications to process.",
+        "status": "no_approve_button"
+    }
+    try:
+        wait_for_element(driver, (By.ID, "workDetails"), timeout=step.timeout, clickable=False)
+        safe_print("[AUTOMATION] Table loaded successfully!")
+        pending_table_urls[context.get("worker_id", 0)] = driver.current_url
+
+        # The Approve button lives in the row with data-ri="<row>" (id pattern workDetails:<row>:j_idt270)
+        row_index = choose_pending_row(driver, context)
+        if row_index is None:
+            safe_print("[INFO] ℹ️ No unclaimed approve buttons found in the table!")
+            safe_print("[SUCCESS] 🎉 All pending applications have been processed!")
+            return no_more_items
+
+        approve_button_xpath = APPROVE_BUTTON_XPATH.format(row=row_index)
+        wait_for_element(driver, (By.XPATH, approve_button_xpath), timeout=step.timeout).click()
+        safe_print(f"[SUCCESS] ✅ Clicked Approve button in row {row_index}!")
+    except TimeoutException:
+        safe_print("[ERROR] Table or Approve button not found within timeout")
+        # Double-check if it's because there are no more items to process
+        if driver.find_elements(By.ID, "workDetails") and not driver.find_elements(
+            By.XPATH, APPROVE_ROW_XPATH.format(row=0)
+        ):
+            safe_print("[INFO] ℹ️ Table is empty - no more items to process!")
+            return no_more_items
+        raise
+
+
+def step_vltd_popup(driver, step, context):
+    safe_print("[AUTOMATION] Checking for optional VLTD popup...")
+    vltd_dialog = driver.find_elements(
+        By.XPATH,
+        VISIBLE_DIALOG_XPATH + "//span[contains(text(), 'Vehicle Location Tracking Device')]"
+    )
+    if not vltd_dialog:
+        safe_print("[INFO] ℹ️ No VLTD popup found, continuing to next step")
+        return
+
+    safe_print("[AUTOMATION] Found VLTD popup! Attempting to click OK...")
+    hide_overlays(driver)
+    safe_print("[AUTOMATION] Removed overlay elements")
+    _, locator = step.click(driver)
+    safe_print(f"[SUCCESS] ✅ Clicked VLTD OK button using {locator.label}!")
+
+
+def step_verification_checkbox(driver, step, context):
+    safe_print("[AUTOMATION] Looking for the verification checkbox...")
+    checkbox_container, _ = step.find(driver)
+    # If checked, the checkbox box will have class "ui-state-active"
+    checkbox_box = checkbox_container.find_element(By.CLASS_NAME, "ui-chkbox-box")
+    if "ui-state-active" in (checkbox_box.get_attribute("class") or ""):
+        safe_print("[INFO] ℹ️ Verification checkbox is already checked, skipping click")
+        return
+    checkbox_box.click()
+    safe_print("[SUCCESS] ✅ Clicked verification checkbox!")
+    wait_for_idle(driver, AJAX_IDLE, timeout=5)  # Wait for checkbox action to complete
+
+
+def step_documents_tab(driver, step, context):
+    safe_print("[AUTOMATION] Looking for the Documents Uploaded tab...")
+    step.click(driver)
+    safe_print("[SUCCESS] ✅ Clicked Documents Uploaded tab!")
+
+
+def step_open_documents(driver, step, context):
+    safe_print("[AUTOMATION] Looking for the Modify/View Documents button...")
+    modify_view_button, _ = step.find(driver)
+    # The button text carries the application number
+    button_text = modify_view_button.text
+    safe_print(f"[AUTOMATION] Button text: {button_text}")
+    context["documents_button_text"] = button_text
+    modify_view_button.click()
+    safe_print("[SUCCESS] ✅ Clicked Modify/View Documents button!")
+
+
+def step_reopen_documents(driver, step, context):
+    safe_print("[AUTOMATION] Clicking Modify/View Documents button again...")
     try:
-        # Wait for the page to load completely
-        WebDriverWait(driver, 10).until(
-            lambda d: d.execute_script("return document.readyState") == "complete"
+        # JavaScript click (see locator) avoids interception by the closing iframe
+        step.click(driver)
+    except WebDriverException as e:
+        if isinstance(e, TimeoutException):
+            raise
+        raise StepFailed(
+            "modify_button_2_click_error",
+            f"Could not click Modify/View Documents button - it may be blocked by another element. Error: {str(e)[:100]}"
         )
-        
-        # Check if Dealer Registration is already expanded (look for the down arrow icon)
-        try:
-            # If this element exists, it's already expanded (ui-icon-triangle-1-s means down arrow)
-            already_expanded = driver.find_elements(
-                By.XPATH, 
-                "//td[.//label[contains(., 'Dealer Registration')]]//span[contains(@class, 'ui-icon-triangle-1-s')]"
-            )
-            
-            if already_expanded:
-                safe_print("[INFO] ℹ️ Dealer Registration is already expanded, skipping click")
+    safe_print("[SUCCESS] ✅ Clicked Modify/View Documents button again!")
+
+
+def step_close_dms_modal(driver, step, context):
+    safe_print("[AUTOMATION] Looking for the modal close button...")
+    # Make sure we're in default content (not in any iframe)
+    driver.switch_to.default_content()
+    wait_for_element(driver, (By.ID, "workbench_tabview:viewUploadedDms_title"), timeout=step.timeout, clickable=False)
+    safe_print("[AUTOMATION] Modal dialog appeared!")
+    wait_for_idle(driver, UI_SETTLED, timeout=5)  # Wait for modal animation to complete
+
+    close_modal_button, locator = step.find(driver)
+    safe_print(f"[AUTOMATION] Found modal close button using {locator.label}!")
+    driver.execute_script("arguments[0].scrollIntoView({block: 'center'});", close_modal_button)
+    click_with_js_fallback(driver, close_modal_button)
+    safe_print("[SUCCESS] ✅ Clicked modal close button!")
+
+
+def step_close_confirmation(driver, step, context):
+    safe_print("[AUTOMATION] Looking for success message popup close button...")
+    close_popup_button, locator = step.find(driver)
+    safe_print(f"[AUTOMATION] Found success popup close icon ({locator.label})!")
+    # Element found but may be blocked by overlay - hide overlays before clicking
+    hide_overlays(driver)
+    click_with_js_fallback(driver, close_popup_button)
+    safe_print("[SUCCESS] ✅ Clicked success popup close icon!")
+
+
+def step_approve_documents(driver, step, context):
+    safe_print("[AUTOMATION] Looking for approvedStatus checkboxes...")
+    try:
+        # The checkboxes are inside an iframe in the DMS modal
+        iframe, _ = step.find(driver)
+        safe_print("[AUTOMATION] Found DMS iframe, switching to it...")
+        driver.switch_to.frame(iframe)
+
+        # Wait for Angular to initialize and checkboxes to appear
+        wait_for_idle(driver, ANGULAR_SETTLED, timeout=15)
+        wait_for_element(driver, (By.XPATH, APPROVED_STATUS_XPATH), timeout=15, clickable=False)
+
+        report = driver.execute_script(BULK_APPROVE_CHECKBOXES_SCRIPT, True) or []
+        safe_print(f"[AUTOMATION] Found {len(report)} total approvedStatus checkboxes")
+        wait_for_idle(driver, ANGULAR_SETTLED, timeout=5)  # Let Angular process all changes at once
+
+        # Re-read the state after the digest so the report shows what actually stuck
+        final_state = {entry["name"]: entry for entry in driver.execute_script(BULK_APPROVE_CHECKBOXES_SCRIPT, False) or []}
+        checked_count = 0
+        skipped_count = 0
+        for entry in report:
+            final = final_state.get(entry["name"], entry)
+            entry["checked"] = final["checked"]
+            if entry["action"] == "clicked" and entry["checked"]:
+                checked_count += 1
+                safe_print(f"[AUTOMATION] ✓ Checked {entry['name']}")
+            elif entry["action"] == "skipped":
+                skipped_count += 1
+                safe_print(f"[INFO] {entry['name']} is disabled or already checked, skipping")
             else:
-                # Find and click the toggle (right arrow icon - ui-icon-triangle-1-e)
-                dealer_registration_span = WebDriverWait(driver, 10).until(
-                    EC.element_to_be_clickable((
-                        By.XPATH, 
-                        "//td[.//label[contains(., 'Dealer Registration')]]//span[@class='ui-treetable-toggler ui-icon ui-icon-triangle-1-e ui-c']"
-                    ))
-                )
-                safe_print("[AUTOMATION] Found Dealer Registration toggle!")
-                dealer_registration_span.click()
-                safe_print("[SUCCESS] ✅ Clicked Dealer Registration toggle!")
-                time.sleep(3)  # Wait for sub-items to load
-                
-        except Exception as e:
-            safe_print(f"[WARNING] Could not determine Dealer Registration state: {e}")
-            # Try to click anyway
-            dealer_registration_span = WebDriverWait(driver, 5).until(
-                EC.element_to_be_clickable((
-                    By.XPATH, 
-                    "//td[.//label[contains(., 'Dealer Registration')]]//span[@class='ui-treetable-toggler ui-icon ui-icon-triangle-1-e ui-c']"
-                ))
-            )
-            dealer_registration_span.click()
-            safe_print("[SUCCESS] ✅ Clicked Dealer Registration toggle!")
-            time.sleep(3)
-        
-        # Step 3: Click "New Registration (Dealer Side)" toggle (if not already expanded)
-        safe_print("[AUTOMATION] Looking for New Registration (Dealer Side) toggle...")
-        
-        # Check if New Registration is already expanded
-        try:
-            already_expanded_new_reg = driver.find_elements(
-                By.XPATH,
-                "//label[contains(., 'New Registration (Dealer Side)')]/preceding-sibling::span[contains(@class, 'ui-icon-triangle-1-s')]"
-            )
-            
-            if already_expanded_new_reg:
-                safe_print("[INFO] ℹ️ New Registration (Dealer Side) is already expanded, skipping click")
-            else:
-                # Find and click the toggle (right arrow)
-                new_registration_span = WebDriverWait(driver, 15).until(
-                    EC.element_to_be_clickable((
-                        By.XPATH,
-                        "//label[contains(., 'New Registration (Dealer Side)')]/preceding-sibling::span[@class='ui-treetable-toggler ui-icon ui-icon-triangle-1-e ui-c']"
-                    ))
-                )
-                safe_print("[AUTOMATION] Found New Registration (Dealer Side) toggle!")
-                new_registration_span.click()
-                safe_print("[SUCCESS] ✅ Clicked New Registration (Dealer Side) toggle!")
-                time.sleep(2)  # Wait for expansion to complete
-                
-        except Exception as e:
-            safe_print(f"[WARNING] Could not determine New Registration state: {e}")
-            # Try to click anyway
-            new_registration_span = WebDriverWait(driver, 10).until(
-                EC.element_to_be_clickable((
-                    By.XPATH,
-                    "//label[contains(., 'New Registration (Dealer Side)')]/preceding-sibling::span[@class='ui-treetable-toggler ui-icon ui-icon-triangle-1-e ui-c']"
-                ))
-            )
-            new_registration_span.click()
-            safe_print("[SUCCESS] ✅ Clicked New Registration (Dealer Side) toggle!")
-            time.sleep(2)
-        
-        # Step 4: Click the magnifying glass (View Detail link) beside "NEW-RC-APPROVAL"
-        safe_print("[AUTOMATION] Looking for View Detail link beside NEW-RC-APPROVAL...")
-        # Find the <a> tag in the same row as the label containing "NEW-RC-APPROVAL"
-        # Using XPath similar to Dealer Registration pattern - finds the <a> in the <td> that contains the label
-        view_detail_link = WebDriverWait(driver, 10).until(
-            EC.element_to_be_clickable((
-                By.XPATH,
-                "//tr[.//label[contains(., 'NEW-RC-APPROVAL')]]//td[@role='gridcell']//a[contains(@class, 'ui-commandlink')]"
-            ))
+                safe_print(f"[WARNING] Could not check {entry['name']}: {entry.get('error', 'state did not change')}")
+
+        safe_print(f"[SUCCESS] ✅ Checked {checked_count} checkboxes, skipped {skipped_count} (disabled or already checked)")
+        context["documents_report"] = report
+        context["documents_checked"] = checked_count
+    except TimeoutException:
+        safe_print("[ERROR] ApprovedStatus checkboxes not found within timeout")
+        raise
+    except Exception as e:
+        raise StepFailed(
+            "checkbox_processing_error",
+            f"Error processing approvedStatus checkboxes: {str(e)[:100]}"
         )
-        safe_print("[AUTOMATION] Found View Detail link beside NEW-RC-APPROVAL!")
-        view_detail_link.click()
-        safe_print("[SUCCESS] ✅ Clicked View Detail magnifying glass beside NEW-RC-APPROVAL!")
-        
-        time.sleep(3)  # Wait for the table page to load
-        
-        # Step 5: Wait for the table to appear and click the first Approve button
-        safe_print("[AUTOMATION] Waiting for the Pending Applications table to load...")
-        try:
-            # Wait for the table with id="workDetails" to be visible
-            WebDriverWait(driver, 15).until(
-                EC.presence_of_element_located((By.ID, "workDetails"))
-            )
-            safe_print("[AUTOMATION] Table loaded successfully!")
-            
-            # Find the first Approve button in the table (in the first row with data-ri="0")
-            # The button is inside workDetails table with pattern workDetails:0:j_idt270
-            safe_print("[AUTOMATION] Looking for the first Approve button...")
-            
-            # Check if any approve buttons exist in the table
-            approve_buttons = driver.find_elements(
-                By.XPATH,
-                "//tbody[@id='workDetails_data']//tr[@data-ri='0']//button[contains(@id, 'workDetails:0:')]"
-            )
-            
-            if not approve_buttons:
-                # No approve buttons found - this means all items are processed!
-                safe_print("[INFO] ℹ️ No approve buttons found in the table!")
-                safe_print("[SUCCESS] 🎉 All pending applications have been processed!")
-                return {
-                    "success": False,  # False to stop the loop
-                    "message": "No more pending applications to process.",
-                    "status": "no_approve_button"
-                }
-            
-            # Wait for the button to be clickable
-            first_approve_button = WebDriverWait(driver, 10).until(
-                EC.element_to_be_clickable((
-                    By.XPATH,
-                    "//tbody[@id='workDetails_data']//tr[@data-ri='0']//button[contains(@id, 'workDetails:0:')]"
-                ))
-            )
-            safe_print("[AUTOMATION] Found first Approve button!")
-            first_approve_button.click()
-            safe_print("[SUCCESS] ✅ Clicked first Approve button!")
-            
-            time.sleep(3)  # Wait for the new page/dialog to open
-            
-        except TimeoutException:
-            safe_print("[ERROR] Table or Approve button not found within timeout")
-            
-            # Double-check if it's because there are no more items to process
-            try:
-                table = driver.find_element(By.ID, "workDetails")
-                rows = driver.find_elements(By.XPATH, "//tbody[@id='workDetails_data']//tr[@data-ri='0']")
-                
-                if not rows or len(rows) == 0:
-                    safe_print("[INFO] ℹ️ Table is empty - no more items to process!")
-                    return {
-                        "success": False,  # False to stop the loop
-                        "message": "No more pending applications to process.",
-                        "status": "no_approve_button"
-                    }
-            except:
-                pass
-            
-            return {
-                "success": False,
-                "message": "Pending Applications table or Approve button not found. The page may not have loaded correctly.",
-                "status": "table_not_found"
-            }
-        
-        # Step 5.5: Handle optional VLTD (Vehicle Location Tracking Device) popup
-        safe_print("[AUTOMATION] Checking for optional VLTD popup...")
-        try:
-            # Give a short wait to see if the VLTD popup appears
-            time.sleep(2)
-            
-            # Try to find the VLTD dialog by its title or ID
-            vltd_dialog = driver.find_elements(
-                By.XPATH,
-                "//div[contains(@class, 'ui-dialog') and contains(@style, 'display: block')]//span[contains(text(), 'Vehicle Location Tracking Device')]"
-            )
-            
-            if vltd_dialog and len(vltd_dialog) > 0:
-                safe_print("[AUTOMATION] Found VLTD popup! Attempting to click OK...")
-                
-                # First, remove any overlays that might be blocking
-                driver.execute_script("""
-                    var overlays = document.querySelectorAll('.ui-widget-overlay, .ui-dialog-mask');
-                    overlays.forEach(function(overlay) {
-                        overlay.style.display = 'none';
-                    });
-                """)
-                safe_print("[AUTOMATION] Removed overlay elements")
-                time.sleep(1)
-                
-                # Try multiple strategies to click the OK button
-                ok_clicked = False
-                
-                # Strategy 1: Find OK button by ID (j_idt124)
-                try:
-                    ok_button = WebDriverWait(driver, 3).until(
-                        EC.element_to_be_clickable((
-                            By.ID,
-                            "j_idt124"
-                        ))
-                    )
-                    ok_button.click()
-                    safe_print("[SUCCESS] ✅ Clicked VLTD OK button using ID!")
-                    ok_clicked = True
-                except:
-                    safe_print("[INFO] Could not click OK by ID, trying alternatives...")
-                
-                # Strategy 2: Find OK button by text within visible dialog
-                if not ok_clicked:
-                    try:
-                        ok_button = WebDriverWait(driver, 3).until(
-                            EC.element_to_be_clickable((
-                                By.XPATH,
-                                "//div[contains(@class, 'ui-dialog') and contains(@style, 'display: block')]//button[contains(@class, 'ui-button') and .//span[text()='OK']]"
-                            ))
-                        )
-                        ok_button.click()
-                        safe_print("[SUCCESS] ✅ Clicked VLTD OK button using text!")
-                        ok_clicked = True
-                    except:
-                        safe_print("[INFO] Could not click OK by text, trying JavaScript...")
-                
-                # Strategy 3: Use JavaScript click if regular click didn't work
-                if not ok_clicked:
-                    try:
-                        ok_button = driver.find_element(By.ID, "j_idt124")
-                        driver.execute_script("arguments[0].click();", ok_button)
-                        safe_print("[SUCCESS] ✅ Clicked VLTD OK button using JavaScript!")
-                        ok_clicked = True
-                    except:
-                        safe_print("[WARNING] Could not click VLTD OK button with JavaScript")
-                
-                # Strategy 4: Try finding by button text with check icon
-                if not ok_clicked:
-                    try:
-                        ok_button = driver.find_element(
-                            By.XPATH,
-                            "//button[.//span[contains(@class, 'ui-icon-check')] and .//span[text()='OK']]"
-                        )
-                        driver.execute_script("arguments[0].click();", ok_button)
-                        safe_print("[SUCCESS] ✅ Clicked VLTD OK button using icon+text!")
-                        ok_clicked = True
-                    except:
-                        safe_print("[WARNING] Could not find OK button by icon+text")
-                
-                # Wait for dialog to disappear
-                if ok_clicked:
-                    time.sleep(2)
-                    safe_print("[INFO] VLTD popup handled successfully")
-                else:
-                    safe_print("[WARNING] ⚠️ Could not click VLTD OK button - may cause issues")
-            else:
-                safe_print("[INFO] ℹ️ No VLTD popup found, continuing to next step")
-                
-        except Exception as e:
-            safe_print(f"[INFO] No VLTD popup detected or error checking: {e}")
-            # Not a critical error, continue with automation
-        
-        # Step 6: Click the verification checkbox (only if unchecked)
-        safe_print("[AUTOMATION] Looking for the verification checkbox...")
-        try:
-            # Wait for the checkbox to be visible
-            # The checkbox is identified by id="workbench_tabview:verifyCheckValue"
-            checkbox_container = WebDriverWait(driver, 15).until(
-                EC.presence_of_element_located((
-                    By.ID,
-                    "workbench_tabview:verifyCheckValue"
-                ))
-            )
-            safe_print("[AUTOMATION] Found verification checkbox container!")
-            
-            # Check if the checkbox is already checked
-            # If checked, the checkbox box will have class "ui-state-active"
-            checkbox_box = checkbox_container.find_element(By.CLASS_NAME, "ui-chkbox-box")
-            checkbox_classes = checkbox_box.get_attribute("class")
-            
-            if "ui-state-active" in checkbox_classes:
-                safe_print("[INFO] ℹ️ Verification checkbox is already checked, skipping click")
-            else:
-                safe_print("[AUTOMATION] Checkbox is unchecked, clicking it...")
-                checkbox_box.click()
-                safe_print("[SUCCESS] ✅ Clicked verification checkbox!")
-                time.sleep(2)  # Wait for checkbox action to complete
-            
-        except TimeoutException:
-            safe_print("[ERROR] Verification checkbox not found within timeout")
-            return {
-                "success": False,
-                "message": "Verification checkbox not found. The approval page may not have loaded correctly.",
-                "status": "checkbox_not_found"
-            }
-        
-        # Step 7: Click on the "Documents Uploaded" tab
-        safe_print("[AUTOMATION] Looking for the Documents Uploaded tab...")
-        try:
-            # Wait for the tab to be clickable
-            # The tab is the 6th tab (data-index="5")
-            documents_tab = WebDriverWait(driver, 10).until(
-                EC.element_to_be_clickable((
-                    By.XPATH,
-                    "//ul[contains(@class, 'ui-tabs-nav')]//li[@data-index='5']//a[contains(text(), 'Documents Uploaded')]"
-                ))
-            )
-            safe_print("[AUTOMATION] Found Documents Uploaded tab!")
-            documents_tab.click()
-            safe_print("[SUCCESS] ✅ Clicked Documents Uploaded tab!")
-            
-            time.sleep(3)  # Wait for tab content to load
-            
-        except TimeoutException:
-            safe_print("[ERROR] Documents Uploaded tab not found within timeout")
-            return {
-                "success": False,
-                "message": "Documents Uploaded tab not found. The page may not have loaded correctly.",
-                "status": "tab_not_found"
-            }
-        
-        # Step 8: Click the "Modify/View Documents" button
-        safe_print("[AUTOMATION] Looking for the Modify/View Documents button...")
-        try:
-            # Wait for the button to be clickable
-            # The button has id="workbench_tabview:idViewDoc" and contains text "Modify/View Documents for Application No"
-            modify_view_button = WebDriverWait(driver, 15).until(
-                EC.element_to_be_clickable((
-                    By.ID,
-                    "workbench_tabview:idViewDoc"
-                ))
-            )
-            safe_print("[AUTOMATION] Found Modify/View Documents button!")
-            
-            # Get the button text to log the application number
-            button_text = modify_view_button.text
-            safe_print(f"[AUTOMATION] Button text: {button_text}")
-            
-            modify_view_button.click()
-            safe_print("[SUCCESS] ✅ Clicked Modify/View Documents button!")
-            
-            time.sleep(3)  # Wait for the modal to open
-            
-        except TimeoutException:
-            safe_print("[ERROR] Modify/View Documents button not found within timeout")
-            return {
-                "success": False,
-                "message": "Modify/View Documents button not found. The Documents Uploaded tab content may not have loaded correctly.",
-                "status": "modify_button_not_found"
-            }
-        
-        # Step 9: Close the DMS modal
-        safe_print("[AUTOMATION] Looking for the modal close button...")
-        try:
-            # Make sure we're in default content (not in any iframe)
-            driver.switch_to.default_content()
-            
-            # Wait for the modal dialog to appear first
-            WebDriverWait(driver, 10).until(
-                EC.presence_of_element_located((
-                    By.ID,
-                    "workbench_tabview:viewUploadedDms_title"
-                ))
-            )
-            safe_print("[AUTOMATION] Modal dialog appeared!")
-            time.sleep(1)  # Wait for modal animation to complete
-            
-            # Find the close button - target the one inside the DMS modal specifically
-            close_modal_button = None
-            try:
-                # More specific selector - find close button within the viewUploadedDms dialog
-                close_modal_button = driver.find_element(
-                    By.XPATH,
-                    "//div[@id='workbench_tabview:viewUploadedDms']//a[contains(@class, 'ui-dialog-titlebar-close')]"
-                )
-                safe_print("[AUTOMATION] Found modal close button using specific XPath!")
-            except:
-                # Fallback: By CSS selector
-                try:
-                    close_modal_button = driver.find_element(
-                        By.CSS_SELECTOR,
-                        "a.ui-dialog-titlebar-close"
-                    )
-                    safe_print("[AUTOMATION] Found modal close button using CSS selector!")
-                except:
-                    # Last resort: By aria-label
-                    close_modal_button = driver.find_element(
-                        By.XPATH,
-                        "//a[@aria-label='Close' and contains(@class, 'ui-dialog-titlebar-close')]"
-                    )
-                    safe_print("[AUTOMATION] Found modal close button using aria-label!")
-            
-            # Try regular click first (more reliable for UI interactions)
-            try:
-                safe_print("[AUTOMATION] Attempting regular click on close button...")
-                # Scroll into view first
-                driver.execute_script("arguments[0].scrollIntoView({block: 'center'});", close_modal_button)
-                time.sleep(0.5)
-                
-                # Wait for element to be clickable
-                WebDriverWait(driver, 5).until(
-                    EC.element_to_be_clickable(close_modal_button)
-                )
-                
-                # Regular click
-                close_modal_button.click()
-                safe_print("[SUCCESS] ✅ Clicked modal close button with regular click!")
-            except Exception as e:
-                safe_print(f"[WARNING] Regular click failed: {str(e)[:80]}, trying JavaScript click...")
-                # Fallback to JavaScript click
-                driver.execute_script("arguments[0].click();", close_modal_button)
-                safe_print("[SUCCESS] ✅ Clicked modal close button with JavaScript!")
-            
-            time.sleep(2)  # Wait for modal to close
-            
-        except TimeoutException:
-            safe_print("[ERROR] Modal close button not found within timeout")
-            return {
-                "success": False,
-                "message": "Modal close button not found.",
-                "status": "modal_close_not_found"
-            }
-        
-        # Step 10: Close the success message popup using close icon
-        safe_print("[AUTOMATION] Looking for success message popup close button...")
-        try:
-            # Wait for popup to appear (increased wait time)
-            safe_print("[AUTOMATION] Waiting for confirmation popup to appear...")
-            time.sleep(3)
-            
-            # Find the close icon (X) in the success dialog using "Confirmation" title as anchor
-            close_popup_button = None
-            try:
-                close_popup_button = WebDriverWait(driver, 15).until(
-                    EC.presence_of_element_located((
-                        By.XPATH,
-                        "//div[contains(@class, 'ui-dialog-titlebar')]//span[contains(text(), 'Confirmation')]/following-sibling::a[contains(@class, 'ui-dialog-titlebar-close')]"
-                    ))
-                )
-                safe_print("[AUTOMATION] Found success popup close icon!")
-            except:
-                # Fallback: try to find any visible dialog close button
-                close_popup_button = WebDriverWait(driver, 15).until(
-                    EC.presence_of_element_located((
-                        By.XPATH,
-                        "//div[contains(@class, 'ui-dialog') and contains(@style, 'display: block')]//a[contains(@class, 'ui-dialog-titlebar-close')]"
-                    ))
-                )
-                safe_print("[AUTOMATION] Found success popup close icon (fallback)!")
-            
-            # Element found but may be blocked by overlay - use JavaScript to click directly
-            # This bypasses overlay blocking issues
-            safe_print("[AUTOMATION] Clicking popup close button (bypassing overlays)...")
-            try:
-                # First, try to remove any blocking overlays
-                driver.execute_script("""
-                    // Hide all overlay elements that might block the click
-                    var overlays = document.querySelectorAll('.ui-widget-overlay, .ui-dialog-mask');
-                    overlays.forEach(function(overlay) {
-                        overlay.style.display = 'none';
-                    });
-                """)
-                time.sleep(0.3)
-                
-                # Now try regular click
-                close_popup_button.click()
-                safe_print("[SUCCESS] ✅ Clicked success popup close icon!")
-            except Exception as e:
-                safe_print(f"[WARNING] Regular click failed even after removing overlays: {str(e)[:50]}")
-                # Use JavaScript click that bypasses all interactability checks
-                safe_print("[AUTOMATION] Using direct JavaScript click...")
-                driver.execute_script("arguments[0].click();", close_popup_button)
-                safe_print("[SUCCESS] ✅ Clicked popup close with JavaScript!")
-            
-            time.sleep(2)  # Wait for popup to close and overlay to disappear
-            
-        except Exception as e:
-            safe_print(f"[ERROR] Could not find or click success popup close icon: {str(e)[:100]}")
-            return {
-                "success": False,
-                "message": "Could not close success message popup.",
-                "status": "popup_close_not_found"
-            }
-        
-        # Step 11: Click the Modify/View Documents button again
-        safe_print("[AUTOMATION] Clicking Modify/View Documents button again...")
-        try:
-            modify_view_button_2 = WebDriverWait(driver, 15).until(
-                EC.presence_of_element_located((
-                    By.ID,
-                    "workbench_tabview:idViewDoc"
-                ))
-            )
-            safe_print("[AUTOMATION] Found Modify/View Documents button again!")
-            
-            # Use JavaScript click to avoid interception issues
-            safe_print("[AUTOMATION] Using JavaScript click to avoid iframe interception...")
-            driver.execute_script("arguments[0].click();", modify_view_button_2)
-            
-            safe_print("[SUCCESS] ✅ Clicked Modify/View Documents button again!")
-            
-            time.sleep(3)  # Wait for the modal to open
-            
-        except TimeoutException:
-            safe_print("[ERROR] Modify/View Documents button not found on second attempt")
-            return {
-                "success": False,
-                "message": "Modify/View Documents button not found on second attempt.",
-                "status": "modify_button_2_not_found"
-            }
-        except WebDriverException as e:
-            safe_print(f"[ERROR] WebDriver error clicking Modify/View Documents button: {str(e)[:200]}")
-            return {
-                "success": False,
-                "message": f"Could not click Modify/View Documents button - it may be blocked by another element. Error: {str(e)[:100]}",
-                "status": "modify_button_2_click_error"
-            }
-        
-        # Step 12: Check all unchecked "approvedStatus" checkboxes in the document list
-        safe_print("[AUTOMATION] Looking for approvedStatus checkboxes...")
-        try:
-            # Wait for the modal and iframe to load
-            time.sleep(2)
-            
-            # The checkboxes are inside an iframe in the DMS modal
-            # First, find and switch to the iframe
-            safe_print("[AUTOMATION] Looking for DMS iframe...")
-            try:
-                # Wait for the iframe to be present
-                iframe = WebDriverWait(driver, 10).until(
-                    EC.presence_of_element_located((
-                        By.XPATH,
-                        "//iframe[contains(@src, 'dms-app/dealer-search-within-dms')]"
-                    ))
-                )
-                safe_print("[AUTOMATION] Found DMS iframe, switching to it...")
-                driver.switch_to.frame(iframe)
-                safe_print("[SUCCESS] ✅ Switched to iframe!")
-                time.sleep(1)  # Give iframe content time to load
-            except TimeoutException:
-                safe_print("[ERROR] Could not find DMS iframe")
-                raise
-            
-            # Now we're inside the iframe, wait for checkboxes
-            # Wait for Angular to initialize and checkboxes to appear
-            time.sleep(2)  # Give Angular time to render inside iframe
-            
-            # Wait for at least one checkbox with name starting with 'approvedStatus'
-            WebDriverWait(driver, 15).until(
-                EC.presence_of_element_located((
-                    By.XPATH,
-                    "//input[@type='checkbox' and starts-with(@name, 'approvedStatus')]"
-                ))
-            )
-            
-            # Additional wait for Angular to be ready
-            try:
-                driver.execute_script("return window.angular !== undefined;")
-            except:
-                pass
-            time.sleep(1)
-            
-            # Find all approvedStatus checkboxes (approvedStatus, approvedStatus2, approvedStatus3, etc.)
-            approved_checkboxes = driver.find_elements(
-                By.XPATH,
-                "//input[@type='checkbox' and starts-with(@name, 'approvedStatus')]"
-            )
-            
-            safe_print(f"[AUTOMATION] Found {len(approved_checkboxes)} total approvedStatus checkboxes")
-            
-            checked_count = 0
-            skipped_count = 0
-            
-            for i, checkbox in enumerate(approved_checkboxes):
-                try:
-                    # Get checkbox name for logging
-                    checkbox_name = checkbox.get_attribute("name") or f"checkbox_{i+1}"
-                    
-                    # Check if checkbox is disabled
-                    is_disabled = checkbox.get_attribute("disabled")
-                    
-                    # Check if checkbox is already checked (multiple ways for Angular)
-                    is_checked = checkbox.is_selected()  # Selenium's native method
-                    checked_attr = checkbox.get_attribute("checked")  # HTML attribute
-                    
-                    safe_print(f"[DEBUG] {checkbox_name}: disabled={is_disabled}, is_selected={is_checked}, checked_attr={checked_attr}")
-                    
-                    # Skip if disabled
-                    if is_disabled:
-                        safe_print(f"[INFO] {checkbox_name} is disabled, skipping")
-                        skipped_count += 1
-                        continue
-                    
-                    # Skip if already checked
-                    if is_checked or checked_attr:
-                        safe_print(f"[INFO] {checkbox_name} is already checked, skipping")
-                        skipped_count += 1
-                        continue
-                    
-                    # Checkbox is enabled and unchecked - click it!
-                    safe_print(f"[AUTOMATION] Clicking {checkbox_name}...")
-                    
-                    # Scroll checkbox into view
-                    driver.execute_script("arguments[0].scrollIntoView({block: 'center'});", checkbox)
-                    time.sleep(0.5)
-                    
-                    # Try clicking with JavaScript for Angular checkboxes
-                    try:
-                        # Use JavaScript click which works better with Angular
-                        driver.execute_script("arguments[0].click();", checkbox)
-                        checked_count += 1
-                        safe_print(f"[AUTOMATION] ✓ Checked {checkbox_name} ({checked_count} total)")
-                    except Exception as click_err:
-                        safe_print(f"[WARNING] JS click failed, trying regular click: {str(click_err)[:50]}")
-                        checkbox.click()
-                        checked_count += 1
-                        safe_print(f"[AUTOMATION] ✓ Checked {checkbox_name} ({checked_count} total)")
-                    
-                    time.sleep(0.7)  # Small delay for Angular to process
-                        
-                except Exception as e:
-                    safe_print(f"[WARNING] Could not process checkbox {i+1}: {str(e)[:100]}")
-            
-            safe_print(f"[SUCCESS] ✅ Checked {checked_count} checkboxes, skipped {skipped_count} (disabled or already checked)")
-            
-            # IMPORTANT: Switch back to default content (exit iframe)
-            driver.switch_to.default_content()
-            safe_print("[AUTOMATION] Switched back to default content from iframe")
-            
-            time.sleep(2)  # Wait after checking all
-            
-        except TimeoutException:
-            safe_print("[ERROR] ApprovedStatus checkboxes not found within timeout")
-            
-            # Make sure we're back to default content even if there's an error
-            try:
-                driver.switch_to.default_content()
-                safe_print("[AUTOMATION] Switched back to default content after error")
-            except:
-                pass
-            
-            # Try to get more diagnostic information
-            try:
-                page_source = driver.page_source
-                if 'approvedStatus' in page_source:
-                    safe_print("[DEBUG] Found 'approvedStatus' in page source, but elements not accessible")
-                else:
-                    safe_print("[DEBUG] 'approvedStatus' not found in page source at all")
-            except:
-                pass
-            
-            # Check if error page appeared with "Back to Home-Page" button
-            if check_for_back_to_home_page(driver):
-                safe_print("[AUTOMATION] Error page detected, returned to home page. Retrying...")
-                if retry_count < max_retries:
-                    return run_automation_internal(retry_count + 1, max_retries)
-            
-            return {
-                "success": False,
-                "message": "ApprovedStatus checkboxes not found. The page may not have loaded completely, or Angular is still initializing.",
-                "status": "checkboxes_not_found"
-            }
-        except Exception as e:
-            safe_print(f"[ERROR] Unexpected error while processing checkboxes: {str(e)[:200]}")
-            
-            # Make sure we're back to default content even if there's an error
-            try:
-                driver.switch_to.default_content()
-                safe_print("[AUTOMATION] Switched back to default content after exception")
-            except:
-                pass
-            
-            return {
-                "success": False,
-                "message": f"Error processing approvedStatus checkboxes: {str(e)[:100]}",
-                "status": "checkbox_processing_error"
-            }
-        
-        # Step 13: Close the DMS modal again
-        safe_print("[AUTOMATION] Closing the modal again...")
+    finally:
+        # IMPORTANT: Switch back to default content (exit iframe)
         try:
-            # Make sure we're in default content (not in iframe)
             driver.switch_to.default_content()
-            
-            # Wait for the modal to be present
-            WebDriverWait(driver, 10).until(
-                EC.presence_of_element_located((
-                    By.ID,
-                    "workbench_tabview:viewUploadedDms_title"
-                ))
-            )
-            time.sleep(1)  # Wait for modal animation to complete
-            
-            # Find the close button - target the one inside the DMS modal specifically
-            close_modal_button_2 = None
-            try:
-                # More specific selector - find close button within the viewUploadedDms dialog
-                close_modal_button_2 = driver.find_element(
-                    By.XPATH,
-                    "//div[@id='workbench_tabview:viewUploadedDms']//a[contains(@class, 'ui-dialog-titlebar-close')]"
-                )
-                safe_print("[AUTOMATION] Found modal close button using specific XPath!")
-            except:
-                # Fallback: By CSS selector
-                try:
-                    close_modal_button_2 = driver.find_element(
-                        By.CSS_SELECTOR,
-                        "a.ui-dialog-titlebar-close"
-                    )
-                    safe_print("[AUTOMATION] Found modal close button using CSS selector!")
-                except:
-                    # Last resort: By aria-label
-                    close_modal_button_2 = driver.find_element(
-                        By.XPATH,
-                        "//a[@aria-label='Close' and contains(@class, 'ui-dialog-titlebar-close')]"
-                    )
-                    safe_print("[AUTOMATION] Found modal close button using aria-label!")
-            
-            # Try regular click first (more reliable for UI interactions)
-            try:
-                safe_print("[AUTOMATION] Attempting regular click on close button...")
-                # Scroll into view first
-                driver.execute_script("arguments[0].scrollIntoView({block: 'center'});", close_modal_button_2)
-                time.sleep(0.5)
-                
-                # Wait for element to be clickable
-                WebDriverWait(driver, 5).until(
-                    EC.element_to_be_clickable(close_modal_button_2)
-                )
-                
-                # Regular click
-                close_modal_button_2.click()
-                safe_print("[SUCCESS] ✅ Clicked modal close button with regular click!")
-            except Exception as e:
-                safe_print(f"[WARNING] Regular click failed: {str(e)[:80]}, trying JavaScript click...")
-                # Fallback to JavaScript click
-                driver.execute_script("arguments[0].click();", close_modal_button_2)
-                safe_print("[SUCCESS] ✅ Clicked modal close button with JavaScript!")
-            
-            time.sleep(2)  # Wait for modal to close
-            
-        except TimeoutException:
-            safe_print("[ERROR] Modal close button not found on second attempt")
-            return {
-                "success": False,
-                "message": "Modal close button not found on second attempt.",
-                "status": "modal_close_2_not_found"
-            }
-        
-        # Step 14: Close the success message popup using close icon (again)
-        safe_print("[AUTOMATION] Looking for success message popup close button again...")
-        try:
-            # Wait for popup to appear (increased wait time)
-            safe_print("[AUTOMATION] Waiting for confirmation popup to appear...")
-            time.sleep(3)
-            
-            # Find the close icon (X) in the success dialog using "Confirmation" title as anchor
-            close_popup_button_2 = None
-            try:
-                close_popup_button_2 = WebDriverWait(driver, 15).until(
-                    EC.presence_of_element_located((
-                        By.XPATH,
-                        "//div[contains(@class, 'ui-dialog-titlebar')]//span[contains(text(), 'Confirmation')]/following-sibling::a[contains(@class, 'ui-dialog-titlebar-close')]"
-                    ))
-                )
-                safe_print("[AUTOMATION] Found success popup close icon!")
-            except:
-                # Fallback: try to find any visible dialog close button
-                close_popup_button_2 = WebDriverWait(driver, 15).until(
-                    EC.presence_of_element_located((
-                        By.XPATH,
-                        "//div[contains(@class, 'ui-dialog') and contains(@style, 'display: block')]//a[contains(@class, 'ui-dialog-titlebar-close')]"
-                    ))
-                )
-                safe_print("[AUTOMATION] Found success popup close icon (fallback)!")
-            
-            # Element found but may be blocked by overlay - use JavaScript to click directly
-            # This bypasses overlay blocking issues
-            safe_print("[AUTOMATION] Clicking popup close button (bypassing overlays)...")
-            try:
-                # First, try to remove any blocking overlays
-                driver.execute_script("""
-                    // Hide all overlay elements that might block the click
-                    var overlays = document.querySelectorAll('.ui-widget-overlay, .ui-dialog-mask');
-                    overlays.forEach(function(overlay) {
-                        overlay.style.display = 'none';
-                    });
-                """)
-                time.sleep(0.3)
-                
-                # Now try regular click
-                close_popup_button_2.click()
-                safe_print("[SUCCESS] ✅ Clicked success popup close icon!")
-            except Exception as e:
-                safe_print(f"[WARNING] Regular click failed even after removing overlays: {str(e)[:50]}")
-                # Use JavaScript click that bypasses all interactability checks
-                safe_print("[AUTOMATION] Using direct JavaScript click...")
-                driver.execute_script("arguments[0].click();", close_popup_button_2)
-                safe_print("[SUCCESS] ✅ Clicked popup close with JavaScript!")
-            
-            time.sleep(2)  # Wait for popup to close and overlay to disappear
-            
-        except Exception as e:
-            safe_print(f"[ERROR] Could not find or click success popup close icon: {str(e)[:100]}")
-            return {
-                "success": False,
-                "message": "Could not close success message popup on second attempt.",
-                "status": "popup_close_not_found"
-            }
+        except Exception:
+            pass
+
+
+def step_save_options(driver, step, context):
+    safe_print("[AUTOMATION] Looking for the Save-Options dropdown button...")
+    step.click(driver)
+    safe_print("[SUCCESS] ✅ Clicked Save-Options button!")
+
+
+def step_file_movement(driver, step, context):
+    safe_print("[AUTOMATION] Looking for File Movement option in dropdown...")
+    step.click(driver)
+    safe_print("[SUCCESS] ✅ Clicked File Movement option!")
+
+
+def step_file_movement_modal(driver, step, context):
+    safe_print("[AUTOMATION] Waiting for File Movement modal to open...")
+    step.find(driver)
+    safe_print("[SUCCESS] ✅ File Movement modal opened successfully!")
+
+
+def step_proceed_to_next_seat(driver, step, context):
+    safe_print("[AUTOMATION] Looking for 'Proceed to Next Seat' radio button...")
+    proceed_label, _ = step.find(driver)
+    # The actual input is hidden inside ui-helper-hidden-accessible, so click the visible box
+    radio_button_id = proceed_label.get_attribute('for')
+    safe_print(f"[AUTOMATION] Radio button ID: {radio_button_id}")
+    radio_button_box = wait_for_element(driver, (
+        By.XPATH,
+        f"//input[@id='{radio_button_id}']/ancestor::div[contains(@class, 'ui-radiobutton')]//div[contains(@class, 'ui-radiobutton-box')]"
+    ), timeout=step.timeout)
+
+    if 'ui-state-active' in (radio_button_box.get_attribute('class') or ''):
+        safe_print("[INFO] ℹ️ 'Proceed to Next Seat' radio button already selected")
+        return
+    radio_button_box.click()
+    safe_print("[SUCCESS] ✅ Selected 'Proceed to Next Seat' radio button!")
+    wait_for_idle(driver, AJAX_IDLE, timeout=5)  # Wait for any AJAX updates
+
+
+def step_save_file_movement(driver, step, context):
+    safe_print("[AUTOMATION] Looking for Save button in File Movement modal...")
+    _, locator = step.click(driver)
+    safe_print(f"[SUCCESS] ✅ Clicked Save button ({locator.label})!")
+
+
+def step_confirm_yes(driver, step, context):
+    safe_print("[AUTOMATION] Looking for 'Yes' button in confirmation dialog...")
+    hide_overlays(driver)
+    _, locator = step.click(driver)
+    safe_print(f"[SUCCESS] ✅ Clicked Yes button ({locator.label})!")
+
+
+def step_settle(driver, step, context):
+    """Nothing to click; the step only waits for its readiness condition"""
+
+
+def dms_modal_close_step(name, status, message):
+    return Step(
+        name, step_close_dms_modal,
+        locators=(
+            Locator(By.XPATH, "//div[@id='workbench_tabview:viewUploadedDms']//a[contains(@class, 'ui-dialog-titlebar-close')]",
+                    "specific XPath", clickable=False, timeout=0),
+            Locator(By.CSS_SELECTOR, "a.ui-dialog-titlebar-close", "CSS selector", clickable=False, timeout=0),
+            Locator(By.XPATH, "//a[@aria-label='Close' and contains(@class, 'ui-dialog-titlebar-close')]",
+                    "aria-label", clickable=False, timeout=0),
+        ),
+        ready=UI_SETTLED, timeout=10, status=status, message=message,
+    )
+
+
+def confirmation_close_step(name, message):
+    return Step(
+        name, step_close_confirmation,
+        locators=(
+            Locator(By.XPATH, "//div[contains(@class, 'ui-dialog-titlebar')]//span[contains(text(), 'Confirmation')]"
+                              "/following-sibling::a[contains(@class, 'ui-dialog-titlebar-close')]",
+                    "Confirmation title", clickable=False),
+            Locator(By.XPATH, VISIBLE_DIALOG_XPATH + "//a[contains(@class, 'ui-dialog-titlebar-close')]",
+                    "visible dialog", clickable=False, timeout=15),
+        ),
+        ready=UI_SETTLED, timeout=15, status="popup_close_not_found", message=message, catch_all=True,
+    )
+
+
+NEW_RC_APPROVAL_STEPS = [
+    # Fast path: back on the Pending Applications table after the previous item
+    Step("pending_table", step_pending_table, ready=AJAX_IDLE, timeout=10, optional=True),
+    # Leave an error page left over from a previous iteration
+    Step("home_page", step_home_page, optional=True, when=needs_navigation),
+    # Step 0.5: Alert popup can already be open on the home page
+    Step("alert_popup_home", step_alert_popup, ready=UI_SETTLED, timeout=5, optional=True, when=needs_navigation),
+    # Step 1: Dashboard Pendency
+    Step(
+        "dashboard_pendency", step_dashboard_pendency,
+        locators=(Locator(By.XPATH, "//button[@title='Dashboard Pendency']", "title"),),
+        timeout=10, status="button_not_found",
+        message="⚠️ Dashboard Pendency button not found. Please ensure you are logged in correctly. If you see a login page, please login and try again.",
+        recover=recover_to_home_page, retries=2, when=needs_navigation,
+    ),
+    # Step 1.5: Optional alert popup after Dashboard Pendency click
+    Step("alert_popup_dashboard", step_alert_popup, ready=PAGE_LOADED, timeout=15, optional=True, when=needs_navigation),
+    # Step 2: Dealer Registration
+    Step(
+        "dealer_registration", step_dealer_registration,
+        locators=(Locator(By.XPATH, "//td[.//label[contains(., 'Dealer Registration')]]"
+                                    "//span[@class='ui-treetable-toggler ui-icon ui-icon-triangle-1-e ui-c']", "toggler"),),
+        ready=UI_SETTLED, timeout=10, status="element_not_found",
+        message="Dealer Registration element not found. The page may not have loaded correctly.",
+        when=needs_navigation,
+    ),
+    # Step 3: New Registration (Dealer Side)
+    Step(
+        "new_registration", step_new_registration,
+        locators=(Locator(By.XPATH, "//label[contains(., 'New Registration (Dealer Side)')]"
+                                    "/preceding-sibling::span[@class='ui-treetable-toggler ui-icon ui-icon-triangle-1-e ui-c']", "toggler"),),
+        ready=UI_SETTLED, timeout=15, status="element_not_found",
+        message="New Registration (Dealer Side) element not found. The page may not have loaded correctly.",
+        when=needs_navigation,
+    ),
+    # Step 4: View Detail link beside NEW-RC-APPROVAL
+    Step(
+        "view_detail", step_view_detail,
+        locators=(Locator(By.XPATH, "//tr[.//label[contains(., 'NEW-RC-APPROVAL')]]//td[@role='gridcell']"
+                                    "//a[contains(@class, 'ui-commandlink')]", "commandlink"),),
+        ready=UI_SETTLED, timeout=10, status="element_not_found",
+        message="NEW-RC-APPROVAL View Detail link not found. The page may not have loaded correctly.",
+        when=needs_navigation,
+    ),
+    # Step 5: First Approve button in the Pending Applications table
+    Step(
+        "approve", step_approve,
+        ready=SERVER_LOADED, timeout=15, status="table_not_found",
+        message="Pending Applications table or Approve button not found. The page may not have loaded correctly.",
+    ),
+    # Step 5.5: Optional VLTD (Vehicle Location Tracking Device) popup
+    Step(
+        "vltd_popup", step_vltd_popup,
+        locators=(
+            Locator(By.ID, "j_idt124", "ID", timeout=3),
+            Locator(By.XPATH, VISIBLE_DIALOG_XPATH + "//button[contains(@class, 'ui-button') and .//span[text()='OK']]",
+                    "text", timeout=3),
+            Locator(By.ID, "j_idt124", "JavaScript", clickable=False, timeout=0, js_click=True),
+            Locator(By.XPATH, "//button[.//span[contains(@class, 'ui-icon-check')] and .//span[text()='OK']]",
+                    "icon+text", clickable=False, timeout=0, js_click=True),
+        ),
+        ready=PAGE_SETTLED, timeout=15, optional=True,
+    ),
+    # Step 6: Verification checkbox (only if unchecked)
+    Step(
+        "verification_checkbox", step_verification_checkbox,
+        locators=(Locator(By.ID, "workbench_tabview:verifyCheckValue", "ID", clickable=False),),
+        ready=UI_SETTLED, timeout=15, status="checkbox_not_found",
+        message="Verification checkbox not found. The approval page may not have loaded correctly.",
+    ),
+    # Step 7: "Documents Uploaded" tab (6th tab, data-index="5")
+    Step(
+        "documents_tab", step_documents_tab,
+        locators=(Locator(By.XPATH, "//ul[contains(@class, 'ui-tabs-nav')]//li[@data-index='5']"
+                                    "//a[contains(text(), 'Documents Uploaded')]", "tab"),),
+        ready=AJAX_IDLE, timeout=10, status="tab_not_found",
+        message="Documents Uploaded tab not found. The page may not have loaded correctly.",
+    ),
+    # Step 8: "Modify/View Documents" button
+    Step(
+        "open_documents", step_open_documents,
+        locators=(Locator(By.ID, "workbench_tabview:idViewDoc", "ID"),),
+        ready=SERVER_SETTLED, timeout=15, status="modify_button_not_found",
+        message="Modify/View Documents button not found. The Documents Uploaded tab content may not have loaded correctly.",
+    ),
+    # Step 9: Close the DMS modal
+    dms_modal_close_step("close_dms_modal", "modal_close_not_found", "Modal close button not found."),
+    # Step 10: Close the success message popup
+    confirmation_close_step("close_confirmation", "Could not close success message popup."),
+    # Step 11: Modify/View Documents again
+    Step(
+        "reopen_documents", step_reopen_documents,
+        locators=(Locator(By.ID, "workbench_tabview:idViewDoc", "JavaScript", clickable=False, js_click=True),),
+        ready=UI_CLEAR, timeout=15, status="modify_button_2_not_found",
+        message="Modify/View Documents button not found on second attempt.",
+    ),
+    # Step 12: Check all unchecked "approvedStatus" checkboxes inside the DMS iframe
+    Step(
+        "approve_documents", step_approve_documents,
+        locators=(Locator(By.XPATH, "//iframe[contains(@src, 'dms-app/dealer-search-within-dms')]", "DMS iframe", clickable=False),),
+        ready=UI_SETTLED, timeout=10, status="checkboxes_not_found",
+        message="ApprovedStatus checkboxes not found. The page may not have loaded completely, or Angular is still initializing.",
+        recover=recover_to_home_page, retries=1, restart=True,
+    ),
+    # Step 13: Close the DMS modal again
+    dms_modal_close_step("close_dms_modal_again", "modal_close_2_not_found", "Modal close button not found on second attempt."),
+    # Step 14: Close the success message popup again
+    confirmation_close_step("close_confirmation_again", "Could not close success message popup on second attempt."),
+    # Step 15: "Save-Options" dropdown button
+    Step(
+        "save_options", step_save_options,
+        locators=(Locator(By.XPATH, "//button[.//span[contains(text(), 'Save-Options')]]", "text"),),
+        ready=UI_CLEAR, timeout=15, status="save_options_not_found", message="Save-Options button not found.",
+    ),
+    # Step 16: "File Movement" from the dropdown menu
+    Step(
+        "file_movement", step_file_movement,
+        locators=(Locator(By.XPATH, "//a[.//span[contains(text(), 'File Movement')]]", "text"),),
+        ready=UI_SETTLED, timeout=10, status="file_movement_not_found", message="File Movement option not found in dropdown.",
+    ),
+    # Step 17: File Movement modal (structure varies, so only warn when it is not detected)
+    Step(
+        "file_movement_modal", step_file_movement_modal,
+        locators=(Locator(By.XPATH, VISIBLE_DIALOG_XPATH + " | //div[@id='panelAppDisapp' and contains(@style, 'display: block')]",
+                          "visible dialog", clickable=False),),
+        ready=UI_SETTLED, timeout=10, optional=True,
+    ),
+    # Step 18: "Proceed to Next Seat" radio button
+    Step(
+        "proceed_to_next_seat", step_proceed_to_next_seat,
+        locators=(Locator(By.XPATH, "//label[contains(text(), 'Proceed to Next Seat')]", "label", clickable=False),),
+        ready=UI_SETTLED, timeout=10, status="element_not_found",
+        message="Could not find 'Proceed to Next Seat' radio button in File Movement modal",
+    ),
+    # Step 19: Save button in the File Movement modal
+    Step(
+        "save_file_movement", step_save_file_movement,
+        locators=(
+            Locator(By.XPATH, VISIBLE_DIALOG_XPATH + "//a[contains(@class, 'ui-commandlink') and contains(text(), 'Save')]",
+                    "text in visible modal", timeout=5),
+            Locator(By.ID, "app_disapp_form:j_idt1949", "ID", timeout=5),
+            Locator(By.XPATH, "//a[contains(@class, 'ui-commandlink') and contains(text(), 'Save')]",
+                    "JavaScript", clickable=False, timeout=0, js_click=True),
+            Locator(By.XPATH, "//a[contains(@class, 'ui-commandlink') and contains(@data-pfconfirmcommand, 'PF')]",
+                    "data attributes", timeout=5, js_click=True),
+        ),
+        ready=AJAX_IDLE, timeout=5, status="element_not_found",
+        message="Could not find Save button in File Movement modal",
+    ),
+    # Step 20: "Yes" in the confirmation dialog
+    Step(
+        "confirm_yes", step_confirm_yes,
+        locators=(
+            Locator(By.XPATH, "//button[contains(@class, 'ui-confirmdialog-yes')]", "class", timeout=10),
+            Locator(By.XPATH, "//button[contains(@class, 'ui-button')]//span[contains(text(), 'Yes')]", "text", timeout=5),
+            Locator(By.XPATH, "//button[contains(@id, 'app_disapp_form:j_idt') and contains(@class, 'ui-confirmdialog-yes')]",
+                    "ID pattern", clickable=False, timeout=5, js_click=True),
+        ),
+        ready=SERVER_SETTLED, timeout=15, status="element_not_found",
+        message="Could not find Yes button in confirmation dialog",
+    ),
+    # Wait for the confirmation to be processed before the next item
+    Step("confirmation_processed", step_settle, ready=SERVER_LOADED, timeout=15),
+]
+
+# Elements the step actions look up themselves, all required; checked by dom_snapshots.validate_fixture
+ACTION_LOCATORS = {
+    "approve": (
+        Locator(By.ID, "workDetails", "pending table"),
+        Locator(By.XPATH, APPROVE_BUTTON_XPATH.format(row=0), "first Approve button"),
+    ),
+    "close_dms_modal": (Locator(By.ID, "workbench_tabview:viewUploadedDms_title", "DMS modal title"),),
+    "close_dms_modal_again": (Locator(By.ID, "workbench_tabview:viewUploadedDms_title", "DMS modal title"),),
+}
+
+# Elements looked up inside the DMS iframe
+FRAME_LOCATORS = {
+    "approve_documents": (Locator(By.XPATH, APPROVED_STATUS_XPATH, "approvedStatus checkboxes"),),
+}
+
+# Recorded data cells stay readable only where a locator matches their text
+dom_recorder.keep_texts = locator_texts(NEW_RC_APPROVAL_STEPS, ACTION_LOCATORS, FRAME_LOCATORS)
+
+
+def progress_listener(progress, worker_id):
+    """Adapt a job's emit(event, data) to one worker, or None without a job"""
+    if progress is None:
+        return None
+    return lambda event, data: progress.emit(event, dict(data, worker_id=worker_id))
+
+
+def journaling_listener(context, worker_id, listener=None):
+    """Record every completed step of a claimed application in the checkpoint journal"""
+    def on_event(event, data):
+        if event == "step_finished" and data["outcome"] in ("ok", "skipped") and context.get("application_no"):
+            checkpoint_journal.record_step(worker_id, context["application_no"], data["step"])
+        if listener:
+            listener(event, data)
+    return on_event
+
+
+def resume_checkpoint(driver, worker_id, context):
+    """
+    Look for an application this worker left mid-workflow (backend or Chrome
+    restart). Returns the step to resume after when the browser still shows
+    that application and its lease can be taken again, otherwise None.
+    """
+    checkpoint = checkpoint_journal.open_checkpoint(worker_id)
+    if not checkpoint:
+        return None
+    
+    application_no = checkpoint["application_no"]
+    safe_print(f"[RESUME] Worker {worker_id} has unfinished application {application_no} (last step: {checkpoint['step']})")
+    try:
+        on_page = driver.execute_script(
+            "return !!document.body && document.body.innerText.indexOf(arguments[0]) >= 0;", application_no
+        )
+    except Exception as e:
+        safe_print(f"[RESUME] Could not inspect the current page: {str(e)[:80]}")
+        on_page = False
+    
+    if on_page and lease_store.claim_first([application_no], worker_id) == application_no:
+        safe_print(f"[RESUME] ⏩ Resuming {application_no} after step '{checkpoint['step']}'")
+        context["application_no"] = application_no
+        context["resumed_after"] = checkpoint["step"]
+        return checkpoint["step"]
+    
+    # The page was lost with the browser; the application is still pending and is taken from the table again
+    safe_print(f"[RESUME] {application_no} is no longer open in the browser, starting over from the dashboard")
+    checkpoint_journal.close(worker_id, application_no, "abandoned")
+    return None
+
+
+def run_automation_internal(driver=None, retry_count=0, max_retries=2, worker_id=0, row_index=0, progress=None,
+                            worker_count=1):
+    """
+    Runs the NEW-RC-APPROVAL pipeline once on `driver` (default: the primary
+    browser) and returns the result dict. `progress` (an AutomationJob)
+    receives step events and can pause or cancel the run between steps.
+    An application interrupted by a crash is resumed from its next step.
+    After an error page the workflow restarts from the home page, up to
+    max_retries times. worker_count is the number of browsers sharing the queue.
+    """
+    driver = driver or driver_instance
+    while True:
+        result = run_workflow_once(driver, retry_count, worker_id, row_index, progress, worker_count)
+        if not result.get("restart") or retry_count >= max_retries:
+            break
+        retry_count += 1
+        safe_print("[AUTOMATION] Error page detected, returned to home page. Retrying...")
+
+    if result.get("status") == "button_not_found":
+        result["action_required"] = "login"
+    if result.get("success"):
+        result["message"] = (
+            "Automation completed successfully! All steps executed: Dashboard Pendency → Dealer Registration → "
+            "New Registration (Dealer Side) → NEW-RC-APPROVAL View Detail → First Approve Button → Verification Checkbox → "
+            "Documents Uploaded Tab → Modify/View Documents → Close Modal → OK → Modify/View Documents Again → "
+            "Check All Approved Checkboxes → Close Modal → OK → Save-Options → File Movement → Modal Opened → "
+            "Proceed to Next Seat Selected → Save Clicked → Yes Confirmed."
+        )
+        result["status"] = "completed"
+    return result
+
+
+def run_workflow_once(driver, retry_count, worker_id, row_index, progress, worker_count=1):
+    """One pass of the pipeline plus its lease, journal, ledger and timing bookkeeping"""
+    started_at = time.time()
+    context = {"retry_count": retry_count, "worker_id": worker_id, "row_index": row_index, "worker_count": worker_count}
+    start_after = resume_checkpoint(driver, worker_id, context) if retry_count == 0 else None
+    listener = journaling_listener(context, worker_id, progress_listener(progress, worker_id))
+    on_ready = dom_recorder.on_ready(driver, context, worker_id) if dom_recording_enabled() else None
+    result = run_pipeline(
+        driver, NEW_RC_APPROVAL_STEPS, context,
+        listener=listener, control=progress, start_after=start_after, on_ready=on_ready,
+    )
+    if on_ready:
+        dom_recorder.finish(context, worker_id, result)
+
+    locator_stats.save()
+
+    application_no = context.get("application_no")
+    if application_no:
+        # Done applications stay claimed; failed ones go back to the pool for a retry
+        lease_store.release(application_no, worker_id, done=bool(result.get("success")))
+        result["application_no"] = application_no
+        # A cancelled application stays open in the journal so the next run resumes it
+        if result.get("status") != "cancelled":
+            checkpoint_journal.close(worker_id, application_no, "completed" if result.get("success") else "failed")
+    if start_after:
+        result["resumed_after"] = start_after
+    if result.get("status") not in NO_WORK_STATUSES:
+        processed_ledger.record(
+            application_no, worker_id, started_at, result, job_id=getattr(progress, "job_id", None)
+        )
+    if context.get("documents_report") is not None:
+        result["documents"] = context["documents_report"]
+
+    safe_print("[TIMING] Per-step timings:")
+    for line in format_step_timings(result.get("step_timings", [])):
+        safe_print(f"[TIMING]   {line}")
+    metrics.observe_step_timings(result.get("step_timings", []))
+    return result
+
+
+def process_queue(driver, worker_id=0, row_index=0, progress=None, worker_count=1):
+    """
+    Approve applications with one browser until the queue is empty or a
+    failure class exhausts its retries (see retry_policy). row_index selects
+    which row of the pending table this worker takes, so pool workers don't
+    click the same button; worker_count is the number of browsers in the run.
+    When every pending row is leased by another worker it waits and reloads
+    the table rather than treating the queue as empty. While the circuit breaker is open the worker
+    waits, and resumes only after a probe request finds Vahan healthy; it
+    stops when the probe lands on the login page or the breaker gives up.
+    """
+    tag = f"[AUTOMATION][W{worker_id}]"
+    emit = progress_listener(progress, worker_id) or (lambda event, data: None)
+    safe_print(f"{tag} 🔄 Starting infinite automation loop...")
+    safe_print(f"{tag} Will continue processing until no more approve buttons are found...")
+    
+    processed_count = 0
+    retry_policy = RetryPolicy()
+    
+    while True:
+        # Drain and cancel requests are honoured between items
+        if progress is not None and progress.stop_requested():
+            return stopped_queue_result(progress, tag, processed_count, worker_id)
         
-        # Step 15: Click the "Save-Options" dropdown button
-        safe_print("[AUTOMATION] Looking for the Save-Options dropdown button...")
-        try:
-            # Find by button text "Save-Options" instead of dynamic ID
-            save_options_button = WebDriverWait(driver, 15).until(
-                EC.element_to_be_clickable((
-                    By.XPATH,
-                    "//button[.//span[contains(text(), 'Save-Options')]]"
-                ))
-            )
-            safe_print("[AUTOMATION] Found Save-Options button!")
-            save_options_button.click()
-            safe_print("[SUCCESS] ✅ Clicked Save-Options button!")
-            
-            time.sleep(2)  # Wait for dropdown to open
-            
-        except TimeoutException:
-            safe_print("[ERROR] Save-Options button not found within timeout")
+        action, wait = circuit_breaker.before_attempt(worker_id)
+        if action == "stop":
+            safe_print(f"{tag} ⚠️ STOPPING - Vahan did not recover. Total items processed: {processed_count}")
             return {
                 "success": False,
-                "message": "Save-Options button not found.",
-                "status": "save_options_not_found"
+                "message": f"⚠️ Automation stopped: Vahan kept showing its error page and did not recover. Processed {processed_count} item(s) before the outage.",
+                "status": "vahan_unavailable",
+                "processed_count": processed_count,
+                "worker_id": worker_id
             }
+        if action == "wait":
+            safe_print(f"{tag} ⏸️ Vahan is returning error pages, waiting {wait:.0f}s before checking again...")
+            pause_worker(progress, min(wait, CIRCUIT_POLL_INTERVAL))
+            continue
+        if action == "probe":
+            # One GET of the home page decides whether a trial item may run
+            healthy, detail = probe_site(driver, VAHAN_HOME_PATH)
+            safe_print(f"{tag} 🔌 Circuit breaker probe: {detail}")
+            if detail == SESSION_EXPIRED:
+                # Says nothing about Vahan itself; another worker's browser takes over the probing
+                circuit_breaker.record_inconclusive(worker_id)
+                record_session_health(worker_id, False)
+                safe_print(f"{tag} ⚠️ STOPPING - Logged out of Vahan. Total items processed: {processed_count}")
+                return {
+                    "success": False,
+                    "message": f"⚠️ Automation stopped: the Vahan session expired. Please login again. Processed {processed_count} item(s).",
+                    "status": "session_expired",
+                    "action_required": "login",
+                    "processed_count": processed_count,
+                    "worker_id": worker_id
+                }
+            circuit_breaker.probe_result(healthy)
+            if not healthy:
+                continue
         
-        # Step 16: Click "File Movement" from the dropdown menu
-        safe_print("[AUTOMATION] Looking for File Movement option in dropdown...")
-        try:
-            # Find by text "File Movement" instead of dynamic ID
-            file_movement_link = WebDriverWait(driver, 10).until(
-                EC.element_to_be_clickable((
-                    By.XPATH,
-                    "//a[.//span[contains(text(), 'File Movement')]]"
-                ))
-            )
-            safe_print("[AUTOMATION] Found File Movement option!")
-            file_movement_link.click()
-            safe_print("[SUCCESS] ✅ Clicked File Movement option!")
-            
-            time.sleep(3)  # Wait for modal to open
-            
-        except TimeoutException:
-            safe_print("[ERROR] File Movement option not found within timeout")
-            return {
-                "success": False,
-                "message": "File Movement option not found in dropdown.",
-                "status": "file_movement_not_found"
-            }
+        safe_print(f"\n{'='*60}")
+        safe_print(f"{tag} 🔄 LOOP ITERATION {processed_count + 1}")
+        safe_print(f"{'='*60}\n")
         
-        # Step 17: Wait for the File Movement modal to open successfully
-        safe_print("[AUTOMATION] Waiting for File Movement modal to open...")
-        try:
-            # Wait for the modal dialog to appear
-            # Try to find a modal dialog or panel that appears after clicking File Movement
-            WebDriverWait(driver, 10).until(
-                EC.presence_of_element_located((
-                    By.XPATH,
-                    "//div[contains(@class, 'ui-dialog') and contains(@style, 'display: block')] | //div[@id='panelAppDisapp' and contains(@style, 'display: block')]"
-                ))
-            )
-            safe_print("[SUCCESS] ✅ File Movement modal opened successfully!")
-            
-            time.sleep(1)  # Small wait to ensure modal is fully loaded
-            
-        except TimeoutException:
-            safe_print("[WARNING] Could not detect File Movement modal, but proceeding...")
-            # Don't fail here, just warn - the modal might have a different structure
+        # Run one iteration of automation
+        result = run_automation_internal(
+            driver, retry_count=0, max_retries=2, worker_id=worker_id, row_index=row_index, progress=progress,
+            worker_count=worker_count
+        )
         
-        # Step 18: Select the "Proceed to Next Seat" radio button
-        safe_print("[AUTOMATION] Looking for 'Proceed to Next Seat' radio button...")
-        try:
-            # Wait for modal content to be fully loaded
-            time.sleep(1)
-            
-            # Find the radio button by its associated label "Proceed to Next Seat"
-            # The actual input is hidden, so we need to click the visible UI element
-            proceed_label = WebDriverWait(driver, 10).until(
-                EC.presence_of_element_located((
-                    By.XPATH,
-                    "//label[contains(text(), 'Proceed to Next Seat')]"
-                ))
-            )
-            safe_print("[AUTOMATION] Found 'Proceed to Next Seat' label")
-            
-            # Get the radio button ID from the label's 'for' attribute
-            radio_button_id = proceed_label.get_attribute('for')
-            safe_print(f"[AUTOMATION] Radio button ID: {radio_button_id}")
-            
-            # The actual input element is hidden inside ui-helper-hidden-accessible
-            # We need to click the visible ui-radiobutton-box div instead
-            # Find the radio button box that corresponds to this input
-            radio_button_box = WebDriverWait(driver, 10).until(
-                EC.element_to_be_clickable((
-                    By.XPATH,
-                    f"//input[@id='{radio_button_id}']/ancestor::div[contains(@class, 'ui-radiobutton')]//div[contains(@class, 'ui-radiobutton-box')]"
-                ))
-            )
-            
-            # Check if already selected (will have ui-state-active class)
-            box_classes = radio_button_box.get_attribute('class')
-            if 'ui-state-active' not in box_classes:
-                safe_print("[AUTOMATION] Radio button not selected, clicking the UI box...")
-                radio_button_box.click()
-                safe_print("[SUCCESS] ✅ Selected 'Proceed to Next Seat' radio button!")
-                time.sleep(1)  # Wait for any AJAX updates
-            else:
-                safe_print("[INFO] ℹ️ 'Proceed to Next Seat' radio button already selected")
-            
-        except TimeoutException:
-            safe_print("[ERROR] 'Proceed to Next Seat' radio button not found")
-            return {
-                "success": False,
-                "message": "Could not find 'Proceed to Next Seat' radio button in File Movement modal",
-                "status": "element_not_found"
-            }
-        except Exception as e:
-            safe_print(f"[ERROR] Error selecting radio button: {str(e)[:100]}")
-            return {
-                "success": False,
-                "message": f"Error selecting radio button: {str(e)}",
-                "status": "error"
-            }
+        # Check the result
+        if result.get("status") == "cancelled":
+            return stopped_queue_result(progress, tag, processed_count, worker_id)
         
-        # Step 19: Click the Save button in the File Movement modal
-        safe_print("[AUTOMATION] Looking for Save button in File Movement modal...")
-        try:
-            # Multiple strategies to find and click the Save button
-            save_clicked = False
-            
-            # Strategy 1: Try to find by text content within the modal
-            try:
-                save_button = WebDriverWait(driver, 5).until(
-                    EC.element_to_be_clickable((
-                        By.XPATH,
-                        "//div[contains(@class, 'ui-dialog') and contains(@style, 'display: block')]//a[contains(@class, 'ui-commandlink') and contains(text(), 'Save')]"
-                    ))
-                )
-                safe_print("[AUTOMATION] Found Save button (Strategy 1: text in visible modal)")
-                save_button.click()
-                save_clicked = True
-                safe_print("[SUCCESS] ✅ Clicked Save button!")
-            except:
-                safe_print("[AUTOMATION] Strategy 1 failed, trying Strategy 2...")
-            
-            # Strategy 2: Try to find by ID (from the HTML: app_disapp_form:j_idt1949)
-            if not save_clicked:
-                try:
-                    save_button = WebDriverWait(driver, 5).until(
-                        EC.element_to_be_clickable((By.ID, "app_disapp_form:j_idt1949"))
-                    )
-                    safe_print("[AUTOMATION] Found Save button (Strategy 2: by ID)")
-                    save_button.click()
-                    save_clicked = True
-                    safe_print("[SUCCESS] ✅ Clicked Save button!")
-                except:
-                    safe_print("[AUTOMATION] Strategy 2 failed, trying Strategy 3...")
-            
-            # Strategy 3: Try JavaScript click if normal click fails
-            if not save_clicked:
-                try:
-                    save_button = driver.find_element(
-                        By.XPATH,
-                        "//a[contains(@class, 'ui-commandlink') and contains(text(), 'Save')]"
-                    )
-                    safe_print("[AUTOMATION] Found Save button, trying JavaScript click (Strategy 3)")
-                    driver.execute_script("arguments[0].click();", save_button)
-                    save_clicked = True
-                    safe_print("[SUCCESS] ✅ Clicked Save button using JavaScript!")
-                except:
-                    safe_print("[AUTOMATION] Strategy 3 failed, trying Strategy 4...")
-            
-            # Strategy 4: Find by class and data attributes
-            if not save_clicked:
-                try:
-                    save_button = WebDriverWait(driver, 5).until(
-                        EC.element_to_be_clickable((
-                            By.XPATH,
-                            "//a[contains(@class, 'ui-commandlink') and contains(@data-pfconfirmcommand, 'PF')]"
-                        ))
-                    )
-                    safe_print("[AUTOMATION] Found Save button (Strategy 4: by data attributes)")
-                    driver.execute_script("arguments[0].click();", save_button)
-                    save_clicked = True
-                    safe_print("[SUCCESS] ✅ Clicked Save button using JavaScript!")
-                except:
-                    pass
-            
-            if not save_clicked:
-                raise Exception("All strategies to click Save button failed")
+        if result.get("success"):
+            processed_count += 1
+            retry_policy.on_success()
+            circuit_breaker.record_success()
+            metrics.items_processed.inc()
+            emit("item_approved", {"application_no": result.get("application_no"), "processed": processed_count})
+            safe_print(f"[SUCCESS] ✅ Worker {worker_id} successfully processed item {processed_count}")
+            safe_print(f"{tag} 🔄 Continuing to next item...")
+            
+        elif result.get("status") == "all_rows_leased":
+            # Not an error and not the end of the queue: the other workers' items leave the table as they finish
+            circuit_breaker.record_inconclusive(worker_id)
+            stale_pending_tables.add(worker_id)
+            safe_print(f"{tag} ⏳ Every pending row is held by another worker, checking again in {LEASED_ROWS_WAIT}s...")
+            pause_worker(progress, LEASED_ROWS_WAIT)
+            
+        elif result.get("status") == "application_numbers_unreadable":
+            safe_print(f"{tag} ⚠️ STOPPING - {result.get('message')}")
+            result.update(processed_count=processed_count, worker_id=worker_id)
+            return result
             
-            time.sleep(2)  # Wait for save action to process
+        elif result.get("status") == "no_approve_button":
+            # No more approve buttons found - this is the SUCCESS exit condition
+            circuit_breaker.record_success()
+            safe_print(f"\n{'='*60}")
+            emit("queue_empty", {"processed": processed_count})
+            safe_print(f"{tag} 🎉 ALL ITEMS PROCESSED!")
+            safe_print(f"{tag} Total items processed: {processed_count}")
+            safe_print(f"{'='*60}\n")
             
-        except TimeoutException:
-            safe_print("[ERROR] Save button not found in File Movement modal")
-            return {
-                "success": False,
-                "message": "Could not find Save button in File Movement modal",
-                "status": "element_not_found"
-            }
-        except Exception as e:
-            safe_print(f"[ERROR] Error clicking Save button: {str(e)[:100]}")
             return {
-                "success": False,
-                "message": f"Error clicking Save button: {str(e)}",
-                "status": "error"
+                "success": True,
+                "message": f"✅ Automation completed successfully! Processed {processed_count} item(s). No more pending approvals found.",
+                "status": "completed",
+                "processed_count": processed_count,
+                "worker_id": worker_id
             }
-        
-        # Step 20: Click "Yes" in the confirmation dialog
-        safe_print("[AUTOMATION] Looking for 'Yes' button in confirmation dialog...")
-        try:
-            # Wait for the confirmation dialog to appear
-            time.sleep(1)
-            
-            # Multiple strategies to find and click the Yes button
-            yes_clicked = False
             
-            # Strategy 1: Find by the class "ui-confirmdialog-yes"
-            try:
-                yes_button = WebDriverWait(driver, 10).until(
-                    EC.element_to_be_clickable((
-                        By.XPATH,
-                        "//button[contains(@class, 'ui-confirmdialog-yes')]"
-                    ))
-                )
-                safe_print("[AUTOMATION] Found Yes button (Strategy 1: by class)")
-                
-                # First, try to remove any blocking overlays
-                driver.execute_script("""
-                    // Hide all overlay elements that might block the click
-                    var overlays = document.querySelectorAll('.ui-widget-overlay, .ui-dialog-mask');
-                    overlays.forEach(function(overlay) {
-                        overlay.style.display = 'none';
-                    });
-                """)
-                time.sleep(0.3)
+        else:
+            # An error occurred; its class decides how long to wait and how often to retry
+            error_class = classify_result(result)
+            if error_class == OTHER and check_for_error_page(driver):
+                error_class = ERROR_PAGE
+            # The breaker counts items that ended on an error page, not the restarts within one item
+            if error_class != ERROR_PAGE:
+                circuit_breaker.record_inconclusive(worker_id)
+            elif circuit_breaker.record_failure():
+                metrics.circuit_opened.inc()
+                safe_print(f"{tag} ⏸️ Repeated error pages, pausing all workers until Vahan recovers")
+            decision = retry_policy.on_failure(error_class)
+            metrics.automation_errors.inc(status=result.get("status", "error"))
+            emit("item_failed", {"status": result.get("status", "error"), "message": result.get("message"), "error_class": error_class})
+            safe_print(f"[ERROR] ❌ Worker {worker_id} error in iteration {processed_count + 1}: {result.get('message')}")
+            safe_print(f"[ERROR] Consecutive {decision.scope} errors: {decision.attempt}/{decision.max_attempts}")
+            
+            if not decision.retry:
+                # Too many consecutive errors, stop the loop
+                safe_print(f"\n{'='*60}")
+                safe_print(f"{tag} ⚠️ STOPPING - Too many consecutive errors")
+                safe_print(f"{tag} Total items processed: {processed_count}")
+                safe_print(f"{'='*60}\n")
                 
-                yes_button.click()
-                yes_clicked = True
-                safe_print("[SUCCESS] ✅ Clicked Yes button!")
-            except Exception as e:
-                safe_print(f"[AUTOMATION] Strategy 1 failed: {str(e)[:50]}, trying Strategy 2...")
-            
-            # Strategy 2: Find by button text "Yes"
-            if not yes_clicked:
-                try:
-                    yes_button = WebDriverWait(driver, 5).until(
-                        EC.element_to_be_clickable((
-                            By.XPATH,
-                            "//button[contains(@class, 'ui-button')]//span[contains(text(), 'Yes')]"
-                        ))
-                    )
-                    safe_print("[AUTOMATION] Found Yes button (Strategy 2: by text)")
-                    yes_button.click()
-                    yes_clicked = True
-                    safe_print("[SUCCESS] ✅ Clicked Yes button!")
-                except:
-                    safe_print("[AUTOMATION] Strategy 2 failed, trying Strategy 3...")
-            
-            # Strategy 3: Find by ID pattern (from HTML: app_disapp_form:j_idt1965)
-            if not yes_clicked:
-                try:
-                    yes_button = WebDriverWait(driver, 5).until(
-                        EC.presence_of_element_located((
-                            By.XPATH,
-                            "//button[contains(@id, 'app_disapp_form:j_idt') and contains(@class, 'ui-confirmdialog-yes')]"
-                        ))
-                    )
-                    safe_print("[AUTOMATION] Found Yes button (Strategy 3: by ID pattern)")
-                    driver.execute_script("arguments[0].click();", yes_button)
-                    yes_clicked = True
-                    safe_print("[SUCCESS] ✅ Clicked Yes button using JavaScript!")
-                except:
-                    pass
-            
-            if not yes_clicked:
-                raise Exception("All strategies to click Yes button failed")
-            
-            time.sleep(2)  # Wait for confirmation action to process
+                return {
+                    "success": False,
+                    "message": f"⚠️ Automation stopped after {decision.attempt} consecutive errors ({decision.scope}). Processed {processed_count} item(s) successfully before errors. Last error: {result.get('message')}",
+                    "status": result.get("status", "error"),
+                    "processed_count": processed_count,
+                    "error": result.get("message"),
+                    "error_class": error_class,
+                    "worker_id": worker_id
+                }
             
-        except TimeoutException:
-            safe_print("[ERROR] Yes button not found in confirmation dialog")
-            return {
-                "success": False,
-                "message": "Could not find Yes button in confirmation dialog",
-                "status": "element_not_found"
-            }
-        except Exception as e:
-            safe_print(f"[ERROR] Error clicking Yes button: {str(e)[:100]}")
-            return {
-                "success": False,
-                "message": f"Error clicking Yes button: {str(e)}",
-                "status": "error"
-            }
-        
+            metrics.automation_retries.inc(error_class=error_class)
+            if decision.delay:
+                safe_print(f"{tag} ⏳ Waiting {decision.delay:.1f} seconds before retry...")
+                pause_worker(progress, decision.delay)
+            else:
+                safe_print(f"{tag} 🔁 Retrying immediately...")
+
+def pause_worker(progress, seconds):
+    """Sleep between items; a job's drain or cancel request cuts the wait short"""
+    if progress is not None:
+        progress.sleep(seconds)
+    else:
+        time.sleep(seconds)
+
+def stopped_queue_result(progress, tag, processed_count, worker_id):
+    """Result of a worker loop stopped by a drain or cancel request"""
+    if progress.control == "cancel":
+        safe_print(f"{tag} ⛔ Cancelled. Total items processed: {processed_count}")
         return {
-            "success": True,
-            "message": "Automation completed successfully! All steps executed: Dashboard Pendency → Dealer Registration → New Registration (Dealer Side) → NEW-RC-APPROVAL View Detail → First Approve Button → Verification Checkbox → Documents Uploaded Tab → Modify/View Documents → Close Modal → OK → Modify/View Documents Again → Check All Approved Checkboxes → Close Modal → OK → Save-Options → File Movement → Modal Opened → Proceed to Next Seat Selected → Save Clicked → Yes Confirmed.",
-            "status": "completed"
+            "success": False,
+            "message": f"⛔ Automation cancelled. Processed {processed_count} item(s) before cancelling.",
+            "status": "cancelled",
+            "processed_count": processed_count,
+            "worker_id": worker_id
         }
     
-    except TimeoutException:
-        safe_print("[ERROR] Dealer Registration element not found within timeout")
+    safe_print(f"{tag} ⏹️ Drained after finishing the current item. Total items processed: {processed_count}")
+    return {
+        "success": True,
+        "message": f"⏹️ Automation stopped after finishing the current item. Processed {processed_count} item(s).",
+        "status": "drained",
+        "processed_count": processed_count,
+        "worker_id": worker_id
+    }
+
+def combine_worker_results(results):
+    """Merge per-worker process_queue results into one run_automation result"""
+    if len(results) == 1:
+        return results[0]
+    
+    processed_count = sum(r.get("processed_count", 0) for r in results)
+    failed = [r for r in results if not r.get("success")]
+    if not failed:
+        if any(r.get("status") == "drained" for r in results):
+            message = f"⏹️ Automation stopped after finishing the current items on {len(results)} browsers. Processed {processed_count} item(s)."
+            status = "drained"
+        else:
+            message = f"✅ Automation completed successfully with {len(results)} browsers! Processed {processed_count} item(s). No more pending approvals found."
+            status = "completed"
         return {
-            "success": False,
-            "message": "Dealer Registration element not found. The page may not have loaded correctly.",
-            "status": "element_not_found"
+            "success": True,
+            "message": message,
+            "status": status,
+            "processed_count": processed_count,
+            "workers": results
         }
-        
-    except Exception as e:
-        error_msg = f"Error during automation: {str(e)}"
-        safe_print(f"[ERROR] ❌ {error_msg}")
+    
+    if all(r.get("status") == "cancelled" for r in failed):
         return {
             "success": False,
-            "message": error_msg,
-            "status": "error"
+            "message": f"⛔ Automation cancelled on {len(results)} browsers. Processed {processed_count} item(s) before cancelling.",
+            "status": "cancelled",
+            "processed_count": processed_count,
+            "workers": results
         }
+    
+    first_failure = failed[0]
+    return {
+        "success": False,
+        "message": f"⚠️ {len(failed)} of {len(results)} browsers stopped with errors. Processed {processed_count} item(s) in total. Worker {first_failure.get('worker_id')}: {first_failure.get('message')}",
+        "status": first_failure.get("status", "error"),
+        "processed_count": processed_count,
+        "error": first_failure.get("error", first_failure.get("message")),
+        "workers": results
+    }
 
-def run_automation():
+def run_automation(progress=None):
     """
     Main automation function that checks browser status and runs the automation in a loop.
     Continues processing until no more approve buttons are found.
-    Includes retry logic for 'back to home page' scenarios.
+    When pool workers are logged in, every browser processes the queue in parallel.
+    `progress` is the AutomationJob tracking this run, if any.
     """
     # First check if browser is open and logged in
     status = check_browser_status()
@@ -1908,92 +2015,138 @@ def run_automation():
             "status": "not_logged_in"
         }
     
-    # Browser is open and user is logged in, run automation in a loop
-    safe_print("[AUTOMATION] 🔄 Starting infinite automation loop...")
-    safe_print("[AUTOMATION] Will continue processing until no more approve buttons are found...")
+    lease_store.purge()
     
-    processed_count = 0
-    error_count = 0
-    max_consecutive_errors = 3  # Stop after 3 consecutive errors
+    # Browser is open and user is logged in, run automation on every ready browser
+    drivers = [(0, driver_instance)]
+    drivers += [(worker.worker_id, worker.driver) for worker in worker_pool.ready_workers()]
+    if len(drivers) > 1:
+        safe_print(f"[AUTOMATION] Spreading pending applications across {len(drivers)} browsers")
     
-    while True:
-        safe_print(f"\n{'='*60}")
-        safe_print(f"[AUTOMATION] 🔄 LOOP ITERATION {processed_count + 1}")
-        safe_print(f"{'='*60}\n")
+    circuit_breaker.reset()
+    def work(driver, worker_id, slot):
+        with browser_usage.using(worker_id):
+            return process_queue(
+                driver, worker_id=worker_id, row_index=slot, progress=progress, worker_count=len(drivers)
+            )
+    
+    automation_active.set()
+    try:
+        results = run_parallel(work, drivers)
+    finally:
+        automation_active.clear()
+    return combine_worker_results(results)
+
+def start_worker(worker):
+    """Launch (or reconnect) one pool worker's Chrome and wait for its operator login"""
+    with browser_usage.using(worker.worker_id):
+        try:
+            worker.status = "starting"
+            safe_print(f"[POOL] Starting worker {worker.worker_id} on debug port {worker.debug_port}...")
+            worker.driver = create_vahan_driver(debug_port=worker.debug_port, user_data_dir=worker.profile_dir)
         
-        # Run one iteration of automation
-        result = run_automation_internal(retry_count=0, max_retries=2)
+            if not open_vahan_login_page(worker.driver):
+                worker.status = "connection_error"
+                return worker.describe()
         
-        # Check the result
-        if result.get("success"):
-            processed_count += 1
-            error_count = 0  # Reset error count on success
-            safe_print(f"[SUCCESS] ✅ Successfully processed item {processed_count}")
-            safe_print("[AUTOMATION] 🔄 Continuing to next item...")
-            time.sleep(2)  # Brief pause before next iteration
-            
-        elif result.get("status") == "no_approve_button":
-            # No more approve buttons found - this is the SUCCESS exit condition
-            safe_print(f"\n{'='*60}")
-            safe_print(f"[AUTOMATION] 🎉 ALL ITEMS PROCESSED!")
-            safe_print(f"[AUTOMATION] Total items processed: {processed_count}")
-            safe_print(f"{'='*60}\n")
-            
-            return {
-                "success": True,
-                "message": f"✅ Automation completed successfully! Processed {processed_count} item(s). No more pending approvals found.",
-                "status": "completed",
-                "processed_count": processed_count
-            }
-            
-        else:
-            # An error occurred
-            error_count += 1
-            safe_print(f"[ERROR] ❌ Error in iteration {processed_count + 1}: {result.get('message')}")
-            safe_print(f"[ERROR] Consecutive errors: {error_count}/{max_consecutive_errors}")
-            
-            if error_count >= max_consecutive_errors:
-                # Too many consecutive errors, stop the loop
-                safe_print(f"\n{'='*60}")
-                safe_print(f"[AUTOMATION] ⚠️ STOPPING - Too many consecutive errors")
-                safe_print(f"[AUTOMATION] Total items processed: {processed_count}")
-                safe_print(f"{'='*60}\n")
-                
-                return {
-                    "success": False,
-                    "message": f"⚠️ Automation stopped after {max_consecutive_errors} consecutive errors. Processed {processed_count} item(s) successfully before errors. Last error: {result.get('message')}",
-                    "status": result.get("status", "error"),
-                    "processed_count": processed_count,
-                    "error": result.get("message")
-                }
-            
-            # Wait a bit longer before retrying after an error
-            safe_print("[AUTOMATION] ⏳ Waiting 5 seconds before retry...")
-            time.sleep(5)
+            worker.status = "waiting_for_login"
+            worker.is_logged_in = wait_for_login(worker.driver, timeout=300)
+            worker.status = "ready" if worker.is_logged_in else "login_timeout"
+        except Exception as e:
+            safe_print(f"[POOL] ❌ Worker {worker.worker_id} failed to start: {str(e)[:200]}")
+            worker.status = "error"
+        return worker.describe()
+
+def start_worker_browsers(count=None):
+    """
+    Start the additional browsers of the pool (workers 1..count-1) in parallel.
+    The primary browser (worker 0) is started by start_vahan_browser.
+    """
+    count = count or configured_worker_count()
+    chrome_profiles.cleanup_stale(keep_worker_ids=range(count))
+    workers = [worker_pool.get_or_create(worker_id) for worker_id in range(1, count)]
+    if not workers:
+        return {
+            "success": True,
+            "message": "Only the primary browser is configured.",
+            "workers": []
+        }
+    
+    pending = [w for w in workers if not (w.is_logged_in and w.is_alive())]
+    if pending:
+        run_parallel(lambda worker, worker_id, slot: start_worker(worker), [(w.worker_id, w) for w in pending])
+    
+    ready = [w for w in workers if w.is_logged_in]
+    return {
+        "success": len(ready) == len(workers),
+        "message": f"{len(ready)} of {len(workers)} additional browsers are logged in and ready.",
+        "workers": [w.describe() for w in workers]
+    }
+
+def get_logged_in_drivers():
+    """(worker_id, driver) of every browser that is logged in; used by the session keepalive"""
+    targets = [(0, driver_instance)] if driver_instance and is_logged_in else []
+    targets += [(worker.worker_id, worker.driver) for worker in worker_pool.workers()
+                if worker.driver and worker.is_logged_in]
+    return targets
+
+def record_session_health(worker_id, healthy):
+    """Keepalive result: refresh the saved session, or mark the browser as logged out"""
+    global is_logged_in
+    
+    if worker_id == 0:
+        if healthy:
+            save_session_info()  # Keeps the session timestamp fresh for load_session_info
+        elif is_logged_in:
+            is_logged_in = False
+            save_session_info()
+        return
+    
+    worker = worker_pool.get_or_create(worker_id)
+    worker.is_logged_in = healthy
+    if not healthy:
+        worker.status = "session_expired"
+
+def get_worker_status():
+    """Describe the primary browser and every pool worker"""
+    primary = {
+        "worker_id": 0,
+        "debug_port": CHROME_DEBUG_PORT,
+        "profile_dir": chrome_profiles.profile_dir(0, create=False),
+        "browser_open": driver_instance is not None,
+        "logged_in": is_logged_in,
+        "status": "ready" if driver_instance is not None and is_logged_in else "stopped"
+    }
+    return [primary] + [w.describe() for w in worker_pool.workers()]
     
 def close_vahan_browser():
     """Close the browser instance if it exists"""
     global driver_instance, is_logged_in
-    
-    if driver_instance:      
-        try:
-            safe_print("[CLOSE] Closing browser...")
-            driver_instance.quit()
-            driver_instance = None
-            is_logged_in = False
-            clear_session_info()  # Clear session file
-            safe_print("[SUCCESS] ✅ Browser closed successfully!")
+    with browser_usage.using(0):
+        if driver_instance:      
+            try:
+                safe_print("[CLOSE] Closing browser...")
+                driver_instance.quit()
+                driver_instance = None
+                is_logged_in = False
+                clear_session_info()  # Clear session file
+                safe_print("[SUCCESS] ✅ Browser closed successfully!")
+                return True
+            except Exception as e:
+                safe_print(f"[ERROR] Error closing browser: {str(e)}")
+                driver_instance = None
+                is_logged_in = False
+                clear_session_info()  # Clear session file
+                return False
+        else:
+            safe_print("[INFO] No browser instance to close")
+            clear_session_info()  # Clear session file anyway
             return True
-        except Exception as e:
-            safe_print(f"[ERROR] Error closing browser: {str(e)}")
-            driver_instance = None
-            is_logged_in = False
-            clear_session_info()  # Clear session file
-            return False
-    else:
-        safe_print("[INFO] No browser instance to close")
-        clear_session_info()  # Clear session file anyway
-        return True
+
+def close_worker_browsers():
+    """Close every additional pool browser"""
+    worker_pool.close_all()
+    safe_print("[POOL] Closed all worker browsers")
         
 if __name__ == "__main__":
     # For testing
@@ -0,0 +1,279 @@
+"""
+Declarative step pipeline for the Vahan workflows.
+
+A workflow is a list of Step objects. Each step declares how to find its
+target (ordered locator strategies), which page condition it needs before it
+acts, how long it may wait, and how to recover when it fails. run_pipeline
+executes the steps in order and records wall time, wait time and retry count
+for every step so slow steps can be tuned individually.
+"""
+
+import time
+import logging
+import threading
+
+from selenium.common.exceptions import TimeoutException, NoSuchElementException
+
+from vahan_waits import wait_for_idle, wait_for_element, reset_wait_time, get_wait_time
+
+logger = logging.getLogger(__name__)
+
+# Timing record of the step currently running on this thread
+_current = threading.local()
+
+# LocatorStats that Step.find orders its strategies by (see set_locator_stats)
+_locator_stats = None
+
+
+def set_locator_stats(stats):
+    """Let Step.find try the historically most successful locator first (None restores declared order)"""
+    global _locator_stats
+    _locator_stats = stats
+
+
+class Locator:
+    """One strategy for finding a step's target element"""
+
+    def __init__(self, by, value, label=None, clickable=True, timeout=None, js_click=False):
+        self.by = by
+        self.value = value
+        self.label = label or by
+        self.clickable = clickable
+        self.timeout = timeout  # None means use the step timeout
+        self.js_click = js_click
+
+    def as_tuple(self):
+        return (self.by, self.value)
+
+
+class StepFailed(Exception):
+    """Raised by a step action to end the workflow with a specific status"""
+
+    def __init__(self, status, message, restart=False, **extra):
+        super().__init__(message)
+        self.status = status
+        self.message = message
+        self.restart = restart
+        self.extra = extra
+
+    def as_result(self):
+        result = {"success": False, "message": self.message, "status": self.status}
+        if self.restart:
+            result["restart"] = True
+        result.update(self.extra)
+        return result
+
+
+class StepTiming:
+    """Wall time, wait time and retry count for one executed step"""
+
+    def __init__(self, name):
+        self.name = name
+        self.wall_time = 0.0
+        self.wait_time = 0.0
+        self.retries = 0
+        self.outcome = "pending"
+        self.locator = None  # Label of the locator strategy that matched
+
+    def as_dict(self):
+        return {
+            "step": self.name,
+            "wall_time": round(self.wall_time, 3),
+            "wait_time": round(self.wait_time, 3),
+            "retries": self.retries,
+            "outcome": self.outcome,
+            "locator": self.locator,
+        }
+
+
+class Step:
+    """
+    A single workflow step.
+
+    action(driver, step, context) performs the work. It returns None to let
+    the pipeline continue, or a result dict to end the workflow early (for
+    example when the queue is empty). Timeouts and missing elements are turned
+    into a failure result with this step's status and message.
+    """
+
+    def __init__(self, name, action, locators=(), ready=None, timeout=10,
+                 status="error", message=None, recover=None, retries=0,
+                 restart=False, optional=False, catch_all=False, when=None):
+        self.name = name
+        self.action = action
+        self.locators = tuple(locators)
+        self.ready = ready  # Condition set from vahan_waits, checked before the action
+        self.timeout = timeout
+        self.status = status
+        self.message = message or f"Step '{name}' failed."
+        self.recover = recover  # recover(driver, context) -> True if the step may be retried
+        self.retries = retries
+        self.restart = restart  # After recovery, restart the whole workflow instead of this step
+        self.optional = optional
+        self.catch_all = catch_all  # Report any exception with this step's status
+        self.when = when  # when(context) -> False skips the step (e.g. navigation already done)
+
+    def find(self, driver, timeout=None):
+        """
+        Try each locator strategy in order and return (element, locator).
+        With locator statistics installed, the order is the strategies'
+        success rate instead of the declared one.
+        Raises the last TimeoutException when no strategy matches.
+        """
+        if not self.locators:
+            raise ValueError(f"Step '{self.name}' has no locators")
+
+        stats = _locator_stats if len(self.locators) > 1 else None
+        locators = stats.order(self.name, self.locators) if stats else self.locators
+        missed = []
+        last_error = None
+        for index, locator in enumerate(locators):
+            if locator.timeout is not None:
+                wait = locator.timeout
+            elif timeout is not None:
+                wait = timeout
+            else:
+                wait = self.timeout if index == 0 else min(self.timeout, 5)
+            try:
+                element = wait_for_element(driver, locator.as_tuple(), timeout=wait, clickable=locator.clickable)
+                self._matched(locator)
+                if stats:
+                    stats.record(self.name, locator, missed)
+                return element, locator
+            except (TimeoutException, NoSuchElementException) as e:
+                logger.info(f"[PIPELINE] {self.name}: locator '{locator.label}' did not match")
+                missed.append(locator)
+                last_error = e
+        raise last_error
+
+    def click(self, driver, timeout=None):
+        """Find the target with find() and click it, honouring the locator's click mode"""
+        element, locator = self.find(driver, timeout=timeout)
+        if locator.js_click:
+            driver.execute_script("arguments[0].click();", element)
+        else:
+            element.click()
+        return element, locator
+
+    def _matched(self, locator):
+        timing = getattr(_current, "timing", None)
+        if timing is not None:
+            timing.locator = locator.label
+
+    def failure(self, error=None):
+        message = self.message
+        if error is not None and self.catch_all and not isinstance(error, TimeoutException):
+            message = f"{self.message} Error: {str(error)[:100]}"
+        return {"success": False, "message": message, "status": self.status}
+
+
+def _run_step(driver, step, context, timing, on_ready=None):
+    attempt = 0
+    while True:
+        try:
+            if step.ready:
+                wait_for_idle(driver, step.ready, timeout=step.timeout)
+            if on_ready and attempt == 0:
+                on_ready(step.name)
+            result = step.action(driver, step, context)
+            timing.outcome = "ok" if result is None or result.get("success") else result.get("status", "stopped")
+            return result
+        except StepFailed as e:
+            failure = e.as_result()
+        except (TimeoutException, NoSuchElementException) as e:
+            logger.info(f"[PIPELINE] {step.name}: timed out ({str(e)[:80]})")
+            failure = step.failure(e)
+        except Exception as e:
+            logger.info(f"[PIPELINE] {step.name}: error {str(e)[:100]}")
+            if step.catch_all:
+                failure = step.failure(e)
+            else:
+                failure = {"success": False, "message": f"Error during automation: {str(e)}", "status": "error"}
+
+        if step.optional:
+            logger.info(f"[PIPELINE] {step.name}: optional step failed, continuing")
+            timing.outcome = "skipped"
+            return None
+
+        if step.recover and attempt < step.retries and step.recover(driver, context):
+            attempt += 1
+            timing.retries = attempt
+            if step.restart:
+                failure["restart"] = True
+                timing.outcome = "restart"
+                return failure
+            logger.info(f"[PIPELINE] {step.name}: recovered, retrying ({attempt}/{step.retries})")
+            continue
+
+        timing.outcome = "failed"
+        return failure
+
+
+def run_pipeline(driver, steps, context=None, listener=None, control=None, start_after=None, on_ready=None):
+    """
+    Execute steps in order. Returns the first non-None step result, or a
+    success result when every step completed. The result always carries
+    "step_timings" (list of StepTiming.as_dict()) and, on early exit,
+    "stopped_at" naming the step that ended the run.
+
+    listener(event, data), when given, receives "step_started" ({"step"})
+    and "step_finished" (the step's timing dict) for progress reporting.
+
+    control, when given, is asked control.checkpoint() before every step;
+    it may block (pause) and returns False to cancel the run.
+
+    start_after names a step already completed in an earlier (interrupted)
+    run; every step up to and including it is skipped.
+
+    on_ready(step_name), when given, is called once per step after its ready
+    condition was met, right before the action runs (DOM recording).
+    """
+    context = context if context is not None else {}
+    timings = []
+    resuming = start_after is not None and any(step.name == start_after for step in steps)
+
+    for step in steps:
+        if resuming:
+            resuming = step.name != start_after
+            continue
+        if control is not None and not control.checkpoint():
+            return {
+                "success": False, "message": "Automation cancelled.", "status": "cancelled",
+                "stopped_at": step.name, "step_timings": [t.as_dict() for t in timings],
+            }
+        timing = StepTiming(step.name)
+        timings.append(timing)
+        if step.when is not None and not step.when(context):
+            timing.outcome = "skipped"
+            continue
+        if listener:
+            listener("step_started", {"step": step.name})
+        _current.timing = timing
+        reset_wait_time()
+        started = time.perf_counter()
+        try:
+            result = _run_step(driver, step, context, timing, on_ready)
+        finally:
+            timing.wall_time = time.perf_counter() - started
+            timing.wait_time = get_wait_time()
+            _current.timing = None
+            if listener:
+                listener("step_finished", timing.as_dict())
+
+        if result is not None:
+            result["stopped_at"] = step.name
+            result["step_timings"] = [t.as_dict() for t in timings]
+            return result
+
+    return {"success": True, "step_timings": [t.as_dict() for t in timings]}
+
+
+def format_step_timings(step_timings):
+    """One log line per step: name, wall/wait seconds, retries and outcome"""
+    lines = []
+    for t in step_timings:
+        lines.append(
+            f"{t['step']:<28} wall={t['wall_time']:>6.2f}s wait={t['wait_time']:>6.2f}s "
+            f"retries={t['retries']} {t['outcome']}"
+        )
+    return lines
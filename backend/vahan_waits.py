@@ -0,0 +1,276 @@
+"""
+Condition-based waits for the Vahan automation.
+
+Instead of sleeping for a fixed number of seconds after every click, each step
+declares which page conditions it needs (PrimeFaces AJAX queue empty, jQuery /
+Angular idle, dialog animations finished, overlays gone) and we block only
+until those conditions hold.
+
+NETWORK_IDLE is answered from Chrome's CDP network events instead of page
+JavaScript: it holds once no XHR/fetch has been in flight for a quiet period,
+so steps after a JSF partial-response round-trip wait exactly as long as the
+server takes.
+"""
+
+import json
+import time
+import logging
+import threading
+import weakref
+
+from selenium.webdriver.support.ui import WebDriverWait
+from selenium.webdriver.support import expected_conditions as EC
+from selenium.common.exceptions import WebDriverException
+
+logger = logging.getLogger(__name__)
+
+# Individual conditions understood by IDLE_SCRIPT
+DOCUMENT_READY = "document"
+PRIMEFACES_IDLE = "primefaces"
+JQUERY_IDLE = "jquery"
+ANGULAR_IDLE = "angular"
+ANIMATIONS_DONE = "animations"
+OVERLAYS_GONE = "overlays"
+NETWORK_IDLE = "network"  # CDP based, see wait_for_network_idle
+
+# Condition sets declared by the workflow steps
+PAGE_LOADED = (DOCUMENT_READY, PRIMEFACES_IDLE, JQUERY_IDLE)
+PAGE_SETTLED = (DOCUMENT_READY, PRIMEFACES_IDLE, JQUERY_IDLE, ANIMATIONS_DONE)
+AJAX_IDLE = (PRIMEFACES_IDLE, JQUERY_IDLE)
+UI_SETTLED = (PRIMEFACES_IDLE, JQUERY_IDLE, ANIMATIONS_DONE)
+UI_CLEAR = (PRIMEFACES_IDLE, JQUERY_IDLE, ANIMATIONS_DONE, OVERLAYS_GONE)
+ANGULAR_SETTLED = (DOCUMENT_READY, ANGULAR_IDLE)
+# After a JSF partial-response round-trip: server answered, then the UI settled
+SERVER_SETTLED = (NETWORK_IDLE,) + UI_SETTLED
+SERVER_LOADED = (NETWORK_IDLE,) + PAGE_LOADED
+
+DEFAULT_POLL_INTERVAL = 0.1
+DEFAULT_QUIET_PERIOD = 0.5  # Seconds without XHR traffic that count as network idle
+XHR_RESOURCE_TYPES = ("XHR", "Fetch")
+MAX_REQUEST_AGE = 60  # Requests in flight longer than this are treated as hung (long-polls)
+
+# Evaluates all requested conditions in a single round-trip.
+# Missing frameworks count as idle so the same script works on every page.
+IDLE_SCRIPT = """
+var wanted = arguments[0] || [];
+var result = {};
+function visible(el) {
+    if (!el) { return false; }
+    var style = window.getComputedStyle(el);
+    return style.display !== 'none' && style.visibility !== 'hidden' && el.offsetParent !== null;
+}
+for (var i = 0; i < wanted.length; i++) {
+    var name = wanted[i];
+    var ok = true;
+    try {
+        if (name === 'document') {
+            ok = document.readyState === 'complete';
+        } else if (name === 'primefaces') {
+            var pf = window.PrimeFaces;
+            if (pf && pf.ajax && pf.ajax.Queue) {
+                ok = pf.ajax.Queue.isEmpty();
+            }
+            if (ok && pf && pf.ajax && typeof pf.ajax.Queue.xhrs !== 'undefined') {
+                ok = pf.ajax.Queue.xhrs.length === 0;
+            }
+        } else if (name === 'jquery') {
+            ok = !window.jQuery || window.jQuery.active === 0;
+        } else if (name === 'angular') {
+            if (window.getAllAngularTestabilities) {
+                var testabilities = window.getAllAngularTestabilities();
+                for (var t = 0; t < testabilities.length; t++) {
+                    if (!testabilities[t].isStable()) { ok = false; }
+                }
+            } else if (window.angular) {
+                var injector = window.angular.element(document.body).injector();
+                if (injector) {
+                    ok = injector.get('$http').pendingRequests.length === 0;
+                }
+            }
+        } else if (name === 'animations') {
+            ok = !window.jQuery || window.jQuery(':animated').length === 0;
+        } else if (name === 'overlays') {
+            var overlays = document.querySelectorAll('.ui-widget-overlay, .ui-dialog-mask, .ui-blockui');
+            for (var o = 0; o < overlays.length; o++) {
+                if (visible(overlays[o])) { ok = false; break; }
+            }
+        }
+    } catch (e) {
+        ok = true;
+    }
+    result[name] = ok;
+}
+return result;
+"""
+
+_clock = threading.local()
+
+
+def reset_wait_time():
+    """Reset the wait-time accumulator for the current thread"""
+    _clock.total = 0.0
+
+
+def get_wait_time():
+    """Seconds spent blocked in waits on the current thread since the last reset"""
+    return getattr(_clock, "total", 0.0)
+
+
+def _record_wait(started):
+    _clock.total = get_wait_time() + (time.perf_counter() - started)
+
+
+def page_state(driver, conditions):
+    """Return a dict of condition name -> bool for the current page"""
+    return driver.execute_script(IDLE_SCRIPT, list(conditions)) or {}
+
+
+def wait_for_idle(driver, conditions=AJAX_IDLE, timeout=10, poll_interval=DEFAULT_POLL_INTERVAL):
+    """
+    Block until every condition in `conditions` holds, or `timeout` expires.
+    Returns True when the page is idle, False on timeout. Never raises for a
+    timeout, since callers previously slept unconditionally.
+    """
+    if NETWORK_IDLE in conditions:
+        started = time.perf_counter()
+        network_idle = wait_for_network_idle(driver, timeout=timeout)
+        conditions = tuple(name for name in conditions if name != NETWORK_IDLE)
+        remaining = max(0.0, timeout - (time.perf_counter() - started))
+        if not conditions:
+            return network_idle
+        return wait_for_idle(driver, conditions, timeout=remaining, poll_interval=poll_interval) and network_idle
+
+    started = time.perf_counter()
+    deadline = started + timeout
+    pending = []
+    try:
+        while True:
+            try:
+                state = page_state(driver, conditions)
+                pending = [name for name in conditions if not state.get(name, True)]
+                if not pending:
+                    return True
+            except WebDriverException as e:
+                # Page is navigating or the script context was torn down; try again
+                pending = [f"script_error: {str(e)[:60]}"]
+            if time.perf_counter() >= deadline:
+                logger.info(f"[WAIT] Page not idle after {timeout}s, still waiting on: {pending}")
+                return False
+            time.sleep(poll_interval)
+    finally:
+        _record_wait(started)
+
+
+
+def wait_for_element(driver, locator, timeout=10, clickable=True):
+    """
+    Wait for an element located by a (By, value) tuple.
+    Raises TimeoutException like WebDriverWait does.
+    """
+    started = time.perf_counter()
+    try:
+        condition = EC.element_to_be_clickable if clickable else EC.presence_of_element_located
+        return WebDriverWait(driver, timeout, poll_frequency=DEFAULT_POLL_INTERVAL).until(condition(locator))
+    finally:
+        _record_wait(started)
+
+
+def enable_network_events(options):
+    """
+    ChromeOptions needed by wait_for_network_idle: CDP Network events are read
+    from chromedriver's performance log.
+    """
+    options.set_capability("goog:loggingPrefs", {"performance": "ALL"})
+    options.add_experimental_option("perfLoggingPrefs", {"enableNetwork": True, "enablePage": False})
+    return options
+
+
+class NetworkTracker:
+    """
+    XHR/fetch requests in flight for one driver, fed from the CDP
+    Network.requestWillBeSent / loadingFinished / loadingFailed events in the
+    performance log. The log is drained on every poll, so the tracker keeps
+    its state between waits.
+    """
+
+    def __init__(self, resource_types=XHR_RESOURCE_TYPES):
+        self.resource_types = set(resource_types)
+        self.in_flight = {}  # requestId -> perf_counter time it was sent
+        self.last_activity = 0.0
+        self.available = True
+
+    def poll(self, driver):
+        """Consume new performance-log entries. Returns False when the log is unavailable."""
+        if not self.available:
+            return False
+        try:
+            entries = driver.get_log("performance")
+        except Exception as e:
+            logger.info(f"[WAIT] CDP performance log unavailable, using page-script waits: {str(e)[:80]}")
+            self.available = False
+            return False
+
+        now = time.perf_counter()
+        for entry in entries:
+            try:
+                message = json.loads(entry["message"])["message"]
+            except (KeyError, ValueError, TypeError):
+                continue
+            method = message.get("method")
+            params = message.get("params", {})
+            request_id = params.get("requestId")
+            if method == "Network.requestWillBeSent" and params.get("type") in self.resource_types:
+                self.in_flight[request_id] = now
+                self.last_activity = now
+            elif method in ("Network.loadingFinished", "Network.loadingFailed") and request_id in self.in_flight:
+                del self.in_flight[request_id]
+                self.last_activity = now
+
+        for request_id, sent in list(self.in_flight.items()):
+            if now - sent > MAX_REQUEST_AGE:
+                del self.in_flight[request_id]
+        return True
+
+
+_trackers = weakref.WeakKeyDictionary()
+_trackers_lock = threading.Lock()
+
+
+def network_tracker(driver):
+    with _trackers_lock:
+        tracker = _trackers.get(driver)
+        if tracker is None:
+            tracker = NetworkTracker()
+            _trackers[driver] = tracker
+        return tracker
+
+
+def wait_for_network_idle(driver, quiet_period=DEFAULT_QUIET_PERIOD, timeout=10, poll_interval=DEFAULT_POLL_INTERVAL):
+    """
+    Block until no XHR/fetch request has been in flight for `quiet_period`
+    seconds, or `timeout` expires. Returns True when idle, False on timeout.
+    Falls back to the PrimeFaces/jQuery queue check when the driver has no
+    performance log (e.g. it was created without enable_network_events).
+    """
+    tracker = network_tracker(driver)
+    if not tracker.available:
+        return wait_for_idle(driver, AJAX_IDLE, timeout=timeout, poll_interval=poll_interval)
+
+    started = time.perf_counter()
+    deadline = started + timeout
+    # Traffic that happened before this wait (e.g. the click that triggered it) is in the log already
+    try:
+        while True:
+            if not tracker.poll(driver):
+                break
+            now = time.perf_counter()
+            if not tracker.in_flight and now - max(tracker.last_activity, started) >= quiet_period:
+                return True
+            if now >= deadline:
+                logger.info(f"[WAIT] Network not idle after {timeout}s, {len(tracker.in_flight)} XHR(s) in flight")
+                return False
+            time.sleep(poll_interval)
+    finally:
+        _record_wait(started)
+    remaining = max(0.0, deadline - time.perf_counter())
+    return wait_for_idle(driver, AJAX_IDLE, timeout=remaining, poll_interval=poll_interval)
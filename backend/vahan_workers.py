@@ -0,0 +1,118 @@
+"""
+Pool of Chrome workers for parallel application approval.
+
+Worker 0 is the primary browser managed by vahan_automation (debug port 9222).
+Additional workers get their own remote-debugging port and Chrome profile so
+they hold independent Vahan sessions. run_parallel fans a queue-processing
+function out over every ready worker and collects the per-worker results.
+"""
+
+import os
+import logging
+import threading
+from concurrent.futures import ThreadPoolExecutor
+
+logger = logging.getLogger(__name__)
+
+WORKER_BASE_PORT = 9222
+MAX_WORKERS = 8
+
+
+def configured_worker_count():
+    """Number of browsers to use, from TASKIFY_BROWSER_WORKERS (default 1)"""
+    try:
+        count = int(os.environ.get("TASKIFY_BROWSER_WORKERS", "1"))
+    except ValueError:
+        count = 1
+    return max(1, min(count, MAX_WORKERS))
+
+
+class BrowserWorker:
+    """One Chrome instance with its own debug port and profile directory"""
+
+    def __init__(self, worker_id, debug_port, profile_dir=None):
+        self.worker_id = worker_id
+        self.debug_port = debug_port
+        self.profile_dir = profile_dir
+        self.driver = None
+        self.is_logged_in = False
+        self.status = "stopped"
+
+    def is_alive(self):
+        if not self.driver:
+            return False
+        try:
+            _ = self.driver.current_url
+            return True
+        except Exception:
+            return False
+
+    def describe(self):
+        return {
+            "worker_id": self.worker_id,
+            "debug_port": self.debug_port,
+            "profile_dir": self.profile_dir,
+            "browser_open": self.driver is not None,
+            "logged_in": self.is_logged_in,
+            "status": self.status,
+        }
+
+
+class WorkerPool:
+    """Registry of the additional (non-primary) browser workers"""
+
+    def __init__(self, profile_root, base_port=WORKER_BASE_PORT):
+        self.profile_root = profile_root
+        self.base_port = base_port
+        self._workers = {}
+        self._lock = threading.Lock()
+
+    def get_or_create(self, worker_id):
+        if worker_id < 1:
+            raise ValueError("Worker 0 is the primary browser and is not managed by the pool")
+        with self._lock:
+            worker = self._workers.get(worker_id)
+            if worker is None:
+                profile_dir = os.path.join(self.profile_root, f"worker-{worker_id}")
+                os.makedirs(profile_dir, exist_ok=True)
+                worker = BrowserWorker(worker_id, self.base_port + worker_id, profile_dir)
+                self._workers[worker_id] = worker
+            return worker
+
+    def workers(self):
+        with self._lock:
+            return [self._workers[k] for k in sorted(self._workers)]
+
+    def ready_workers(self):
+        """Workers whose browser responds and whose operator has logged in"""
+        return [w for w in self.workers() if w.is_logged_in and w.is_alive()]
+
+    def close_all(self):
+        for worker in self.workers():
+            if worker.driver:
+                try:
+                    worker.driver.quit()
+                except Exception as e:
+                    logger.info(f"[POOL] Error closing worker {worker.worker_id}: {str(e)[:100]}")
+            worker.driver = None
+            worker.is_logged_in = False
+            worker.status = "stopped"
+
+
+def run_parallel(task, targets):
+    """
+    Run task(target, worker_id, slot) for every (worker_id, target) pair on
+    its own thread. A target is usually a driver; `slot` is the position of
+    the worker in the list and is used to spread the workers over different
+    rows of the pending table. Returns the results in the same order.
+    """
+    if len(targets) == 1:
+        worker_id, target = targets[0]
+        return [task(target, worker_id, 0)]
+
+    with ThreadPoolExecutor(max_workers=len(targets), thread_name_prefix="vahan-worker") as executor:
+        futures = [
+            executor.submit(task, target, worker_id, slot)
+            for slot, (worker_id, target) in enumerate(targets)
+        ]
+        return [future.result() for future in futures]
@@ -1,5 +1,5 @@
 import React, { useState, useEffect, useRef } from 'react'
-import { Play, Loader2, Zap, AlertTriangle, Home } from 'lucide-react'
+import { Play, Loader2, Zap, AlertTriangle, Home, Pause, Square, XCircle } from 'lucide-react'
 import toast from 'react-hot-toast'
 
 const Dashboard = () => {
@@ -8,7 +8,11 @@ const Dashboard = () => {
   const [isLoggedIn, setIsLoggedIn] = useState(false)
   const [isCheckingStatus, setIsCheckingStatus] = useState(true)
   const [automationResult, setAutomationResult] = useState(null) // { success, message, processed_count, status }
+  const [jobProgress, setJobProgress] = useState(null) // { job_id, processed, errors, current_step, items_per_minute }
   const API_BASE_URL = import.meta.env.VITE_API_BASE_URL || 'http://localhost:8000'
+  const JOB_POLL_INTERVAL = 2000
+  const STOPPED_STATUSES = ['cancelled', 'drained'] // Runs stopped from the job controls, not by an error
+  const eventSourceRef = useRef(null)
   
   // Audio context for notification sound
   const audioContextRef = useRef(null)
@@ -56,6 +60,8 @@ const Dashboard = () => {
   // Check browser status on mount
   useEffect(() => {
     checkBrowserStatus()
+    // Close the progress stream when leaving the dashboard
+    return () => eventSourceRef.current?.close()
   }, [])
 
   const checkBrowserStatus = async () => {
@@ -106,9 +112,113 @@ const Dashboard = () => {
     }
   }
 
+  const showAutomationResult = (data) => {
+    // Store the result for display
+    setAutomationResult({
+      success: data.success,
+      message: data.message || (data.success ? 'Automation completed successfully!' : 'Automation failed'),
+      processed_count: data.processed_count,
+      status: data.status,
+      error: data.error
+    })
+
+    if (data.status === 'cancelled') {
+      toast('Automation cancelled')
+    } else if (data.status === 'drained') {
+      toast('Automation stopped after the current item')
+    } else if (data.success) {
+      toast.success('Automation completed!')
+    } else {
+      // Play error notification sound
+      playErrorSound()
+      toast.error('Automation encountered errors - Manual action required!')
+    }
+  }
+
+  // Poll the background job until it finishes, showing progress meanwhile
+  const waitForJob = async (jobId) => {
+    while (true) {
+      const response = await fetch(`${API_BASE_URL}/jobs/${jobId}`)
+      const job = await response.json()
+      if (!response.ok) {
+        throw new Error(job.detail || 'Automation job not found')
+      }
+
+      setJobProgress((previous) => ({ ...(previous || {}), ...job }))
+      if (job.status !== 'queued' && job.status !== 'running') {
+        return job.result || { success: false, message: 'Automation finished without a result', status: job.status }
+      }
+      await new Promise((resolve) => setTimeout(resolve, JOB_POLL_INTERVAL))
+    }
+  }
+
+  // Follow the job through its Server-Sent Events stream; falls back to polling if the stream fails
+  const streamJob = (jobId) => new Promise((resolve, reject) => {
+    const source = new EventSource(`${API_BASE_URL}/jobs/${jobId}/events`)
+    eventSourceRef.current = source
+
+    const update = (event, apply) => {
+      const data = JSON.parse(event.data)
+      setJobProgress((previous) => ({
+        ...(previous || {}),
+        job_id: jobId,
+        processed: data.processed_total,
+        errors: data.errors_total,
+        items_per_minute: data.items_per_minute,
+        ...apply(data, previous || {})
+      }))
+      return data
+    }
+
+    source.addEventListener('step_started', (event) => update(event, (data, previous) => ({
+      current_step: { ...(previous.current_step || {}), [data.worker_id]: data.step }
+    })))
+    source.addEventListener('step_finished', (event) => update(event, (data) => ({
+      last_step: `${data.step} (${data.wall_time}s, ${data.outcome})`
+    })))
+    source.addEventListener('item_approved', (event) => update(event, () => ({})))
+    source.addEventListener('item_failed', (event) => update(event, (data) => ({
+      last_error: { status: data.status, message: data.message }
+    })))
+    source.addEventListener('queue_empty', (event) => update(event, () => ({})))
+    for (const name of ['paused', 'resumed', 'draining', 'cancelling']) {
+      source.addEventListener(name, (event) => update(event, (data) => ({ control: data.control })))
+    }
+    source.addEventListener('job_finished', (event) => {
+      const data = update(event, () => ({}))
+      source.close()
+      resolve(data.result || { success: false, message: 'Automation finished without a result', status: data.status })
+    })
+    source.onerror = () => {
+      // EventSource reconnects by itself while the backend is up; give up only once it is closed
+      if (source.readyState === EventSource.CLOSED) {
+        waitForJob(jobId).then(resolve, reject)
+      }
+    }
+  })
+
+  // Pause, resume, drain or cancel the running job; the loop picks it up at the next step boundary
+  const handleJobControl = async (action) => {
+    if (!jobProgress?.job_id) return
+    try {
+      const response = await fetch(`${API_BASE_URL}/jobs/${jobProgress.job_id}/${action}`, { method: 'POST' })
+      const data = await response.json()
+      if (response.ok && data.success) {
+        setJobProgress((previous) => ({ ...(previous || {}), control: data.control }))
+        toast.success(data.message)
+      } else {
+        toast.error(data.message || data.detail || `Failed to ${action} automation`)
+      }
+    } catch (error) {
+      console.error(`Error sending ${action} to automation job:`, error)
+      toast.error('Failed to reach backend.')
+    }
+  }
+
   const handleRunAutomation = async () => {
     setIsRunningAutomation(true)
     setAutomationResult(null) // Clear previous result
+    setJobProgress(null)
     
     try {
       const response = await fetch(`${API_BASE_URL}/run-automation`, {
@@ -120,22 +230,16 @@ const Dashboard = () => {
 
       const data = await response.json()
 
-      // Store the result for display
-      setAutomationResult({
-        success: data.success,
-        message: data.message || (data.success ? 'Automation completed successfully!' : 'Automation failed'),
-        processed_count: data.processed_count,
-        status: data.status,
-        error: data.error
-      })
-
-      if (response.ok && data.success) {
-        toast.success('Automation completed!')
-      } else {
-        // Play error notification sound
-        playErrorSound()
-        toast.error('Automation encountered errors - Manual action required!')
+      if (!data.job_id) {
+        showAutomationResult(data)
+        return
       }
+      setJobProgress({ job_id: data.job_id, processed: 0, errors: 0, items_per_minute: 0, control: 'run' })
+      if (data.status === 'already_running') {
+        toast('Automation is already running, following its progress')
+      }
+
+      showAutomationResult(typeof EventSource !== 'undefined' ? await streamJob(data.job_id) : await waitForJob(data.job_id))
     } catch (error) {
       console.error('Error running automation:', error)
       
@@ -165,6 +269,39 @@ const Dashboard = () => {
     )
   }
 
+  const resultStopped = STOPPED_STATUSES.includes(automationResult?.status)
+  const resultTone = resultStopped ? 'stopped' : automationResult?.success ? 'success' : 'error'
+  const resultClasses = {
+    success: {
+      panel: 'bg-green-50 dark:bg-green-900/20 border-green-500 dark:border-green-600',
+      icon: 'text-green-600',
+      title: 'text-green-900 dark:text-green-100',
+      message: 'text-green-800 dark:text-green-200',
+      count: 'bg-green-200 dark:bg-green-800 text-green-900 dark:text-green-100',
+      status: 'bg-green-100 dark:bg-green-900 text-green-700 dark:text-green-300'
+    },
+    stopped: {
+      panel: 'bg-gray-50 dark:bg-gray-800/40 border-gray-400 dark:border-gray-500',
+      icon: 'text-gray-600',
+      title: 'text-gray-900 dark:text-gray-100',
+      message: 'text-gray-800 dark:text-gray-200',
+      count: 'bg-gray-200 dark:bg-gray-700 text-gray-900 dark:text-gray-100',
+      status: 'bg-gray-100 dark:bg-gray-800 text-gray-700 dark:text-gray-300'
+    },
+    error: {
+      panel: 'bg-red-50 dark:bg-red-900/20 border-red-500 dark:border-red-600',
+      icon: 'text-red-600',
+      title: 'text-red-900 dark:text-red-100',
+      message: 'text-red-800 dark:text-red-200',
+      count: 'bg-red-200 dark:bg-red-800 text-red-900 dark:text-red-100',
+      status: 'bg-red-100 dark:bg-red-900 text-red-700 dark:text-red-300'
+    }
+  }[resultTone]
+  const resultTitle = {
+    cancelled: 'Automation Cancelled',
+    drained: 'Automation Stopped'
+  }[automationResult?.status] || (automationResult?.success ? 'Automation Completed Successfully!' : 'Automation Failed')
+
   return (
     <div className="min-h-screen p-8">
       <div className="max-w-7xl mx-auto">
@@ -218,38 +355,88 @@ const Dashboard = () => {
                   )}
                 </button>
 
+                {/* Live Progress of the running job */}
+                {isRunningAutomation && jobProgress && (
+                  <div className="rounded-lg p-4 border border-blue-300 dark:border-blue-700 bg-blue-50 dark:bg-blue-900/20">
+                    <div className="flex flex-wrap gap-4 text-sm text-blue-900 dark:text-blue-100">
+                      <span>Processed: <strong>{jobProgress.processed}</strong></span>
+                      <span>Errors: <strong>{jobProgress.errors}</strong></span>
+                      <span>Items/min: <strong>{jobProgress.items_per_minute}</strong></span>
+                    </div>
+                    {Object.entries(jobProgress.current_step || {}).map(([workerId, step]) => (
+                      <p key={workerId} className="mt-1 text-xs text-blue-700 dark:text-blue-300">
+                        Browser {workerId}: {step}
+                      </p>
+                    ))}
+                    {jobProgress.last_step && (
+                      <p className="mt-1 text-xs text-blue-700 dark:text-blue-300">Last step: {jobProgress.last_step}</p>
+                    )}
+                    {jobProgress.last_error && (
+                      <p className="mt-1 text-xs text-red-700 dark:text-red-300">
+                        Last error ({jobProgress.last_error.status}): {jobProgress.last_error.message}
+                      </p>
+                    )}
+
+                    {/* Job controls */}
+                    <div className="mt-3 flex flex-wrap gap-2">
+                      {jobProgress.control === 'pause' ? (
+                        <button
+                          onClick={() => handleJobControl('resume')}
+                          className="flex items-center space-x-1 bg-green-600 hover:bg-green-700 text-white text-sm font-semibold py-1.5 px-3 rounded-lg"
+                        >
+                          <Play size={16} />
+                          <span>Resume</span>
+                        </button>
+                      ) : (
+                        <button
+                          onClick={() => handleJobControl('pause')}
+                          disabled={jobProgress.control === 'drain' || jobProgress.control === 'cancel'}
+                          className="flex items-center space-x-1 bg-yellow-500 hover:bg-yellow-600 disabled:bg-yellow-300 text-white text-sm font-semibold py-1.5 px-3 rounded-lg disabled:cursor-not-allowed"
+                        >
+                          <Pause size={16} />
+                          <span>Pause</span>
+                        </button>
+                      )}
+                      <button
+                        onClick={() => handleJobControl('drain')}
+                        disabled={jobProgress.control === 'drain' || jobProgress.control === 'cancel'}
+                        className="flex items-center space-x-1 bg-blue-600 hover:bg-blue-700 disabled:bg-blue-300 text-white text-sm font-semibold py-1.5 px-3 rounded-lg disabled:cursor-not-allowed"
+                      >
+                        <Square size={16} />
+                        <span>{jobProgress.control === 'drain' ? 'Stopping after current item...' : 'Stop after current item'}</span>
+                      </button>
+                      <button
+                        onClick={() => handleJobControl('cancel')}
+                        disabled={jobProgress.control === 'cancel'}
+                        className="flex items-center space-x-1 bg-red-600 hover:bg-red-700 disabled:bg-red-300 text-white text-sm font-semibold py-1.5 px-3 rounded-lg disabled:cursor-not-allowed"
+                      >
+                        <XCircle size={16} />
+                        <span>Cancel now</span>
+                      </button>
+                    </div>
+                  </div>
+                )}
+
                 {/* Automation Result Display */}
                 {automationResult && (
                   <div 
-                    className={`rounded-lg p-6 border-2 ${
-                      automationResult.success 
-                        ? 'bg-green-50 dark:bg-green-900/20 border-green-500 dark:border-green-600' 
-                        : 'bg-red-50 dark:bg-red-900/20 border-red-500 dark:border-red-600'
-                    }`}
+                    className={`rounded-lg p-6 border-2 ${resultClasses.panel}`}
                   >
                     <div className="flex items-start space-x-3">
-                      <div className={`flex-shrink-0 text-2xl ${automationResult.success ? 'text-green-600' : 'text-red-600'}`}>
-                        {automationResult.success ? '✅' : '❌'}
+                      <div className={`flex-shrink-0 text-2xl ${resultClasses.icon}`}>
+                        {resultStopped ? '⏹️' : automationResult.success ? '✅' : '❌'}
                       </div>
                       <div className="flex-1">
-                        <h3 className={`text-lg font-bold mb-2 ${
-                          automationResult.success 
-                            ? 'text-green-900 dark:text-green-100' 
-                            : 'text-red-900 dark:text-red-100'
-                        }`}>
-                          {automationResult.success ? 'Automation Completed Successfully!' : 'Automation Failed'}
+                        <h3 className={`text-lg font-bold mb-2 ${resultClasses.title}`}>
+                          {resultTitle}
                         </h3>
                         
-                        <p className={`text-sm mb-3 whitespace-pre-wrap ${
-                          automationResult.success 
-                            ? 'text-green-800 dark:text-green-200' 
-                            : 'text-red-800 dark:text-red-200'
-                        }`}>
+                        <p className={`text-sm mb-3 whitespace-pre-wrap ${resultClasses.message}`}>
                           {automationResult.message}
                         </p>
                         
                         {/* Manual Action Instructions for Errors */}
-                        {!automationResult.success && (
+                        {!automationResult.success && !resultStopped && (
                           <div className="mt-4 mb-4 p-4 bg-yellow-50 dark:bg-yellow-900/20 border-l-4 border-yellow-500 rounded">
                             <div className="flex items-start space-x-2">
                               <AlertTriangle className="text-yellow-600 dark:text-yellow-400 flex-shrink-0 mt-0.5" size={20} />
@@ -273,21 +460,13 @@ const Dashboard = () => {
                         )}
                         
                         {automationResult.processed_count !== undefined && (
-                          <div className={`inline-block px-3 py-1 rounded-full text-sm font-semibold ${
-                            automationResult.success 
-                              ? 'bg-green-200 dark:bg-green-800 text-green-900 dark:text-green-100' 
-                              : 'bg-red-200 dark:bg-red-800 text-red-900 dark:text-red-100'
-                          }`}>
+                          <div className={`inline-block px-3 py-1 rounded-full text-sm font-semibold ${resultClasses.count}`}>
                             Items Processed: {automationResult.processed_count}
                           </div>
                         )}
                         
                         {automationResult.status && (
-                          <div className={`inline-block ml-2 px-3 py-1 rounded-full text-xs font-medium ${
-                            automationResult.success 
-                              ? 'bg-green-100 dark:bg-green-900 text-green-700 dark:text-green-300' 
-                              : 'bg-red-100 dark:bg-red-900 text-red-700 dark:text-red-300'
-                          }`}>
+                          <div className={`inline-block ml-2 px-3 py-1 rounded-full text-xs font-medium ${resultClasses.status}`}>
                             Status: {automationResult.status}
                           </div>
                         )}